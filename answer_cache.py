@@ -0,0 +1,113 @@
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_question(text):
+    """Collapse whitespace so cosmetic layout changes don't change the cache key"""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def cache_key(question, template, model):
+    """Content address for a question asked with a given prompt template and model"""
+    payload = "\x00".join([normalize_question(question), template or "", model or ""])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """On-disk SQLite cache of raw LLM responses with size- and age-based eviction"""
+
+    def __init__(self, path="answer_cache.sqlite3", max_entries=5000, max_age_days=30):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        # LLM calls may run in worker threads (see async_engine), so share one
+        # connection behind a lock instead of binding it to the creating thread
+        self.lock = threading.RLock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            "key TEXT PRIMARY KEY, kind TEXT, model TEXT, response TEXT, "
+            "created REAL, last_used REAL)"
+        )
+        self.db.commit()
+        self.evict()
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the cache from the 'answer_cache' config section, or return None if disabled"""
+        settings = config.get('answer_cache', {})
+        if not settings.get('enabled', True):
+            return None
+        return cls(
+            settings.get('path', "answer_cache.sqlite3"),
+            settings.get('max_entries', 5000),
+            settings.get('max_age_days', 30)
+        )
+
+    def get(self, key):
+        with self.lock:
+            return self._get(key)
+
+    def _get(self, key):
+        row = self.db.execute(
+            "SELECT response, created FROM answers WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None or now - row[1] > self.max_age:
+            self.misses += 1
+            logger.info(f"Answer cache miss ({self.stats()})")
+            return None
+        self.db.execute("UPDATE answers SET last_used = ? WHERE key = ?", (now, key))
+        self.db.commit()
+        self.hits += 1
+        logger.info(f"Answer cache hit ({self.stats()})")
+        return row[0]
+
+    def put(self, key, kind, model, response):
+        with self.lock:
+            self._put(key, kind, model, response)
+
+    def _put(self, key, kind, model, response):
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO answers (key, kind, model, response, created, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, kind, model, response, now, now)
+        )
+        self.db.commit()
+        self.evict()
+
+    def delete(self, key):
+        """Drop one entry, e.g. an answer the platform rejected"""
+        with self.lock:
+            self.db.execute("DELETE FROM answers WHERE key = ?", (key,))
+            self.db.commit()
+
+    def evict(self):
+        """Drop expired entries, then the least recently used ones beyond max_entries"""
+        with self.lock:
+            self._evict()
+
+    def _evict(self):
+        self.db.execute("DELETE FROM answers WHERE created < ?", (time.time() - self.max_age,))
+        self.db.execute(
+            "DELETE FROM answers WHERE key NOT IN "
+            "(SELECT key FROM answers ORDER BY last_used DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+        self.db.commit()
+
+    def stats(self):
+        return f"hits={self.hits}, misses={self.misses}"
+
+    def close(self):
+        logger.info(f"Answer cache closed ({self.stats()})")
+        self.db.close()
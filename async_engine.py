@@ -0,0 +1,499 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import asdict
+
+from playwright.async_api import async_playwright
+
+from answer_cache import AnswerCache
+from answers import QuizAnswers
+from button_resolver import ButtonResolver, control_names, CLICKABLE_SELECTOR, COLLECT_CLICKABLES_JS
+from cassette import Cassette
+from course_index import CourseIndex
+from editors import insert_code_async
+from feedback import FeedbackDetector, summarize
+from llm_client import LLMError
+from network_filter import RequestBlocker, browser_settings
+from page_classifier import TEXT_INPUT_SELECTOR, classify_page_async
+from progress_journal import ProgressJournal
+from question_capture import QuestionCapture
+from question_extractor import EXTRACT_QUESTION_JS, finish_question, question_selectors
+from resource_monitor import ResourceMonitor
+from run_report import RunReport
+from session_store import load_session, save_session, clear_session, session_settings
+from strategy_stats import StrategyStats, run_strategies_async
+from tracing import Tracer
+from transitions import TransitionDetector
+from waits import DEFAULT_WAITS
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncQuizAutomation(QuizAnswers, RunReport):
+    """Solve independent subtopics concurrently in a pool of tabs sharing one logged-in context"""
+
+    def __init__(self, config):
+        self.config = config
+        self.tabs = config.get('concurrency', {}).get('tabs', 1)
+        self.waits = dict(DEFAULT_WAITS)
+        self.waits.update(config.get('waits', {}))
+        self.resolver = ButtonResolver()
+        self.answer_cache = AnswerCache.from_config(config)
+        self.journal = ProgressJournal.from_config(config)
+        self.progress = {}
+        self.session = load_session(config)
+        self.request_blocker = RequestBlocker.from_config(config)
+        self.tracer = Tracer.from_config(config)
+        self.strategy_stats = StrategyStats.from_config(config)
+        self.feedback = FeedbackDetector.from_config(config, self.waits)
+        self.cassette = Cassette.from_config(config)
+        self.transitions = TransitionDetector.from_config(config, self.waits)
+        self.results = []
+        # Read-only here: discovery runs in the sync automation, which owns the click chain
+        self.course_index = CourseIndex.from_config(config)
+        self.course_url = None
+        # One monitor and one question capture per tab, each bound to that tab's page
+        self.monitors = {}
+        self.captures = {}
+
+    async def start(self, playwright):
+        self.browser = await playwright.chromium.launch(headless=browser_settings(self.config)['headless'])
+        if self.session:
+            self.context = await self.browser.new_context(storage_state=self.session['storage_state'])
+        else:
+            self.context = await self.browser.new_context()
+        if self.request_blocker:
+            await self.request_blocker.install_async(self.context)
+        self.page = await self.context.new_page()
+
+    async def restore_session(self):
+        """Open the saved course URL and check the session is still logged in"""
+        try:
+            await self.page.goto(self.session['course_url'])
+            frame = await self.course_frame(self.page, session_settings(self.config)['check_timeout'])
+            email = self.config['login']['email']
+            if not frame or await self.page.get_by_role(email['role'], name=email['name']).count() > 0:
+                return False
+            self.course_url = self.session['course_url']
+            return True
+        except Exception as e:
+            logger.warning(f"Saved session check failed: {e}")
+            return False
+
+    async def open_course(self):
+        """Reuse the saved session if it is still valid, otherwise login and open the course"""
+        started = time.perf_counter()
+        with self.tracer.span("restore_session"):
+            restored = bool(self.session) and await self.restore_session()
+        if restored:
+            logger.info(f"Startup via saved session took {time.perf_counter() - started:.1f}s")
+            return True
+        if self.session:
+            logger.info("Saved session has expired, falling back to full login")
+            clear_session(self.config)
+        with self.tracer.span("login"):
+            if not await self.login():
+                return False
+        with self.tracer.span("navigate_to_course", course=self.config['course_name']):
+            if not await self.navigate_to_course(self.config['course_name']):
+                return False
+        save_session(await self.context.storage_state(), self.course_url, self.config)
+        logger.info(f"Startup via full login took {time.perf_counter() - started:.1f}s")
+        return True
+
+    async def login(self):
+        """Login to the platform on the first tab"""
+        try:
+            login = self.config['login']
+            logger.info(f"Logging in to {self.config['platform']}")
+            await self.page.goto(self.config['url'])
+            await self.page.get_by_role(login['email']['role'], name=login['email']['name']).fill(os.getenv("PLATFORM_EMAIL"))
+            await self.page.get_by_role(login['password']['role'], name=login['password']['name']).fill(os.getenv("PLATFORM_PASSWORD"))
+            await self.page.get_by_role(login['button']['role'], name=login['button']['name']).click()
+            await self.page.wait_for_load_state("networkidle", timeout=self.waits['network_idle_timeout'])
+            logger.info("Login successful")
+            return True
+        except Exception as e:
+            logger.error(f"Login failed: {e}")
+            return False
+
+    async def navigate_to_course(self, course_name):
+        """Open the course on the first tab and remember its URL for the other tabs"""
+        try:
+            navigation = self.config['course_navigation']
+            logger.info(f"Navigating to course: {course_name}")
+            await self.page.get_by_role(navigation['view_courses']['role'], name=navigation['view_courses']['name']).click()
+            first_frame = self.page.frame_locator(navigation['frame']).first
+            button = first_frame.get_by_role("button", name=course_name)
+            try:
+                await button.first.wait_for(state="visible", timeout=self.waits['element_timeout'])
+            except Exception:
+                button = first_frame.get_by_role("button").filter(has_text=navigation['partial_match'])
+            await button.first.click(timeout=60000)
+            if not await self.course_frame(self.page):
+                return False
+            self.course_url = self.page.url
+            logger.info(f"Course opened at {self.course_url}")
+            return True
+        except Exception as e:
+            logger.error(f"Error navigating to course: {e}")
+            return False
+
+    async def course_frame(self, page, timeout=None):
+        """Wait for the course iframe of a tab to attach"""
+        deadline = time.perf_counter() + (timeout or self.waits['frame_timeout']) / 1000
+        while time.perf_counter() < deadline:
+            frame = page.frame(self.config['course_frame'])
+            if frame and not frame.is_detached():
+                return frame
+            await asyncio.sleep(self.waits['poll_interval'] / 1000)
+        logger.error("Couldn't locate course iframe!")
+        return None
+
+    async def settle(self, page):
+        try:
+            await page.wait_for_load_state("networkidle", timeout=self.waits['network_idle_timeout'])
+        except Exception:
+            pass
+
+    async def click_matching(self, frame, names, fallback_texts=()):
+        """Resolve a button with one evaluate and click it by index"""
+        candidates = await frame.evaluate(COLLECT_CLICKABLES_JS, CLICKABLE_SELECTOR)
+        candidate = self.resolver.match(candidates, names, fallback_texts)
+        if candidate is None:
+            return None
+        await frame.locator(CLICKABLE_SELECTOR).nth(candidate['index']).click()
+        return candidate
+
+    async def click_item(self, page, tab_id, text, kind, attempts=5):
+        """Click a unit, subtopic or quiz once it is rendered in the tab's course frame"""
+        with self.tracer.span(f"navigate_{kind}", tid=tab_id, name=text):
+            return await self._click_item(page, text, kind, attempts)
+
+    async def _click_item(self, page, text, kind, attempts):
+        for attempt in range(attempts):
+            frame = await self.course_frame(page)
+            if not frame:
+                continue
+            try:
+                await frame.get_by_text(text).first.wait_for(state="visible", timeout=self.waits['element_timeout'])
+                if await self.click_text(frame, text, kind):
+                    await self.settle(page)
+                    return True
+            except Exception as e:
+                logger.error(f"Attempt {attempt + 1} to click {kind} '{text}' failed: {e}")
+        logger.error(f"Failed to click on {kind}: {text} after multiple attempts")
+        return False
+
+    async def click_text(self, frame, text, kind):
+        """Click a course item by its text, with the same ranked strategies as the sync automation"""
+
+        async def click_role(role):
+            locator = frame.get_by_role(role, name=text)
+            if await locator.count() == 0:
+                return False
+            await locator.first.click()
+            return True
+
+        strategies = [
+            ("resolver_scan", lambda: self.click_matching(frame, [text])),
+            ("role_button", lambda: click_role("button")),
+            ("role_link", lambda: click_role("link"))
+        ]
+        return await run_strategies_async(self.strategy_stats, f"click_{kind}", strategies)
+
+    async def click_submit_or_next(self, frame, submit_mode=True):
+        names, texts = control_names(self.config, submit_mode)
+        action = "submit" if submit_mode else "next"
+
+        async def role_names():
+            for name in names:
+                button = frame.get_by_role("button", name=name)
+                if await button.count() > 0 and await button.first.is_enabled():
+                    await button.first.click()
+                    return True
+            return False
+
+        strategies = [("resolver_scan", lambda: self.click_matching(frame, names, texts)), ("role_names", role_names)]
+        for attempt in range(3):
+            if await run_strategies_async(self.strategy_stats, action, strategies):
+                return True
+            await asyncio.sleep(1)
+        return False
+
+    async def page_state(self, frame, tab_id):
+        """Classify the question shown in the frame with a single round-trip"""
+        with self.tracer.span("classify", tid=tab_id):
+            return await classify_page_async(frame, self.config, self.resolver)
+
+    async def answer_question(self, page, frame, tab_id, state, question_text):
+        """Answer the question currently shown in the frame; coding answers return the code entered"""
+        if state.question_type == "coding":
+            code = await asyncio.to_thread(self.get_code_answer, question_text)
+            if code is None:
+                return False
+            return code if await self.enter_code(page, frame, tab_id, state, code) else False
+
+        action = await asyncio.to_thread(self.answer_quiz, question_text, state)
+        if action is None:
+            return False
+        if action['kind'] == "skip":
+            logger.error(f"Tab {tab_id}: nothing to enter ({action['reason']})")
+            return False
+        if action['kind'] == "check":
+            checkboxes = frame.locator("input[type='checkbox']")
+            with self.tracer.span("answer", tid=tab_id, kind="checkbox"):
+                for idx in action['options']:
+                    await checkboxes.nth(idx - 1).check()
+            return True
+        with self.tracer.span("answer", tid=tab_id, kind="text"):
+            await frame.locator(TEXT_INPUT_SELECTOR).first.fill(action['text'])
+        return True
+
+    async def enter_code(self, page, frame, tab_id, state, code):
+        type_delay = self.config.get('editor', {}).get('type_delay', 10)
+        with self.tracer.span("answer", tid=tab_id, kind="code"):
+            return await insert_code_async(page, frame, code, kind=state.editor_kind, type_delay=type_delay) is not None
+
+    async def submit_answer(self, page, frame, tab_id, state, question_text, code):
+        """Submit and wait for the verdict, resubmitting rejected code with a fix; None if Submit was not clicked"""
+        max_resubmits = self.feedback.settings['max_resubmits'] if code else 0
+        for resubmit in range(max_resubmits + 1):
+            baseline = await self.feedback.snapshot_async(frame)
+            with self.tracer.span("submit", tid=tab_id):
+                if not await self.click_submit_or_next(frame, submit_mode=True):
+                    return None
+            with self.tracer.span("feedback", tid=tab_id) as span:
+                result = await self.feedback.wait_async(frame, baseline, state.question_type)
+                span.update(status=result.status)
+            if not result.failed or resubmit == max_resubmits:
+                break
+            try:
+                fixed = await asyncio.to_thread(self.fix_code, question_text, code, result.message)
+            except LLMError as e:
+                logger.error(f"Tab {tab_id}: Groq error while fixing code: {e}")
+                break
+            if not await self.enter_code(page, frame, tab_id, state, fixed):
+                break
+            code = fixed
+        await asyncio.to_thread(self.settle_cached_answer, question_text, state.question_type, result, code if resubmit else None)
+        return result
+
+    async def solve_question(self, page, frame, tab_id, state, position, number):
+        """Answer and submit one question; False ends the quiz"""
+        with self.tracer.span("capture", tid=tab_id) as span:
+            capture = self.captures.get(tab_id)
+            question = capture.take(state, self.config.get('min_question_chars', 20)) if capture else None
+            if question is None:
+                evaluated = await frame.evaluate(EXTRACT_QUESTION_JS, question_selectors(self.config))
+                question = finish_question(evaluated, self.config)
+            span.update(source=question['source'])
+        answered = await self.answer_question(page, frame, tab_id, state, question['text'])
+        if not answered:
+            return False
+        code = answered if state.question_type == "coding" else None
+        result = await self.submit_answer(page, frame, tab_id, state, question['text'], code)
+        if result is None:
+            return False
+        self.results.append({"question": number, "type": state.question_type, **position, **asdict(result)})
+        return True
+
+    async def next_question(self, page, frame, tab_id):
+        """Click Next and wait for a different question; its fingerprint ('' if the page has none), or None at the end of the quiz"""
+        baseline = await self.transitions.fingerprint_async(frame)
+        with self.tracer.span("next", tid=tab_id):
+            if not await self.click_submit_or_next(frame, submit_mode=False):
+                return None
+        with self.tracer.span("transition", tid=tab_id):
+            return await self.transitions.wait_for_change_async(page, self.config['course_frame'], baseline)
+
+    async def solve_quiz(self, page, tab_id, position, answered=0):
+        """Solve every question of the quiz open in a tab, until Next stops bringing up new questions.
+
+        The first `answered` questions are skipped with Next. Returns (questions solved, reached the end);
+        False means the quiz was abandoned part way.
+        """
+        question_count = 0
+        seen = set()
+        duplicates = 0
+        while question_count < self.transitions.settings['max_questions']:
+            frame = await self.course_frame(page)
+            if not frame:
+                return question_count, False
+            fingerprint = await self.transitions.fingerprint_async(frame)
+            if fingerprint and fingerprint in seen:
+                duplicates += 1
+                logger.info(f"Tab {tab_id}: question already answered in this quiz, skipping it")
+                if duplicates > self.transitions.settings['max_duplicates'] or await self.next_question(page, frame, tab_id) is None:
+                    return question_count, True
+                continue
+            duplicates = 0
+            state = await self.page_state(frame, tab_id)
+            if not state.has_submit:
+                return question_count, True
+            question_count += 1
+            seen.add(fingerprint)
+            if question_count <= answered:
+                logger.info(f"Tab {tab_id}: question {question_count} already answered in a previous run, skipping")
+                if await self.next_question(page, frame, tab_id) is not None:
+                    continue
+                logger.warning(f"Tab {tab_id}: could not skip ahead, answering the question again")
+                frame = await self.course_frame(page)
+                if not frame:
+                    return question_count - 1, False
+                state = await self.page_state(frame, tab_id)
+            with self.tracer.span("question", tid=tab_id, index=question_count):
+                if not await self.solve_question(page, frame, tab_id, state, position, question_count):
+                    return question_count - 1, False
+            self.progress[tab_id]['questions'] += 1
+            if self.journal:
+                self.journal.record("question", question=question_count, **position)
+            if await self.next_question(page, frame, tab_id) is None:
+                return question_count, True
+        logger.warning(f"Tab {tab_id}: stopped after {question_count} questions (transitions.max_questions)")
+        return question_count, False
+
+    async def check_course_index(self):
+        """Drop the course index if the Contents page no longer matches it"""
+        if not self.course_index or not self.course_index.data or not self.course_index.item_selector:
+            return
+        frame = await self.course_frame(self.page)
+        if not frame:
+            return
+        contents = self.config['contents_navigation']
+        await frame.get_by_role(contents['role'], name=contents['name']).click()
+        await self.settle(self.page)
+        if not self.course_index.matches(await self.course_index.items_async(frame)):
+            self.course_index.invalidate("Contents page changed")
+
+    async def run_subtopic(self, page, tab_id, unit, subtopic):
+        """Navigate a tab from Contents to one subtopic's quiz and solve it"""
+        frame = await self.course_frame(page)
+        if not frame:
+            return False
+        contents = self.config['contents_navigation']
+        url = self.course_index.quiz_url(unit['name'], subtopic['name'], subtopic['quiz']) if self.course_index else None
+        if url:
+            with self.tracer.span("navigate_quiz", tid=tab_id, name=subtopic['quiz'], via="index"):
+                await frame.goto(url)
+                await self.settle(page)
+        else:
+            await frame.get_by_role(contents['role'], name=contents['name']).click()
+            await self.settle(page)
+            for text, kind in ((unit['name'], "unit"), (subtopic['name'], "subtopic"), (subtopic['quiz'], "quiz")):
+                if not await self.click_item(page, tab_id, text, kind):
+                    return False
+        position = {"unit": unit['name'], "subtopic": subtopic['name'], "quiz": subtopic['quiz']}
+        answered = 0
+        if self.journal and self.config.get('journal', {}).get('skip_answered_questions', True):
+            answered = self.journal.questions_done(**position)
+        with self.tracer.span("subtopic", tid=tab_id, name=subtopic['name']):
+            questions, finished = await self.solve_quiz(page, tab_id, position, answered)
+        logger.info(f"Tab {tab_id}: completed {questions} questions in {subtopic['name']}")
+        if not finished:
+            logger.warning(f"Tab {tab_id}: {subtopic['quiz']} was abandoned before its end, not marking it complete")
+            return False
+        if self.journal:
+            self.journal.record("quiz", **position)
+            self.journal.record("subtopic", unit['name'], subtopic['name'])
+        return True
+
+    async def prepare_tab(self, tab_id, page):
+        """Attach the tab's resource monitor and question capture to a (new) page"""
+        if tab_id not in self.monitors:
+            self.monitors[tab_id] = ResourceMonitor.from_config(self.config)
+            self.captures[tab_id] = QuestionCapture.from_config(self.config)
+        if self.monitors[tab_id]:
+            await self.monitors[tab_id].attach_async(self.browser, page)
+        if self.captures[tab_id]:
+            self.captures[tab_id].install_async(page)
+
+    async def recycle_tab(self, tab_id, page, reason):
+        """Replace a tab whose renderer grew too large; the shared context keeps the login"""
+        logger.info(f"Tab {tab_id}: recycling the page: {reason}")
+        with self.tracer.span("recycle", tid=tab_id, mode="page"):
+            new_page = await self.open_tab()
+            await page.close()
+            await self.prepare_tab(tab_id, new_page)
+            self.monitors[tab_id].recycled()
+        return new_page
+
+    async def worker(self, tab_id, page, queue):
+        self.progress[tab_id] = {"subtopics": 0, "questions": 0, "current": None}
+        await self.prepare_tab(tab_id, page)
+        while True:
+            try:
+                unit, subtopic = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            self.progress[tab_id]['current'] = f"{unit['name']} / {subtopic['name']}"
+            started = time.perf_counter()
+            try:
+                if await self.run_subtopic(page, tab_id, unit, subtopic):
+                    self.progress[tab_id]['subtopics'] += 1
+            except Exception as e:
+                logger.error(f"Tab {tab_id}: error in {subtopic['name']}: {e}")
+            finally:
+                queue.task_done()
+            monitor = self.monitors.get(tab_id)
+            reason = await monitor.after_quiz_async(f"Tab {tab_id}: ") if monitor else None
+            if reason and not queue.empty():
+                page = await self.recycle_tab(tab_id, page, reason)
+            logger.info(
+                f"Tab {tab_id}: {subtopic['name']} took {time.perf_counter() - started:.1f}s "
+                f"({self.progress[tab_id]['subtopics']} subtopics, {self.progress[tab_id]['questions']} questions, "
+                f"{queue.qsize()} subtopics queued)"
+            )
+        self.progress[tab_id]['current'] = None
+
+    async def open_tab(self):
+        page = await self.context.new_page()
+        await page.goto(self.course_url)
+        return page
+
+    async def run(self, playwright):
+        """Login once, then spread the configured subtopics across the tab pool"""
+        await self.start(playwright)
+        if not await self.open_course():
+            return False
+        await self.check_course_index()
+
+        units = self.config.get('units') or (self.course_index.units() if self.course_index else [])
+        queue = asyncio.Queue()
+        for unit in units:
+            for subtopic in unit['subtopics']:
+                if self.journal and self.journal.subtopic_done(unit['name'], subtopic['name']):
+                    continue
+                queue.put_nowait((unit, subtopic))
+        tab_count = max(1, min(self.tabs, queue.qsize()))
+        logger.info(f"Scheduling {queue.qsize()} subtopics across {tab_count} tabs")
+
+        pages = [self.page] + list(await asyncio.gather(*(self.open_tab() for _ in range(tab_count - 1))))
+        started = time.perf_counter()
+        await asyncio.gather(*(self.worker(tab_id, page, queue) for tab_id, page in enumerate(pages, start=1)))
+
+        if self.journal:
+            for unit in units:
+                if all(self.journal.subtopic_done(unit['name'], subtopic['name']) for subtopic in unit['subtopics']):
+                    self.journal.record("unit", unit['name'])
+
+        for tab_id, progress in sorted(self.progress.items()):
+            logger.info(f"Tab {tab_id}: {progress['subtopics']} subtopics, {progress['questions']} questions")
+        logger.info(f"All subtopics processed in {time.perf_counter() - started:.1f}s")
+        summarize(self.results)
+        self.report(
+            [(f"Tab {tab_id}: ", monitor) for tab_id, monitor in sorted(self.monitors.items())],
+            [capture for _, capture in sorted(self.captures.items())]
+        )
+        hold_seconds = browser_settings(self.config)['debug_hold_seconds']
+        if hold_seconds:
+            logger.info(f"Browser remains open for debugging for {hold_seconds}s")
+            await asyncio.sleep(hold_seconds)
+        await self.browser.close()
+        return True
+
+
+async def run_async(config):
+    async with async_playwright() as playwright:
+        return await AsyncQuizAutomation(config).run(playwright)
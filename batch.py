@@ -0,0 +1,54 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sections bound to the one browser session a batch shares (login, context, page listeners,
+# logging and trace), so a course cannot override them
+SESSION_KEYS = (
+    "platform", "url", "login", "browser", "session", "resources", "question_capture",
+    "concurrency", "logging", "trace"
+)
+
+
+def session_overrides(course):
+    """Keys a course definition sets that a batch cannot change per course"""
+    return [key for key in SESSION_KEYS if key in course]
+
+
+def course_config(config, course):
+    """config.json with one batch course's definition applied on top.
+
+    A course is {"course_name": ..., "units": [...]} plus optional "partial_match" and any
+    other top-level keys to override except SESSION_KEYS. Without units the course index is
+    used; without partial_match the course name doubles as the partial match on the course list.
+    """
+    course = dict(course)
+    merged = dict(config)
+    merged['units'] = []
+    merged['course_navigation'] = dict(config.get('course_navigation', {}))
+    merged['course_navigation']['partial_match'] = course.pop('partial_match', course['course_name'])
+    merged.update(course)
+    merged.pop('courses', None)
+    return merged
+
+
+def batch_courses(config):
+    """The 'courses' list with each definition merged into the config"""
+    return [course_config(config, course) for course in config.get('courses', [])]
+
+
+def summarize_courses(summaries):
+    """Log one line per course of a batch run and the totals"""
+    if not summaries:
+        return
+    lines = [f"{'course':<32}{'status':<12}{'time':>9}{'questions':>11}{'passed':>8}"]
+    for summary in summaries:
+        lines.append(
+            f"{summary['course'][:31]:<32}{summary['status']:<12}{summary['seconds']:>8.0f}s"
+            f"{summary['questions']:>11}{summary['passed']:>8}"
+        )
+    total_seconds = sum(summary['seconds'] for summary in summaries)
+    total_questions = sum(summary['questions'] for summary in summaries)
+    total_passed = sum(summary['passed'] for summary in summaries)
+    lines.append(f"{'total':<32}{'':<12}{total_seconds:>8.0f}s{total_questions:>11}{total_passed:>8}")
+    logger.info(f"Batch results for {len(summaries)} courses:\n" + "\n".join(lines))
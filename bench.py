@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+
+from mock_platform import MockPlatformServer, build_config, generate_course
+from stub_llm import StubGroq
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the automation offline against the mock platform")
+    parser.add_argument("--units", type=int, default=2)
+    parser.add_argument("--subtopics", type=int, default=3)
+    parser.add_argument("--questions", type=int, default=10, help="questions per quiz")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="stub LLM latency in seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.1)
+    parser.add_argument("--page-latency", type=float, default=0.02, help="mock server delay per request in seconds")
+    parser.add_argument("--feedback-delay", type=float, default=0.3, help="delay before submission feedback renders")
+    parser.add_argument("--tabs", type=int, default=1)
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--output", help="write the report as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def run_benchmark(args):
+    """Run one full course on the mock platform and return the report dict"""
+    os.environ.setdefault("PLATFORM_EMAIL", "bench@example.com")
+    os.environ.setdefault("PLATFORM_PASSWORD", "bench")
+    os.environ.setdefault("GROQ_API_KEY", "stub")
+
+    # Imported here so `cli.py validate-config` and `--help` never load Playwright
+    import answers
+    import main
+    from logging_setup import setup_logging
+    from playwright.sync_api import sync_playwright
+
+    course = generate_course(args.units, args.subtopics, args.questions)
+    server = MockPlatformServer(course, args.page_latency, args.feedback_delay).start()
+    work_dir = tempfile.mkdtemp(prefix="quiz_bench_")
+    config = build_config(server.base_url, course, work_dir)
+    config['concurrency']['tabs'] = args.tabs
+    config['browser']['headless'] = not args.headed
+    # Set before config.json is written, since the sync engine reads its settings from that file
+    config['trace'] = {"enabled": True, "path": os.path.join(work_dir, "quiz_trace.json")}
+    setup_logging(config)
+    config_path = os.path.join(work_dir, "config.json")
+    with open(config_path, 'w') as file:
+        json.dump(config, file, indent=2)
+
+    stub = StubGroq(args.llm_latency, args.llm_jitter)
+    answers.set_client(stub)
+    main.EMAIL, main.PASSWORD = os.environ["PLATFORM_EMAIL"], os.environ["PLATFORM_PASSWORD"]
+
+    started = time.perf_counter()
+    try:
+        if args.tabs > 1:
+            from async_engine import AsyncQuizAutomation
+            from playwright.async_api import async_playwright
+
+            async def run_tabs():
+                async with async_playwright() as playwright:
+                    automation = AsyncQuizAutomation(config)
+                    await automation.run(playwright)
+                    return automation
+
+            automation = asyncio.run(run_tabs())
+        else:
+            with sync_playwright() as playwright:
+                automation = main.QuizAutomation(playwright, config_path)
+                automation.start()
+                automation.process_units(config['units'])
+                automation.export_trace()
+                automation.browser.close()
+    finally:
+        server.shutdown()
+    total = time.perf_counter() - started
+
+    # With several tabs, phases overlap, so their sum can exceed wall-clock time
+    phases = automation.tracer.phase_totals()
+    phases['other'] = max(0.0, total - sum(phases.values()))
+    questions = len(server.answered)
+    subtopics = server.stats['quizzes_completed']
+    return {
+        "total_seconds": total,
+        "questions_generated": args.units * args.subtopics * args.questions,
+        "questions_answered": questions,
+        "submissions": server.stats['submissions'],
+        "correct": server.stats['correct'],
+        "subtopics_completed": subtopics,
+        "seconds_per_question": total / questions if questions else None,
+        "seconds_per_subtopic": total / subtopics if subtopics else None,
+        "llm_calls": stub.calls,
+        "phases": phases,
+        # Waits after Next; timeouts are transitions that ran into transitions.timeout
+        "transitions": automation.transitions.stats(),
+        "trace_file": config['trace']['path'],
+        "config": vars(args)
+    }
+
+
+def print_report(report):
+    def fmt(value):
+        return "n/a" if value is None else f"{value:.2f}"
+
+    print(f"\nQuestions answered : {report['questions_answered']}/{report['questions_generated']} "
+          f"({report['correct']} correct, submissions {report['submissions']})")
+    print(f"Subtopics completed: {report['subtopics_completed']}")
+    print(f"Total              : {report['total_seconds']:.1f}s")
+    print(f"Seconds/question   : {fmt(report['seconds_per_question'])}")
+    print(f"Seconds/subtopic   : {fmt(report['seconds_per_subtopic'])}")
+    transitions = report['transitions']
+    print(f"Transitions        : {transitions['waits']} waits, max {transitions['max_seconds']:.2f}s, "
+          f"{transitions['timeouts']} timed out")
+    print("\nPhase breakdown:")
+    for name, seconds in sorted(report['phases'].items(), key=lambda item: -item[1]):
+        share = 100 * seconds / report['total_seconds'] if report['total_seconds'] else 0
+        print(f"  {name:<24} {seconds:8.1f}s  {share:5.1f}%")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_benchmark(args)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
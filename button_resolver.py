@@ -0,0 +1,101 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Every element the automation is willing to treat as a clickable control
+CLICKABLE_SELECTOR = "button, div[role='button']"
+
+# Describes one clickable element; shared by the resolver and the page classifier
+DESCRIBE_CLICKABLE_JS = """
+(el, index) => {
+    const rect = el.getBoundingClientRect();
+    const style = window.getComputedStyle(el);
+    const tag = el.tagName.toLowerCase();
+    return {
+        index: index,
+        tag: tag,
+        role: el.getAttribute('role') || (tag === 'button' ? 'button' : ''),
+        text: (el.innerText || el.textContent || '').trim(),
+        label: (el.getAttribute('aria-label') || '').trim(),
+        visible: rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none',
+        disabled: !!el.disabled || el.getAttribute('aria-disabled') === 'true'
+    };
+}
+"""
+
+# Collects text, role and index for every clickable candidate in a single evaluate call.
+# The index matches locator(CLICKABLE_SELECTOR).nth(index) since both use document order.
+COLLECT_CLICKABLES_JS = f"""
+(selector) => Array.from(document.querySelectorAll(selector)).map({DESCRIBE_CLICKABLE_JS})
+"""
+
+# Generic button texts tried when none of the configured names match
+SUBMIT_TEXTS = ["submit", "check", "run", "execute", "verify"]
+NEXT_TEXTS = ["next", "continue"]
+
+
+def button_names(entries):
+    """Normalize configured buttons (plain names or role/name dicts) to lowercase names"""
+    names = []
+    for entry in entries or []:
+        name = entry.get("name", "") if isinstance(entry, dict) else str(entry)
+        if name.strip():
+            names.append(name.strip().lower())
+    return names
+
+
+def control_names(config, submit_mode=True):
+    """Configured names and fallback texts for the submit or the next/continue control"""
+    if submit_mode:
+        return button_names(config.get('submit_buttons', SUBMIT_TEXTS)), SUBMIT_TEXTS
+    return button_names(config.get('next_buttons', NEXT_TEXTS)), NEXT_TEXTS
+
+
+class ButtonResolver:
+    """Find and click buttons with one in-frame evaluate instead of a round-trip per element"""
+
+    def __init__(self):
+        # Round-trips made by the last click(), shown in its log line
+        self.round_trips = 0
+
+    def collect(self, frame):
+        """Return every clickable candidate in the frame"""
+        self.round_trips += 1
+        return frame.evaluate(COLLECT_CLICKABLES_JS, CLICKABLE_SELECTOR)
+
+    def match(self, candidates, names, fallback_texts=(), include_disabled=False):
+        """Pick the best candidate for the given names.
+
+        Exact name matches win over substring matches, which win over the
+        generic fallback texts. Native buttons are preferred over div buttons,
+        mirroring the order the element scans used to run in. include_disabled
+        also accepts disabled controls, for checking that one exists at all.
+        """
+        usable = [c for c in candidates if c["visible"] and (include_disabled or not c["disabled"])]
+        usable.sort(key=lambda c: c["tag"] != "button")
+        names = [n.lower() for n in names if n]
+        fallback_texts = [t.lower() for t in fallback_texts if t]
+
+        def labels(candidate):
+            return [candidate["text"].lower(), candidate["label"].lower()]
+
+        for candidate in usable:
+            if any(label == name for label in labels(candidate) for name in names):
+                return candidate
+        for candidate in usable:
+            if any(name in label for label in labels(candidate) for name in names):
+                return candidate
+        for candidate in usable:
+            if any(text in label for label in labels(candidate) for text in fallback_texts):
+                return candidate
+        return None
+
+    def click(self, frame, names, fallback_texts=()):
+        """Resolve and click the best candidate, returning it or None"""
+        self.round_trips = 0
+        candidate = self.match(self.collect(frame), names, fallback_texts)
+        if candidate is None:
+            return None
+        self.round_trips += 1
+        frame.locator(CLICKABLE_SELECTOR).nth(candidate["index"]).click()
+        return candidate
@@ -0,0 +1,131 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from answers import parse_quiz_answer, plan_quiz_action
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CASSETTE = {
+    "record": False,
+    "path": "quiz_cassette.jsonl.gz"
+}
+
+
+def cassette_settings(config):
+    settings = dict(DEFAULT_CASSETTE)
+    settings.update(config.get('cassette', {}))
+    return settings
+
+
+def fixture_id(page_content, response, question_type):
+    return hashlib.sha256("\x00".join([page_content, response, question_type]).encode('utf-8')).hexdigest()[:16]
+
+
+def load_fixtures(path):
+    """All fixtures in a cassette; a torn last line from an interrupted run is skipped"""
+    fixtures = []
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    fixtures.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"Skipping incomplete fixture in {path}")
+    except EOFError:
+        logger.warning(f"{path} ends mid-write; using the fixtures read so far")
+    return fixtures
+
+
+class Cassette:
+    """Gzip JSON-lines store of page text, prompt, raw response, parsed answer and planned action per question.
+
+    Identical exchanges are stored once, so re-running a course does not grow the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.known = {fixture['id'] for fixture in load_fixtures(path)} if os.path.exists(path) else set()
+        self.recorded = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the recorder from the 'cassette' config section, or return None unless recording"""
+        settings = cassette_settings(config)
+        if not settings['record']:
+            return None
+        return cls(settings['path'])
+
+    def record(self, page_content, state, prompt, response, answer, action):
+        fixture = {
+            "id": fixture_id(page_content, response, state.question_type),
+            "time": round(time.time(), 3),
+            "question_type": state.question_type,
+            "checkbox_count": state.checkbox_count,
+            "text_input_count": state.text_input_count,
+            "page_text": page_content,
+            "prompt": prompt,
+            "response": response,
+            "answer": answer,
+            "action": action
+        }
+        with self.lock:
+            if fixture['id'] in self.known:
+                return
+            self.known.add(fixture['id'])
+            # Each append is its own gzip member; readers see them as one stream
+            with gzip.open(self.path, 'at', encoding='utf-8') as file:
+                file.write(json.dumps(fixture, ensure_ascii=False) + "\n")
+            self.recorded += 1
+
+
+def replay(fixtures):
+    """Drive parse_quiz_answer and plan_quiz_action from fixtures; returns (mismatches, seconds)"""
+    mismatches = []
+    started = time.perf_counter()
+    for fixture in fixtures:
+        answer = parse_quiz_answer(fixture['response'])
+        action = plan_quiz_action(
+            answer, fixture['question_type'], fixture['checkbox_count'], fixture['text_input_count']
+        )
+        if answer != fixture['answer'] or action != fixture['action']:
+            mismatches.append({"fixture": fixture, "answer": answer, "action": action})
+    return mismatches, time.perf_counter() - started
+
+
+def main(argv=None):
+    """Replay a cassette: report fixtures whose answer or action changed, and the parse/plan throughput"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("usage: python cassette.py <cassette.jsonl.gz> [repeat]")
+        return 1
+    if not os.path.exists(argv[0]):
+        print(f"No cassette at {argv[0]}")
+        return 1
+    fixtures = load_fixtures(argv[0])
+    repeat = int(argv[1]) if len(argv) > 1 else 1
+    if not fixtures:
+        print(f"No fixtures in {argv[0]}")
+        return 1
+    total = 0.0
+    for _ in range(repeat):
+        mismatches, seconds = replay(fixtures)
+        total += seconds
+    for mismatch in mismatches:
+        fixture = mismatch['fixture']
+        print(f"{fixture['id']} ({fixture['question_type']}): recorded {fixture['answer']!r} -> {fixture['action']}")
+        print(f"{'':<18} replayed {mismatch['answer']!r} -> {mismatch['action']}")
+    count = len(fixtures) * repeat
+    print(f"{len(fixtures)} fixtures, {len(mismatches)} changed; "
+          f"{count} replays in {total * 1000:.1f} ms ({total / count * 1e6:.1f} us/question)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+# Only the standard library is imported here; every subsystem is imported inside the
+# command that needs it, so validate-config and --dry-run never load Playwright or Groq.
+
+DEFAULT_CONFIG = "config.json"
+
+REQUIRED_ENV = {
+    "run": ("PLATFORM_EMAIL", "PLATFORM_PASSWORD", "GROQ_API_KEY"),
+    "resume": ("PLATFORM_EMAIL", "PLATFORM_PASSWORD", "GROQ_API_KEY"),
+    "batch": ("PLATFORM_EMAIL", "PLATFORM_PASSWORD", "GROQ_API_KEY"),
+    "discover": ("PLATFORM_EMAIL", "PLATFORM_PASSWORD")
+}
+
+REQUIRED_KEYS = {
+    "url": str,
+    "course_name": str,
+    "course_frame": str,
+    "login": dict,
+    "course_navigation": dict,
+    "contents_navigation": dict,
+    "back_to_contents": dict,
+    "submit_buttons": list,
+    "next_buttons": list,
+    "quiz_prompt": str,
+    "code_prompt": str
+}
+
+OPTIONAL_SECTIONS = (
+    "waits", "editor", "answer_cache", "journal", "question_selectors", "concurrency", "session", "browser",
+    "trace", "llm", "models", "rate_limits", "course_index", "strategy_stats", "verify_code", "feedback", "resources",
+    "cassette", "logging", "question_capture", "transitions"
+)
+
+KNOWN_KEYS = set(REQUIRED_KEYS) | set(OPTIONAL_SECTIONS) | {"platform", "units", "courses", "min_question_chars", "code_fix_prompt"}
+
+# Placeholders each prompt is formatted with in answers.py
+PROMPT_FIELDS = {
+    "quiz_prompt": {"content": ""},
+    "code_prompt": {"content": ""},
+    "code_fix_prompt": {"content": "", "code": "", "failures": ""}
+}
+
+
+def load_config(path):
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def load_environment():
+    """Read .env into the environment (python-dotenv is optional for commands that need no credentials)"""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
+
+def check_role_selector(problems, where, value):
+    if not isinstance(value, dict) or not value.get('role') or not value.get('name'):
+        problems.append(f"{where} needs a 'role' and a 'name'")
+
+
+def validate_config(config):
+    """Problems that would stop or derail a run, found without opening a browser"""
+    problems = []
+    for key, expected in REQUIRED_KEYS.items():
+        if key not in config:
+            problems.append(f"missing '{key}'")
+        elif not isinstance(config[key], expected):
+            problems.append(f"'{key}' should be a {expected.__name__}")
+    for key in config:
+        if not key.startswith("//") and key not in KNOWN_KEYS:
+            problems.append(f"unknown key '{key}' (misspelt?)")
+    for key in OPTIONAL_SECTIONS:
+        if key in config and not isinstance(config[key], dict):
+            problems.append(f"'{key}' should be an object")
+
+    login = config.get('login', {})
+    if isinstance(login, dict):
+        for field in ('email', 'password', 'button'):
+            check_role_selector(problems, f"login.{field}", login.get(field))
+    for key in ('contents_navigation', 'back_to_contents'):
+        if isinstance(config.get(key), dict):
+            check_role_selector(problems, key, config[key])
+    for i, button in enumerate(config.get('next_buttons', []) if isinstance(config.get('next_buttons'), list) else []):
+        check_role_selector(problems, f"next_buttons[{i}]", button)
+
+    for key, fields in PROMPT_FIELDS.items():
+        template = config.get(key)
+        if not isinstance(template, str):
+            continue
+        try:
+            template.format(**fields)
+        except (KeyError, IndexError, ValueError) as e:
+            problems.append(f"'{key}' cannot be formatted ({type(e).__name__}: {e}); escape literal braces as {{{{ }}}}")
+
+    units = config.get('units', [])
+    if not isinstance(units, list):
+        problems.append("'units' should be a list")
+        units = []
+    if not units and not config.get('course_index', {}).get('enabled', True):
+        problems.append("no 'units' listed and the course index is disabled, so there is nothing to process")
+    course_index = config.get('course_index', {})
+    if isinstance(course_index, dict) and course_index.get('auto_discover') and not course_index.get('item_selector'):
+        problems.append("'course_index.auto_discover' needs 'course_index.item_selector' to find the course items")
+    for i, unit in enumerate(units):
+        if not isinstance(unit, dict) or not unit.get('name'):
+            problems.append(f"units[{i}] needs a 'name'")
+            continue
+        for j, subtopic in enumerate(unit.get('subtopics', [])):
+            if not isinstance(subtopic, dict) or not subtopic.get('name') or not subtopic.get('quiz'):
+                problems.append(f"units[{i}].subtopics[{j}] needs a 'name' and a 'quiz'")
+
+    from batch import session_overrides
+    courses = config.get('courses', [])
+    if not isinstance(courses, list):
+        problems.append("'courses' should be a list")
+        courses = []
+    for i, course in enumerate(courses):
+        if not isinstance(course, dict) or not course.get('course_name'):
+            problems.append(f"courses[{i}] needs a 'course_name'")
+            continue
+        if not isinstance(course.get('units', []), list):
+            problems.append(f"courses[{i}].units should be a list")
+        for key in session_overrides(course):
+            problems.append(f"courses[{i}].{key} cannot differ per course; the batch shares one browser session")
+
+    tabs = config.get('concurrency', {}).get('tabs', 1)
+    if not isinstance(tabs, int) or tabs < 1:
+        problems.append("'concurrency.tabs' should be a positive integer")
+
+    feedback = config.get('feedback', {})
+    for key, patterns in feedback.items() if isinstance(feedback, dict) else []:
+        if key.endswith("_patterns"):
+            for pattern in patterns:
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    problems.append(f"feedback.{key}: bad pattern {pattern!r} ({e})")
+
+    rate_limits = config.get('rate_limits', {})
+    for name, route in config.get('models', {}).items() if isinstance(config.get('models'), dict) else []:
+        if name.startswith("//"):
+            continue
+        models = route.get('models') if isinstance(route, dict) else None
+        if not models:
+            problems.append(f"models.{name} needs a non-empty 'models' list")
+            continue
+        for model in models:
+            if isinstance(rate_limits, dict) and rate_limits and model not in rate_limits:
+                problems.append(f"models.{name}: {model} has no entry in 'rate_limits'")
+    return problems
+
+
+def plan(config):
+    """Units and subtopics a run would process, each marked done or pending from the journal"""
+    from course_index import CourseIndex
+    from progress_journal import ProgressJournal
+
+    units = config.get('units', [])
+    source = "config.json"
+    if not units:
+        index = CourseIndex.from_config(config)
+        units = index.units() if index else []
+        source = "course index" if units else "nothing (run 'discover' first)"
+    journal = ProgressJournal.from_config(config)
+
+    lines = [f"{config.get('course_name')}: {len(units)} units from {source}"]
+    pending = 0
+    for unit in units:
+        lines.append(f"  {unit['name']}")
+        for subtopic in unit.get('subtopics', []):
+            if journal and journal.subtopic_done(unit['name'], subtopic['name']):
+                status = "done"
+            else:
+                pending += 1
+                answered = journal.questions_done(unit['name'], subtopic['name'], subtopic['quiz']) if journal else 0
+                status = f"pending, {answered} questions answered" if answered else "pending"
+            lines.append(f"    {subtopic['name']} / {subtopic['quiz']}: {status}")
+    lines.append(f"{pending} subtopics left")
+    return "\n".join(lines)
+
+
+def check(config, command):
+    """Validate config and environment before a command that opens the browser; False on problems"""
+    problems = validate_config(config)
+    load_environment()
+    missing = [name for name in REQUIRED_ENV.get(command, ()) if not os.getenv(name)]
+    if missing:
+        problems.append(f"missing environment variables {', '.join(missing)} (set them in .env)")
+    for problem in problems:
+        print(f"error: {problem}", file=sys.stderr)
+    return not problems
+
+
+def cmd_validate_config(args):
+    started = time.perf_counter()
+    config = load_config(args.config)
+    problems = validate_config(config)
+    load_environment()
+    missing = [name for name in REQUIRED_ENV["run"] if not os.getenv(name)]
+    for problem in problems:
+        print(f"error: {problem}")
+    if missing:
+        print(f"warning: environment variables not set: {', '.join(missing)}")
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{args.config}: {'OK' if not problems else f'{len(problems)} problems'} ({elapsed:.0f} ms)")
+    return 1 if problems else 0
+
+
+def cmd_run(args):
+    config = load_config(args.config)
+    if args.command == "resume":
+        from progress_journal import ProgressJournal
+        journal = ProgressJournal.from_config(config)
+        if not journal or not journal.entries:
+            print(f"Nothing to resume for {config.get('course_name')}; use 'run' to start", file=sys.stderr)
+            return 1
+    if args.dry_run:
+        problems = validate_config(config)
+        for problem in problems:
+            print(f"error: {problem}")
+        print(plan(config))
+        return 1 if problems else 0
+    if not check(config, args.command):
+        return 1
+
+    if args.hold is not None:
+        config.setdefault('browser', {})['debug_hold_seconds'] = args.hold
+
+    from logging_setup import setup_logging
+    setup_logging(config)
+    if getattr(args, 'fresh', False):
+        from progress_journal import ProgressJournal
+        journal = ProgressJournal.from_config(config)
+        if journal:
+            journal.reset()
+
+    import main
+    return 0 if main.run(args.config, config) else 1
+
+
+def cmd_batch(args):
+    from batch import batch_courses
+    config = load_config(args.config)
+    courses = batch_courses(config)
+    if not courses:
+        print(f"No 'courses' listed in {args.config}", file=sys.stderr)
+        return 1
+    if args.dry_run:
+        problems = validate_config(config)
+        for problem in problems:
+            print(f"error: {problem}")
+        print("\n\n".join(plan(course) for course in courses))
+        return 1 if problems else 0
+    if not check(config, "batch"):
+        return 1
+    if args.hold is not None:
+        config.setdefault('browser', {})['debug_hold_seconds'] = args.hold
+
+    from logging_setup import setup_logging
+    setup_logging(config)
+
+    import main
+    return 0 if main.run_batch(args.config, config) else 1
+
+
+def cmd_discover(args):
+    config = load_config(args.config)
+    if not check(config, "discover"):
+        return 1
+    from logging_setup import setup_logging
+    setup_logging(config)
+
+    import main
+    units = main.discover(args.config)
+    if units is None:
+        return 1
+    print(plan(dict(config, units=units)))
+    return 0
+
+
+def cmd_bench(args):
+    import bench
+    bench.main(args.bench_args)
+    return 0
+
+
+def cmd_replay(args):
+    import cassette
+    return cassette.main([args.path, str(args.repeat)])
+
+
+def cmd_stats(args):
+    from strategy_stats import StrategyStats, stats_settings
+    path = args.path or stats_settings(load_config(args.config) if os.path.exists(args.config) else {})['path']
+    print(StrategyStats(path).report())
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Course quiz automation")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", default=DEFAULT_CONFIG, help="config file (default config.json)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser("validate-config", parents=[common], help="check config.json and .env without a browser")
+    validate.set_defaults(handler=cmd_validate_config)
+
+    run = commands.add_parser("run", parents=[common], help="log in and work through the course")
+    run.add_argument("--fresh", action="store_true", help="forget journaled progress for this course first")
+    run.add_argument("--dry-run", action="store_true", help="print what would be processed and exit")
+    run.add_argument("--hold", type=int, metavar="SECONDS", help="keep the browser open this long afterwards")
+    run.set_defaults(handler=cmd_run)
+
+    resume = commands.add_parser("resume", parents=[common], help="continue after the last journaled step")
+    resume.add_argument("--dry-run", action="store_true", help="print what is left and exit")
+    resume.add_argument("--hold", type=int, metavar="SECONDS", help="keep the browser open this long afterwards")
+    resume.set_defaults(handler=cmd_run)
+
+    batch = commands.add_parser("batch", parents=[common], help="work through every course in 'courses' with one login")
+    batch.add_argument("--dry-run", action="store_true", help="print what would be processed per course and exit")
+    batch.add_argument("--hold", type=int, metavar="SECONDS", help="keep the browser open this long afterwards")
+    batch.set_defaults(handler=cmd_batch)
+
+    discover = commands.add_parser("discover", parents=[common], help="rebuild the course index from the Contents page")
+    discover.set_defaults(handler=cmd_discover)
+
+    bench = commands.add_parser("bench", help="offline benchmark against the mock platform (see bench.py -h)")
+    bench.add_argument("bench_args", nargs=argparse.REMAINDER)
+    bench.set_defaults(handler=cmd_bench)
+
+    replay = commands.add_parser("replay", help="re-run answer parsing and planning on a recorded cassette, offline")
+    replay.add_argument("path", help="cassette file, e.g. quiz_cassette.jsonl.gz")
+    replay.add_argument("--repeat", type=int, default=1, help="replay the fixtures this many times for timing")
+    replay.set_defaults(handler=cmd_replay)
+
+    stats = commands.add_parser("stats", parents=[common], help="print the strategy stats report")
+    stats.add_argument("path", nargs="?", help="stats file (default from config.json)")
+    stats.set_defaults(handler=cmd_stats)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# Languages are probed in order; the first whose markers match the generated code is used
+DEFAULT_LANGUAGES = {
+    "java": {
+        "markers": [r"\bpublic\s+class\b", r"System\.out\."],
+        "file": "Main.java",
+        "compile": ["javac", "{file}"],
+        "run": ["java", "-Xmx{memory_mb}m", "-cp", "{dir}", "Main"],
+        # The JVM reserves far more address space than it uses, so only -Xmx bounds it
+        "memory_limit": False
+    },
+    "cpp": {
+        "markers": [r"#include\s*<(iostream|bits/stdc\+\+\.h|vector|string)>", r"\bstd::", r"\bcout\s*<<"],
+        "file": "main.cpp",
+        "compile": ["g++", "-O2", "-o", "{dir}/main", "{file}"],
+        "run": ["{dir}/main"]
+    },
+    "c": {
+        "markers": [r"#include\s*<stdio\.h>", r"\bprintf\s*\(", r"\bscanf\s*\("],
+        "file": "main.c",
+        "compile": ["gcc", "-O2", "-o", "{dir}/main", "{file}", "-lm"],
+        "run": ["{dir}/main"]
+    },
+    "python": {
+        "markers": [r"^\s*(def |import |from \w+ import )", r"\binput\(\)", r"\bprint\("],
+        "file": "main.py",
+        "compile": None,
+        "run": ["python3", "{file}"]
+    }
+}
+
+DEFAULT_VERIFY = {
+    # Off by default: the code comes from the LLM, which reads page text that anyone can write
+    "enabled": False,
+    # "bwrap" runs compilers and candidates under bubblewrap: no network, uid 65534, nothing writable
+    # but the work directory, and only sandbox_paths visible. "none" runs them as the current user with
+    # just rlimits, so a candidate can read your files and reach the network; only for throwaway machines
+    "sandbox": "bwrap",
+    "sandbox_paths": [
+        "/usr", "/bin", "/sbin", "/lib", "/lib32", "/lib64", "/etc/alternatives",
+        "/etc/ld.so.cache", "/etc/ld.so.conf", "/etc/ld.so.conf.d"
+    ],
+    "max_fixes": 2,
+    "timeout_seconds": 5,
+    "compile_timeout_seconds": 30,
+    "cpu_seconds": 5,
+    "memory_mb": 256,
+    "max_output_bytes": 65536,
+    "languages": DEFAULT_LANGUAGES
+}
+
+# Whether bubblewrap could create a sandbox here, probed once per process
+_sandbox_probe = {}
+
+# "Sample input 1:" / "Sample output 1:" label lines, each followed by its block
+INPUT_LABEL = r"^[ \t]*(?:sample[ \t]+)?input[ \t]*\d*[ \t]*:?[ \t]*$"
+OUTPUT_LABEL = r"^[ \t]*(?:sample[ \t]+|expected[ \t]+)?output[ \t]*\d*[ \t]*:?[ \t]*$"
+SAMPLE_PATTERN = re.compile(
+    INPUT_LABEL + r"\n(?P<input>.*?)\n\s*?" + OUTPUT_LABEL + r"\n(?P<output>.*?)"
+    r"(?=\n" + INPUT_LABEL[1:] + r"|\n[ \t]*(?:explanation|constraints)\b|\Z)",
+    re.I | re.S | re.M
+)
+
+CODE_FENCE = re.compile(r"^```[\w+#-]*\s*\n(.*?)\n```\s*$", re.S)
+
+
+def strip_code_fences(code):
+    """Drop a Markdown fence around the whole answer, which would otherwise be typed into the editor"""
+    match = CODE_FENCE.match(code.strip())
+    return match.group(1) if match else code
+
+
+def extract_samples(text):
+    """Sample (input, output) pairs found in the problem text"""
+    samples = []
+    for match in SAMPLE_PATTERN.finditer(text):
+        expected = match.group('output').strip()
+        if expected:
+            samples.append((match.group('input').strip("\n"), expected))
+    return samples
+
+
+def normalize_output(text):
+    return "\n".join(line.rstrip() for line in text.strip().splitlines())
+
+
+@dataclass
+class VerifyResult:
+    passed: bool = None  # None when nothing could be checked
+    language: str = None
+    samples: int = 0
+    failures: list = field(default_factory=list)
+
+    def describe(self):
+        """Failure details in the form the fix prompt expects"""
+        lines = []
+        for failure in self.failures:
+            lines.append(f"Input:\n{failure['input']}\nExpected output:\n{failure['expected']}")
+            if failure.get('error'):
+                lines.append(f"Error:\n{failure['error']}")
+            else:
+                lines.append(f"Actual output:\n{failure['actual']}")
+        return "\n\n".join(lines)
+
+
+class CodeVerifier:
+    """Run generated code against the problem's sample I/O in a sandboxed, resource-limited subprocess"""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.languages = settings['languages']
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the verifier from the 'verify_code' config section, or return None if disabled"""
+        settings = dict(DEFAULT_VERIFY)
+        settings.update(config.get('verify_code', {}))
+        if not settings['enabled']:
+            return None
+        return cls(settings)
+
+    def detect_language(self, code):
+        for name, language in self.languages.items():
+            if any(re.search(marker, code, re.M) for marker in language.get('markers', [])):
+                return name
+        return None
+
+    def _sandboxed(self, command, workdir):
+        """command wrapped in bubblewrap, unless the sandbox is switched off"""
+        if self.settings['sandbox'] == "none":
+            return command
+        wrapped = [
+            "bwrap", "--unshare-all", "--die-with-parent", "--uid", "65534", "--gid", "65534",
+            "--proc", "/proc", "--dev", "/dev", "--tmpfs", "/tmp"
+        ]
+        for path in self.settings['sandbox_paths']:
+            wrapped += ["--ro-bind-try", path, path]
+        return wrapped + ["--bind", workdir, workdir, "--chdir", workdir, "--"] + command
+
+    def _limited(self, command, memory_limit):
+        """command run through sh with CPU, address-space and file-size ulimits.
+
+        Setting them in the shell instead of a preexec_fn keeps the spawn safe from worker threads.
+        """
+        if os.name != "posix":
+            return command
+        limits = f"ulimit -t {self.settings['cpu_seconds']}; ulimit -f 2048; "
+        if memory_limit:
+            limits += f"ulimit -v {self.settings['memory_mb'] * 1024}; "
+        return ["sh", "-c", limits + 'exec "$@"', "sh"] + command
+
+    def sandbox_ready(self):
+        """True if candidates can run under the configured sandbox"""
+        mode = self.settings['sandbox']
+        if mode == "none":
+            logger.warning("verify_code.sandbox is 'none': generated code runs unsandboxed as the current user")
+            return True
+        if mode != "bwrap":
+            logger.warning(f"Unknown verify_code.sandbox {mode!r}, skipping local verification")
+            return False
+        if not shutil.which("bwrap"):
+            logger.warning("Skipping local verification: bubblewrap (bwrap) is not installed")
+            return False
+        if "bwrap" not in _sandbox_probe:
+            # Unprivileged user namespaces can be disabled, in which case bwrap cannot start at all
+            workdir = tempfile.mkdtemp(prefix="verify_")
+            try:
+                probe = subprocess.run(self._sandboxed(["true"], workdir), capture_output=True, text=True, timeout=10)
+                _sandbox_probe["bwrap"] = probe.returncode == 0
+                if probe.returncode != 0:
+                    logger.warning(f"Skipping local verification: bwrap cannot create a sandbox ({probe.stderr.strip()})")
+            except (OSError, subprocess.TimeoutExpired) as e:
+                logger.warning(f"Skipping local verification: bwrap failed ({e})")
+                _sandbox_probe["bwrap"] = False
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+        return _sandbox_probe["bwrap"]
+
+    def _spawn(self, command, workdir, timeout, stdin=None):
+        return subprocess.run(
+            command,
+            input=stdin,
+            capture_output=True,
+            text=True,
+            cwd=workdir,
+            timeout=timeout,
+            env={"PATH": os.environ.get("PATH", ""), "HOME": workdir, "LANG": "C.UTF-8"},
+            start_new_session=True
+        )
+
+    def _run(self, command, workdir, stdin, memory_limit=True):
+        """Run the candidate sandboxed, with a wall-clock timeout and ulimits, in an empty environment"""
+        command = self._sandboxed(self._limited(command, memory_limit), workdir)
+        return self._spawn(command, workdir, self.settings['timeout_seconds'], stdin)
+
+    def _compile(self, command, workdir):
+        # Compilers get more memory/time than the candidate, but the source is just as untrusted
+        return self._spawn(self._sandboxed(command, workdir), workdir, self.settings['compile_timeout_seconds'])
+
+    def verify(self, code, problem_text):
+        """Compile once, run every sample and report what failed"""
+        samples = extract_samples(problem_text)
+        language_name = self.detect_language(code)
+        result = VerifyResult(language=language_name, samples=len(samples))
+        if not samples or not language_name:
+            logger.info(f"Skipping local verification ({len(samples)} samples, language {language_name})")
+            return result
+        language = self.languages[language_name]
+        binary = (language.get('compile') or language['run'])[0]
+        if not shutil.which(binary):
+            logger.info(f"Skipping local verification: {binary} is not installed")
+            return result
+        if not self.sandbox_ready():
+            return result
+
+        workdir = tempfile.mkdtemp(prefix="verify_")
+        try:
+            path = os.path.join(workdir, language['file'])
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(code)
+
+            def expand(command):
+                return [part.format(file=path, dir=workdir, memory_mb=self.settings['memory_mb']) for part in command]
+
+            if language.get('compile'):
+                try:
+                    compiled = self._compile(expand(language['compile']), workdir)
+                except subprocess.TimeoutExpired:
+                    logger.warning(f"Compiling the {language_name} candidate timed out, skipping verification")
+                    return result
+                if compiled.returncode != 0:
+                    error = compiled.stderr.strip()[-2000:] or "compilation failed"
+                    result.failures = [{"input": sample, "expected": expected, "error": error} for sample, expected in samples[:1]]
+                    result.passed = False
+                    return result
+
+            for stdin, expected in samples:
+                failure = {"input": stdin, "expected": expected}
+                try:
+                    completed = self._run(expand(language['run']), workdir, stdin + "\n", language.get('memory_limit', True))
+                except subprocess.TimeoutExpired:
+                    failure["error"] = f"Timed out after {self.settings['timeout_seconds']}s"
+                    result.failures.append(failure)
+                    continue
+                actual = completed.stdout[:self.settings['max_output_bytes']]
+                if completed.returncode != 0:
+                    failure["error"] = (completed.stderr.strip()[-2000:] or f"exit status {completed.returncode}")
+                    result.failures.append(failure)
+                elif normalize_output(actual) != normalize_output(expected):
+                    failure["actual"] = actual.strip()
+                    result.failures.append(failure)
+            result.passed = not result.failures
+            return result
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import logging
+import os
+import time
+
+from button_resolver import COLLECT_CLICKABLES_JS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX = {
+    "enabled": True,
+    "path": "course_index.json",
+    # Crawl Contents during a run when there is no index or the page no longer matches it;
+    # otherwise the index is only built by `python cli.py discover`
+    "auto_discover": False,
+    # CSS selector matching only the unit/subtopic/quiz entries, never header, profile or Reset buttons.
+    # Discovery clicks every match and the fingerprint hashes them, so nothing works until it is set
+    "item_selector": "",
+    "ignore_texts": []
+}
+
+
+def index_settings(config):
+    settings = dict(DEFAULT_INDEX)
+    settings.update(config.get('course_index', {}))
+    return settings
+
+
+def item_texts(evaluated, ignore=()):
+    """Visible clickable texts in document order, without duplicates or ignored labels"""
+    ignore = {text.lower() for text in ignore}
+    texts = []
+    for candidate in evaluated:
+        text = candidate['text'].split("\n")[0].strip()
+        if candidate['visible'] and text and text.lower() not in ignore and text not in texts:
+            texts.append(text)
+    return texts
+
+
+def fingerprint(texts):
+    """Stable hash of the Contents page items; changes whenever a unit is added, removed or renamed"""
+    return hashlib.sha256("\n".join(texts).encode('utf-8')).hexdigest()[:16]
+
+
+class CourseIndex:
+    """Persisted map of units, subtopics and quizzes to the URLs that open them directly"""
+
+    def __init__(self, path, course, item_selector="", ignore_texts=()):
+        self.path = path
+        self.course = course
+        self.item_selector = item_selector
+        self.ignore_texts = list(ignore_texts)
+        self.data = self.load()
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the index from the 'course_index' config section, or return None if disabled"""
+        settings = index_settings(config)
+        if not settings['enabled']:
+            return None
+        # The Contents/back links show up on every page but are never course items
+        ignore = list(settings['ignore_texts'])
+        for key in ('contents_navigation', 'back_to_contents'):
+            if config.get(key, {}).get('name'):
+                ignore.append(config[key]['name'])
+        return cls(settings['path'], config['course_name'], settings['item_selector'], ignore)
+
+    def _read_all(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable course index {self.path}: {e}")
+            return {}
+
+    def load(self):
+        data = self._read_all().get(self.course)
+        if data:
+            logger.info(f"Loaded course index for {self.course} ({len(data['units'])} units) from {self.path}")
+        return data
+
+    def _write(self, data):
+        """Store this course's index (or drop it when data is None), keeping entries for other courses"""
+        everything = self._read_all()
+        if data is None:
+            everything.pop(self.course, None)
+        else:
+            everything[self.course] = data
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(everything, file, indent=2)
+        os.replace(tmp_path, self.path)
+        self.data = data
+
+    def save(self, data):
+        self._write(data)
+        logger.info(f"Saved course index for {self.course} to {self.path}")
+
+    def invalidate(self, reason):
+        """Forget the index so this run clicks through Contents and the next one rediscovers"""
+        if self.data:
+            logger.warning(f"Course index for {self.course} invalidated: {reason}")
+            self._write(None)
+
+    def items(self, frame):
+        """Course items matching item_selector in the frame, in one round-trip"""
+        return item_texts(frame.evaluate(COLLECT_CLICKABLES_JS, self.item_selector), self.ignore_texts)
+
+    async def items_async(self, frame):
+        return item_texts(await frame.evaluate(COLLECT_CLICKABLES_JS, self.item_selector), self.ignore_texts)
+
+    def matches(self, texts):
+        return bool(self.data) and self.data['fingerprint'] == fingerprint(texts)
+
+    def build(self, texts, units):
+        return {
+            "fingerprint": fingerprint(texts),
+            "discovered_at": time.time(),
+            "units": units
+        }
+
+    def units(self):
+        """The index in the config.json 'units' shape; subtopics with several quizzes use the first"""
+        units = []
+        for unit in (self.data or {}).get('units', []):
+            subtopics = []
+            for subtopic in unit['subtopics']:
+                if not subtopic['quizzes']:
+                    continue
+                if len(subtopic['quizzes']) > 1:
+                    logger.info(f"{subtopic['name']} has {len(subtopic['quizzes'])} quizzes, using the first")
+                subtopics.append({"name": subtopic['name'], "quiz": subtopic['quizzes'][0]['name']})
+            if subtopics:
+                units.append({"name": unit['name'], "subtopics": subtopics})
+        return units
+
+    def quiz_url(self, unit_name, subtopic_name, quiz_name):
+        """URL that opens the quiz directly, or None if it is not indexed"""
+        for unit in (self.data or {}).get('units', []):
+            if unit['name'] != unit_name:
+                continue
+            for subtopic in unit['subtopics']:
+                if subtopic['name'] != subtopic_name:
+                    continue
+                for quiz in subtopic['quizzes']:
+                    if quiz['name'] == quiz_name:
+                        return quiz.get('url')
+        return None
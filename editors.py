@@ -0,0 +1,180 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Elements treated as a code editor (plain textarea, CodeMirror, ACE or contenteditable)
+EDITOR_SELECTOR = "textarea, .CodeMirror, .ace_editor, [contenteditable='true']"
+
+
+def normalize_code(code):
+    """Normalize line endings and trailing whitespace so read-back comparisons are stable"""
+    lines = code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+class EditorAdapter:
+    """Set and read back the full buffer of one kind of code editor"""
+
+    kind = None
+    selector = None
+    set_js = None
+    get_js = None
+
+    def find(self, frame):
+        """Return the first visible editor of this kind, or None"""
+        locator = frame.locator(self.selector)
+        for index in range(locator.count()):
+            element = locator.nth(index)
+            if element.is_visible():
+                return element
+        return None
+
+    # set_value/get_value return whatever the locator returns, so they work
+    # with both sync locators and async ones (where the result is awaited)
+    def set_value(self, element, code):
+        return element.evaluate(self.set_js, code)
+
+    def get_value(self, element):
+        return element.evaluate(self.get_js)
+
+    def insert(self, element, code):
+        """Replace the editor buffer with code and verify it by reading it back"""
+        self.set_value(element, code)
+        return normalize_code(self.get_value(element) or "") == normalize_code(code)
+
+
+class CodeMirrorAdapter(EditorAdapter):
+    kind = "codemirror"
+    selector = ".CodeMirror"
+    set_js = "(el, code) => { el.CodeMirror.setValue(code); el.CodeMirror.refresh(); }"
+    get_js = "(el) => el.CodeMirror.getValue()"
+
+
+class AceAdapter(EditorAdapter):
+    kind = "ace"
+    selector = ".ace_editor"
+    set_js = """(el, code) => {
+        const editor = el.env && el.env.editor ? el.env.editor : window.ace.edit(el);
+        editor.setValue(code, 1);
+    }"""
+    get_js = """(el) => {
+        const editor = el.env && el.env.editor ? el.env.editor : window.ace.edit(el);
+        return editor.getValue();
+    }"""
+
+
+class ContentEditableAdapter(EditorAdapter):
+    kind = "contenteditable"
+    selector = "[contenteditable='true']"
+    # Paste the whole buffer in one event so editor frameworks see a normal user edit;
+    # fall back to insertText for plain contenteditable elements that ignore paste events.
+    set_js = """(el, code) => {
+        el.focus();
+        const selection = window.getSelection();
+        const range = document.createRange();
+        range.selectNodeContents(el);
+        selection.removeAllRanges();
+        selection.addRange(range);
+        const data = new DataTransfer();
+        data.setData('text/plain', code);
+        const event = new ClipboardEvent('paste', {clipboardData: data, bubbles: true, cancelable: true});
+        const handled = !el.dispatchEvent(event);
+        if (!handled) {
+            document.execCommand('insertText', false, code);
+        }
+    }"""
+    get_js = "(el) => el.innerText"
+
+
+class TextareaAdapter(EditorAdapter):
+    kind = "textarea"
+    selector = "textarea"
+
+    def set_value(self, element, code):
+        return element.fill(code)
+
+    def get_value(self, element):
+        return element.input_value()
+
+
+# Rich editors are probed first because CodeMirror and ACE keep a hidden textarea of their own
+EDITOR_ADAPTERS = {
+    adapter.kind: adapter
+    for adapter in (CodeMirrorAdapter(), AceAdapter(), ContentEditableAdapter(), TextareaAdapter())
+}
+
+
+def insert_code(page, frame, code, kind=None, type_delay=10):
+    """Insert code through the matching editor adapter, typing it only as a last resort.
+
+    Returns the name of the method that produced a verified buffer, or None.
+    """
+    adapters = list(EDITOR_ADAPTERS.values())
+    if kind in EDITOR_ADAPTERS:
+        adapters.remove(EDITOR_ADAPTERS[kind])
+        adapters.insert(0, EDITOR_ADAPTERS[kind])
+
+    element = None
+    for adapter in adapters:
+        try:
+            element = adapter.find(frame)
+            if element is None:
+                continue
+            if adapter.insert(element, code):
+                logger.info(f"Inserted {len(code)} characters via {adapter.kind} adapter")
+                return adapter.kind
+            logger.warning(f"{adapter.kind} adapter read back a different buffer")
+        except Exception as e:
+            logger.warning(f"{adapter.kind} adapter failed: {e}")
+        break
+
+    logger.warning(f"Falling back to keystroke typing ({len(code)} characters)")
+    try:
+        if element is not None:
+            element.click()
+        page.keyboard.press("Control+a")
+        page.keyboard.press("Delete")
+        page.keyboard.type(code, delay=type_delay)
+        return "keyboard"
+    except Exception as e:
+        logger.error(f"Keystroke fallback failed: {e}")
+        return None
+
+
+async def insert_code_async(page, frame, code, kind=None, type_delay=10):
+    """Async counterpart of insert_code for playwright.async_api pages"""
+    adapters = list(EDITOR_ADAPTERS.values())
+    if kind in EDITOR_ADAPTERS:
+        adapters.remove(EDITOR_ADAPTERS[kind])
+        adapters.insert(0, EDITOR_ADAPTERS[kind])
+
+    element = None
+    for adapter in adapters:
+        try:
+            locator = frame.locator(adapter.selector)
+            for index in range(await locator.count()):
+                if await locator.nth(index).is_visible():
+                    element = locator.nth(index)
+                    break
+            if element is None:
+                continue
+            await adapter.set_value(element, code)
+            if normalize_code(await adapter.get_value(element) or "") == normalize_code(code):
+                logger.info(f"Inserted {len(code)} characters via {adapter.kind} adapter")
+                return adapter.kind
+            logger.warning(f"{adapter.kind} adapter read back a different buffer")
+        except Exception as e:
+            logger.warning(f"{adapter.kind} adapter failed: {e}")
+        break
+
+    logger.warning(f"Falling back to keystroke typing ({len(code)} characters)")
+    try:
+        if element is not None:
+            await element.click()
+        await page.keyboard.press("Control+a")
+        await page.keyboard.press("Delete")
+        await page.keyboard.type(code, delay=type_delay)
+        return "keyboard"
+    except Exception as e:
+        logger.error(f"Keystroke fallback failed: {e}")
+        return None
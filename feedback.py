@@ -0,0 +1,202 @@
+import logging
+import re
+import time
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEEDBACK = {
+    # Multiple-choice/text questions often show no verdict at all, so they wait less than code (waits.feedback_timeout)
+    "quiz_timeout": 1500,
+    # After this many multiple-choice/text questions in a row without a verdict, stop waiting for one
+    "quiz_silent_after": 3,
+    "poll_interval": 100,
+    # Resubmit a coding answer with the platform's failure message this many times
+    "max_resubmits": 1,
+    "pending_patterns": [r"\brunning\b", r"\bevaluating\b", r"\bcompiling\b", r"\bprocessing\b", r"please wait"],
+    "cases_patterns": [
+        r"test\s*cases?\s*passed\s*:?\s*(\d+)\s*(?:/|out of|of)\s*(\d+)",
+        r"(\d+)\s*(?:/|out of|of)\s*(\d+)\s*test\s*cases?\s*passed"
+    ],
+    "error_patterns": [r"\berror\b", r"\bexception\b", r"traceback", r"time limit exceeded", r"segmentation fault"],
+    "failed_patterns": [r"\bincorrect\b", r"\bwrong\b", r"\bfailed\b", r"\bnot correct\b"],
+    "passed_patterns": [r"\bcorrect\b", r"\bpassed\b", r"\bsuccess", r"\bwell done\b", r"\baccepted\b"]
+}
+
+# Resolves once the feedback elements have been re-rendered since the snapshot and show text that
+# is not a pending message. A MutationObserver counts every insertion or text change inside them, so
+# a resubmit that gets the same verdict again still counts as new; the version key also carries a
+# per-document id, so a frame that reloaded never matches an old snapshot. Returns the text, the
+# class names for classification and the version key.
+FEEDBACK_JS = """
+(args) => {
+    if (!window.__quizFeedback) {
+        const state = {id: Math.random().toString(36).slice(2), version: 0};
+        const inFeedback = node => {
+            const el = node && (node.nodeType === 1 ? node : node.parentElement);
+            try { return Boolean(el && (el.closest(args.selector) || el.querySelector(args.selector))); } catch (e) { return false; }
+        };
+        new MutationObserver(records => {
+            if (records.some(r => inFeedback(r.target) || Array.from(r.addedNodes).some(inFeedback))) state.version++;
+        }).observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+        window.__quizFeedback = state;
+    }
+    const state = window.__quizFeedback;
+    const key = state.id + ':' + state.version;
+    const visible = el => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    const els = Array.from(document.querySelectorAll(args.selector)).filter(visible);
+    const text = els.map(el => (el.innerText || el.textContent || '').trim()).filter(Boolean).join('\\n');
+    if (args.wait) {
+        if (!text || key === args.baseline) return null;
+        if (args.pending.some(pattern => new RegExp(pattern, 'i').test(text))) return null;
+    }
+    return {text: text, classes: els.map(el => String(el.className || '')).join(' '), version: key};
+}
+"""
+
+
+@dataclass
+class FeedbackResult:
+    """The platform's verdict on one submission"""
+    status: str  # passed, failed, error, unknown (text shown but not recognised) or none (nothing shown)
+    message: str = ""
+    passed_cases: int = None
+    total_cases: int = None
+    seconds: float = 0.0
+
+    @property
+    def passed(self):
+        return self.status == "passed"
+
+    @property
+    def failed(self):
+        return self.status in ("failed", "error")
+
+
+class FeedbackDetector:
+    """Wait for the platform's result indicator after a submit and parse it into a FeedbackResult"""
+
+    def __init__(self, settings, selectors, code_timeout):
+        self.settings = settings
+        self.selector = ", ".join(selectors)
+        self.code_timeout = code_timeout
+        self.silent_quizzes = 0
+
+    @classmethod
+    def from_config(cls, config, waits):
+        settings = dict(DEFAULT_FEEDBACK)
+        settings.update(config.get('feedback', {}))
+        return cls(settings, waits['feedback_selectors'], waits['feedback_timeout'])
+
+    def timeout(self, question_type):
+        if question_type == "coding":
+            return self.code_timeout
+        if self.settings['quiz_silent_after'] and self.silent_quizzes >= self.settings['quiz_silent_after']:
+            return 0
+        return self.settings['quiz_timeout']
+
+    def _note(self, question_type, result):
+        """Track whether this course shows verdicts for multiple-choice/text questions at all"""
+        if question_type == "coding":
+            return result
+        if result.status != "none":
+            self.silent_quizzes = 0
+            return result
+        self.silent_quizzes += 1
+        if self.silent_quizzes == self.settings['quiz_silent_after']:
+            logger.info(f"No verdict after {self.silent_quizzes} quiz questions in a row, no longer waiting for one")
+        return result
+
+    def _args(self, baseline=None, wait=False):
+        return {"selector": self.selector, "baseline": baseline, "wait": wait, "pending": self.settings['pending_patterns']}
+
+    def _matches(self, kind, text):
+        return any(re.search(pattern, text, re.I) for pattern in self.settings[f"{kind}_patterns"])
+
+    def parse(self, text, classes="", seconds=0.0):
+        """Classify feedback text; test-case counts win, then errors, failures and passes"""
+        message = text.strip()[:500]
+        for pattern in self.settings['cases_patterns']:
+            match = re.search(pattern, text, re.I)
+            if match:
+                passed, total = int(match.group(1)), int(match.group(2))
+                status = "passed" if total and passed == total else "failed"
+                return FeedbackResult(status, message, passed, total, seconds)
+        # "incorrect" contains "correct", so failures are checked before passes
+        for status, kind in (("error", "error"), ("failed", "failed"), ("passed", "passed")):
+            if self._matches(kind, text):
+                return FeedbackResult(status, message, seconds=seconds)
+        # Fall back to the indicator's class names, e.g. class="feedback failed"
+        for status, kind in (("failed", "failed"), ("passed", "passed")):
+            if self._matches(kind, classes):
+                return FeedbackResult(status, message, seconds=seconds)
+        return FeedbackResult("unknown" if message else "none", message, seconds=seconds)
+
+    def snapshot(self, frame):
+        """Version key of the feedback already on the page, so a stale verdict is not mistaken for the new one"""
+        return frame.evaluate(FEEDBACK_JS, self._args())['version']
+
+    def wait(self, frame, baseline, question_type):
+        """Return as soon as a new verdict is displayed, or a 'none' result on timeout"""
+        started = time.perf_counter()
+        timeout = self.timeout(question_type)
+        if not timeout:
+            return FeedbackResult("none")
+        try:
+            handle = frame.wait_for_function(
+                FEEDBACK_JS, arg=self._args(baseline, True),
+                timeout=timeout, polling=self.settings['poll_interval']
+            )
+            value = handle.json_value()
+        except Exception:
+            return self._note(question_type, FeedbackResult("none", seconds=time.perf_counter() - started))
+        return self._note(question_type, self.log(self.parse(value['text'], value['classes'], time.perf_counter() - started)))
+
+    async def snapshot_async(self, frame):
+        return (await frame.evaluate(FEEDBACK_JS, self._args()))['version']
+
+    async def wait_async(self, frame, baseline, question_type):
+        """Async counterpart of wait for playwright.async_api frames"""
+        started = time.perf_counter()
+        timeout = self.timeout(question_type)
+        if not timeout:
+            return FeedbackResult("none")
+        try:
+            handle = await frame.wait_for_function(
+                FEEDBACK_JS, arg=self._args(baseline, True),
+                timeout=timeout, polling=self.settings['poll_interval']
+            )
+            value = await handle.json_value()
+        except Exception:
+            return self._note(question_type, FeedbackResult("none", seconds=time.perf_counter() - started))
+        return self._note(question_type, self.log(self.parse(value['text'], value['classes'], time.perf_counter() - started)))
+
+    @staticmethod
+    def log(result):
+        cases = f" ({result.passed_cases}/{result.total_cases} test cases)" if result.total_cases is not None else ""
+        logger.info(f"Feedback after {result.seconds:.2f}s: {result.status}{cases} - {result.message[:120]}")
+        return result
+
+
+def summarize(results):
+    """Log verdict counts per question type from a list of per-question result dicts"""
+    if not results:
+        return
+    lines = []
+    for question_type in sorted({r['type'] for r in results}):
+        subset = [r for r in results if r['type'] == question_type]
+        counts = {}
+        for r in subset:
+            counts[r['status']] = counts.get(r['status'], 0) + 1
+        breakdown = ", ".join(f"{status}={count}" for status, count in sorted(counts.items()))
+        cases = [r for r in subset if r.get('total_cases')]
+        if cases:
+            breakdown += (
+                f"; test cases {sum(r['passed_cases'] for r in cases)}/{sum(r['total_cases'] for r in cases)}"
+            )
+        lines.append(f"{question_type}: {len(subset)} questions ({breakdown})")
+    passed = sum(1 for r in results if r['status'] == "passed")
+    logger.info(f"Submission results: {passed}/{len(results)} passed\n" + "\n".join(lines))
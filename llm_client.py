@@ -0,0 +1,200 @@
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LLM = {
+    "timeout": 30,
+    "connect_timeout": 5,
+    "max_retries": 3,
+    "backoff_base": 0.5,
+    "backoff_max": 8,
+    "max_connections": 10,
+    "stream": True
+}
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError", "ConnectError", "ReadTimeout", "TimeoutError"}
+
+# One complete line that is nothing but an option list, e.g. "1, 3" or "The correct options are: 2 and 4"
+OPTION_LIST_LINE = re.compile(r'^\s*(?:.*correct options? (?:are|is):?)?\s*\d+(?:\s*(?:,|and|&)\s*\d+)*\s*\.?\s*$', re.I)
+
+
+def option_list_complete(text):
+    """True once the stream contains a finished line holding the option numbers"""
+    complete_lines = text.split("\n")[:-1]
+    return any(OPTION_LIST_LINE.match(line) for line in complete_lines if line.strip())
+
+
+@dataclass
+class LLMResult:
+    text: str
+    model: str
+    latency: float
+    first_token_latency: float
+    prompt_tokens: int
+    completion_tokens: int
+    attempts: int
+    stopped_early: bool = False
+
+
+class LLMError(Exception):
+    """Raised when a completion could not be obtained within the retry policy"""
+
+
+def is_retryable(error):
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return type(error).__name__ in RETRYABLE_ERRORS
+
+
+def retry_after(error):
+    """Seconds the provider asked us to wait, if it said so"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMClient:
+    """Groq chat completions over one pooled connection, with deadlines, retries and streaming"""
+
+    def __init__(self, settings, client=None):
+        self.settings = settings
+        self.client = client or self._build_client(settings)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.total_latency = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    @classmethod
+    def from_config(cls, config, client=None):
+        settings = dict(DEFAULT_LLM)
+        settings.update(config.get('llm', {}))
+        return cls(settings, client)
+
+    @staticmethod
+    def _build_client(settings):
+        import os
+
+        import httpx
+        from groq import Groq
+
+        http_client = httpx.Client(
+            timeout=httpx.Timeout(settings['timeout'], connect=settings['connect_timeout']),
+            limits=httpx.Limits(
+                max_connections=settings['max_connections'],
+                max_keepalive_connections=settings['max_connections']
+            )
+        )
+        # Retries are handled here so they share the per-request deadline
+        return Groq(api_key=os.getenv("GROQ_API_KEY"), http_client=http_client, max_retries=0)
+
+    def complete(self, prompt, model, temperature, stop_when=None, deadline=None):
+        """Return an LLMResult, retrying transient failures with jittered exponential backoff.
+
+        deadline is an absolute time.monotonic() value; each attempt gets at most
+        the time remaining before it, including a stream that keeps sending chunks. stop_when, if given, is called with the
+        text streamed so far and ends the stream early once it returns True.
+        """
+        deadline = deadline or time.monotonic() + self.settings['timeout'] * (self.settings['max_retries'] + 1)
+        last_error = None
+        for attempt in range(1, self.settings['max_retries'] + 2):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                result = self._request(prompt, model, temperature, stop_when, min(remaining, self.settings['timeout']))
+                result.attempts = attempt
+                self._record(result)
+                return result
+            except Exception as e:
+                last_error = e
+                if not is_retryable(e) or attempt > self.settings['max_retries']:
+                    break
+                delay = retry_after(e)
+                if delay is None:
+                    delay = min(self.settings['backoff_max'], self.settings['backoff_base'] * 2 ** (attempt - 1))
+                    delay = random.uniform(0, delay)
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+                logger.warning(f"LLM attempt {attempt} failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+        raise LLMError(f"LLM request to {model} failed: {last_error or 'deadline exceeded'}") from last_error
+
+    def _request(self, prompt, model, temperature, stop_when, timeout):
+        started = time.perf_counter()
+        # The httpx timeout only bounds each read, so the stream loop enforces the overall limit
+        cutoff = time.monotonic() + timeout
+        messages = [{"role": "user", "content": prompt}]
+        if not self.settings['stream']:
+            response = self.client.chat.completions.create(
+                model=model, messages=messages, temperature=temperature, timeout=timeout
+            )
+            latency = time.perf_counter() - started
+            text = response.choices[0].message.content or ""
+            usage = getattr(response, "usage", None)
+            return self._result(text, model, latency, latency, usage, prompt, False)
+
+        stream = self.client.chat.completions.create(
+            model=model, messages=messages, temperature=temperature, timeout=timeout, stream=True
+        )
+        parts = []
+        first_token = None
+        usage = None
+        stopped_early = False
+        try:
+            for chunk in stream:
+                if time.monotonic() > cutoff:
+                    raise TimeoutError(f"{model} was still streaming after {timeout:.1f}s")
+                if chunk.choices and chunk.choices[0].delta.content:
+                    if first_token is None:
+                        first_token = time.perf_counter() - started
+                    parts.append(chunk.choices[0].delta.content)
+                    if stop_when and stop_when("".join(parts)):
+                        stopped_early = True
+                        break
+                x_groq = getattr(chunk, "x_groq", None)
+                usage = getattr(chunk, "usage", None) or getattr(x_groq, "usage", None) or usage
+        finally:
+            if hasattr(stream, "close"):
+                stream.close()
+        latency = time.perf_counter() - started
+        text = "".join(parts)
+        if stopped_early:
+            # Drop the partial line that arrived after the option list
+            text = text.rsplit("\n", 1)[0]
+        return self._result(text, model, latency, first_token or latency, usage, prompt, stopped_early)
+
+    @staticmethod
+    def _result(text, model, latency, first_token, usage, prompt, stopped_early):
+        # Streams cut short carry no usage block, so fall back to a ~4 chars/token estimate
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or len(prompt) // 4
+        completion_tokens = getattr(usage, "completion_tokens", None) or max(1, len(text) // 4)
+        return LLMResult(text.strip(), model, latency, first_token, prompt_tokens, completion_tokens, 1, stopped_early)
+
+    def _record(self, result):
+        with self.lock:
+            self.calls += 1
+            self.total_latency += result.latency
+            self.prompt_tokens += result.prompt_tokens
+            self.completion_tokens += result.completion_tokens
+        logger.info(
+            f"LLM {result.model}: {result.latency:.2f}s (first token {result.first_token_latency:.2f}s), "
+            f"{result.prompt_tokens} prompt + {result.completion_tokens} completion tokens, "
+            f"attempt {result.attempts}{', stopped early' if result.stopped_early else ''}"
+        )
+
+    def summary(self):
+        if self.calls:
+            logger.info(
+                f"LLM totals: {self.calls} calls, {self.total_latency:.1f}s, "
+                f"{self.prompt_tokens} prompt + {self.completion_tokens} completion tokens"
+            )
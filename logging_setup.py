@@ -0,0 +1,200 @@
+import atexit
+import gzip
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+DEFAULT_LOGGING = {
+    "level": "INFO",
+    "path": "quiz_automation.jsonl",
+    "max_bytes": 10 * 1024 * 1024,
+    "backup_count": 5,
+    "console": True,
+    "payload_dir": "log_payloads",
+    # Shorter payloads are logged inline
+    "payload_min_chars": 200
+}
+
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Attributes every LogRecord has; anything else was passed via extra= and goes into the JSON line
+STANDARD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+_store = None
+
+
+def logging_settings(config=None):
+    settings = dict(DEFAULT_LOGGING)
+    settings.update((config or {}).get('logging', {}))
+    return settings
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, any extra fields and the traceback"""
+
+    def format(self, record):
+        entry = {
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in STANDARD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class PayloadStore:
+    """Gzip-compressed, content-addressed files for prompts, responses and code referenced from the log.
+
+    put() only hashes and enqueues; a background thread does the compression and disk writes.
+    """
+
+    def __init__(self, directory, min_chars=200):
+        self.directory = directory
+        self.min_chars = min_chars
+        self.known = set()
+        self.pending = queue.SimpleQueue()
+        self.writer = None
+        # put() is called from asyncio.to_thread workers as well as the main thread
+        self.lock = threading.Lock()
+
+    def path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest + ".gz")
+
+    def put(self, text):
+        """Queue text for storage (once per content) and return its sha256 digest"""
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        with self.lock:
+            if digest in self.known:
+                return digest
+            self.known.add(digest)
+            if self.writer is None:
+                self.writer = threading.Thread(target=self._drain, name="payload-writer", daemon=True)
+                self.writer.start()
+            self.pending.put((digest, data))
+        return digest
+
+    def _drain(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            digest, data = item
+            path = self.path(digest)
+            if os.path.exists(path):
+                continue
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with gzip.open(tmp_path, 'wb') as file:
+                    file.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logging.getLogger(__name__).warning(f"Could not store payload {digest[:16]}: {e}")
+
+    def close(self):
+        """Wait for queued payloads to reach the disk"""
+        with self.lock:
+            writer, self.writer = self.writer, None
+            if writer is not None:
+                self.pending.put(None)
+        if writer is not None:
+            writer.join()
+
+    def get(self, digest):
+        with gzip.open(self.path(digest), 'rb') as file:
+            return file.read().decode('utf-8')
+
+
+def payload(text, kind="text"):
+    """Reference for a large payload to put in a log line; short payloads are returned inline"""
+    text = text or ""
+    if _store is None or len(text) < _store.min_chars:
+        return text
+    return f"<{kind} {len(text)} chars: payload {_store.put(text)[:16]}>"
+
+
+def read_payload(prefix, directory=DEFAULT_LOGGING['payload_dir']):
+    """Look a payload up by the (possibly shortened) digest shown in the log"""
+    store = PayloadStore(directory)
+    folder = os.path.join(directory, prefix[:2])
+    for name in sorted(os.listdir(folder)) if os.path.isdir(folder) else []:
+        if name.startswith(prefix):
+            return store.get(name[:-len(".gz")])
+    raise KeyError(prefix)
+
+
+def setup_logging(config=None):
+    """Route all logging through a queue drained by a background thread.
+
+    The hot loop only enqueues records; the listener thread writes JSON lines to a
+    size-rotated file and human-readable lines to the console. Calling it again
+    (e.g. once the config is loaded) replaces the previous pipeline.
+    """
+    global _listener, _store
+    settings = logging_settings(config)
+    stop_logging()
+
+    handlers = []
+    file_handler = logging.handlers.RotatingFileHandler(
+        settings['path'], maxBytes=settings['max_bytes'], backupCount=settings['backup_count'], encoding='utf-8'
+    )
+    file_handler.setFormatter(JsonFormatter())
+    handlers.append(file_handler)
+    if settings['console']:
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(console)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(settings['level'])
+
+    _store = PayloadStore(settings['payload_dir'], settings['payload_min_chars']) if settings['payload_dir'] else None
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """Flush queued records and payloads and close the log file"""
+    global _listener, _store
+    if _store is not None:
+        _store.close()
+        _store = None
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(stop_logging)
+
+
+def main(argv=None):
+    """Print a stored payload given the digest shown in a log line"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("usage: python logging_setup.py <payload digest> [payload_dir]")
+        return
+    print(read_payload(*argv[:2]))
+
+
+if __name__ == "__main__":
+    main()
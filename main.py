@@ -1,42 +1,100 @@
-from playwright.sync_api import Playwright, sync_playwright
-from groq import Groq
 import time
-import re
-from dotenv import load_dotenv
 import os
 import logging
 import json
+import sys
+import asyncio
+from dataclasses import asdict
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("quiz_automation.log"),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger(__name__)
-
-# Load environment variables
-load_dotenv()
+from button_resolver import ButtonResolver, control_names, CLICKABLE_SELECTOR
+from waits import WaitEngine
+from editors import insert_code, EDITOR_SELECTOR
+from answer_cache import AnswerCache
+from answers import QuizAnswers
+from batch import batch_courses, session_overrides, summarize_courses
+from cassette import Cassette
+from progress_journal import ProgressJournal
+from question_capture import QuestionCapture
+from question_extractor import extract_question
+from page_classifier import classify_page, TEXT_INPUT_SELECTOR
+from course_index import CourseIndex, index_settings
+from strategy_stats import StrategyStats, run_strategies
+from feedback import FeedbackDetector, summarize
+from llm_client import LLMError
+from logging_setup import payload
+from network_filter import RequestBlocker, browser_settings
+from resource_monitor import ResourceMonitor
+from run_report import RunReport
+from tracing import Tracer
+from transitions import TransitionDetector
+from session_store import load_session, save_session, clear_session, session_settings
 
-# Get credentials from environment variables
-EMAIL = os.getenv("PLATFORM_EMAIL")
-PASSWORD = os.getenv("PLATFORM_PASSWORD")
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+logger = logging.getLogger(__name__)
 
-# Initialize Groq client
-client = Groq(api_key=GROQ_API_KEY)
+# Credentials, read from the environment / .env by load_environment() when a command needs them
+EMAIL = None
+PASSWORD = None
 
-class QuizAutomation:
-    def __init__(self, playwright, config_file):
-        self.browser = playwright.chromium.launch(headless=False)
-        self.context = self.browser.new_context()
+class QuizAutomation(QuizAnswers, RunReport):
+    def __init__(self, playwright, config_file, config=None):
+        self.config = config or self.load_config(config_file)
+        self.session = load_session(self.config)
+        self.browser = playwright.chromium.launch(headless=browser_settings(self.config)['headless'])
+        self.request_blocker = RequestBlocker.from_config(self.config)
+        self.resource_monitor = ResourceMonitor.from_config(self.config)
+        self.question_capture = QuestionCapture.from_config(self.config)
+        self.waits = WaitEngine(None, self.config)
+        self.open_context(self.session['storage_state'] if self.session else None)
+        self.button_resolver = ButtonResolver()
+        self.answer_cache = AnswerCache.from_config(self.config)
+        self.journal = ProgressJournal.from_config(self.config)
+        self.position = None
+        self.tracer = Tracer.from_config(self.config)
+        self.course_index = CourseIndex.from_config(self.config)
+        self.strategy_stats = StrategyStats.from_config(self.config)
+        self.feedback = FeedbackDetector.from_config(self.config, self.waits.settings)
+        self.cassette = Cassette.from_config(self.config)
+        self.transitions = TransitionDetector.from_config(self.config, self.waits.settings)
+        self.results = []
+        self.course_url = None
+        self.home_url = None
+    
+    def open_context(self, storage_state=None):
+        """Create the browser context and page, with request blocking and resource sampling attached"""
+        self.context = self.browser.new_context(storage_state=storage_state)
+        if self.request_blocker:
+            self.request_blocker.install(self.context)
+        self.open_page()
+    
+    def open_page(self):
         self.page = self.context.new_page()
-        self.config = self.load_config(config_file)
+        self.waits.page = self.page
+        if self.resource_monitor:
+            self.resource_monitor.attach(self.browser, self.page)
+        if self.question_capture:
+            self.question_capture.install(self.page)
+    
+    def recycle(self, reason):
+        """Swap in a fresh page (or context) to release renderer memory, then reopen Contents"""
+        mode = self.resource_monitor.settings['recycle']
+        logger.info(f"Recycling the browser {mode}: {reason}")
+        with self.tracer.span("recycle", mode=mode):
+            if mode == "context":
+                # Cookies and local storage carry the login over, so no new login is needed
+                storage_state = self.context.storage_state()
+                self.context.close()
+                self.open_context(storage_state)
+            else:
+                old_page = self.page
+                self.open_page()
+                old_page.close()
+            self.resource_monitor.recycled()
+            self.page.goto(self.course_url)
+            course_frame = self.get_course_frame()
+            return bool(course_frame) and self.navigate_to_contents(course_frame)
         
-    def load_config(self, config_file):
+    @staticmethod
+    def load_config(config_file):
         """Load JSON configuration file"""
         try:
             with open(config_file, 'r') as file:
@@ -70,31 +128,26 @@ class QuizAutomation:
             self.page.wait_for_timeout(2000)
             
             first_frame = self.page.frame_locator(self.config['course_navigation']['frame']).first
+            partial = self.config['course_navigation']['partial_match']
             
+            def click_first(locator, description):
+                if locator.count() == 0:
+                    return False
+                locator.click(timeout=60000)
+                logger.info(f"Clicked course {description}")
+                return True
+            
+            strategies = [
+                ("exact_button", lambda: click_first(first_frame.get_by_role("button", name=course_name), f"button: {course_name}")),
+                ("partial_button", lambda: click_first(first_frame.get_by_role("button").filter(has_text=partial).first, f"button containing: {partial}")),
+                ("partial_link", lambda: click_first(first_frame.get_by_role("link").filter(has_text=partial).first, f"link containing: {partial}"))
+            ]
             for attempt in range(3):
-                try:
-                    self.page.wait_for_timeout(5000)
-                    button = first_frame.get_by_role("button", name=course_name)
-                    if button.count() > 0:
-                        button.click(timeout=60000)
-                        logger.info(f"Clicked course button: {course_name}")
-                        break
-                    partial = self.config['course_navigation']['partial_match']
-                    button = first_frame.get_by_role("button").filter(has_text=partial).first
-                    if button.count() > 0:
-                        button.click(timeout=60000)
-                        logger.info(f"Clicked course button containing: {partial}")
-                        break
-                    link = first_frame.get_by_role("link").filter(has_text=partial).first
-                    if link.count() > 0:
-                        link.click(timeout=60000)
-                        logger.info(f"Clicked course link containing: {partial}")
-                        break
-                    logger.warning(f"Attempt {attempt + 1}: Could not find course: {course_name}")
-                    time.sleep(5)
-                except Exception as e:
-                    logger.error(f"Attempt {attempt + 1} failed: {e}")
-                    time.sleep(5)
+                self.page.wait_for_timeout(5000)
+                if run_strategies(self.strategy_stats, "navigate_to_course", strategies):
+                    break
+                logger.warning(f"Attempt {attempt + 1}: Could not find course: {course_name}")
+                time.sleep(5)
             else:
                 logger.error("Failed to click course after 3 attempts.")
                 return False
@@ -106,8 +159,8 @@ class QuizAutomation:
             return False
     
     def get_course_frame(self):
-        """Get the course iframe"""
-        course_frame = self.page.frame(self.config['course_frame'])
+        """Get the course iframe, waiting for it to attach"""
+        course_frame = self.waits.for_frame(self.config['course_frame'])
         if not course_frame:
             logger.error("Couldn't locate course iframe!")
             return None
@@ -124,34 +177,34 @@ class QuizAutomation:
             logger.error(f"Error navigating to Contents: {e}")
             return False
     
-    def click_button_containing_text(self, course_frame, text, strict=False):
-        """Click a button that contains the given text"""
+    def click_button_containing_text(self, course_frame, text, strict=False, action="click_button_containing_text"):
+        """Click a button that contains the given text; action names the strategy stats entry"""
         try:
             if strict:
                 course_frame.get_by_role("button", name=text).first.click()
                 return True
             
-            buttons = course_frame.locator("button").all()
-            for button in buttons:
-                try:
-                    button_text = button.inner_text()
-                    if text.lower() in button_text.lower():
-                        button.click()
-                        logger.info(f"Clicked button with text: {button_text}")
-                        return True
-                except:
-                    continue
-                    
-            buttons = course_frame.locator("div[role='button']").all()
-            for button in buttons:
-                try:
-                    button_text = button.inner_text()
-                    if text.lower() in button_text.lower():
-                        button.click()
-                        logger.info(f"Clicked div button with text: {button_text}")
-                        return True
-                except:
-                    continue
+            def resolver_scan():
+                clicked = self.button_resolver.click(course_frame, [text])
+                if clicked:
+                    logger.info(f"Clicked {clicked['tag']} button with text: {clicked['text']} ({self.button_resolver.round_trips} round-trips)")
+                return clicked
+            
+            def click_role(role):
+                locator = course_frame.get_by_role(role, name=text)
+                if locator.count() == 0:
+                    return False
+                locator.first.click()
+                logger.info(f"Clicked {role} with name: {text}")
+                return True
+            
+            strategies = [
+                ("resolver_scan", resolver_scan),
+                ("role_button", lambda: click_role("button")),
+                ("role_link", lambda: click_role("link"))
+            ]
+            if run_strategies(self.strategy_stats, action, strategies):
+                return True
             
             logger.warning(f"Could not find button containing text: {text}")
             return False
@@ -159,130 +212,38 @@ class QuizAutomation:
             logger.error(f"Error clicking button containing text '{text}': {e}")
             return False
     
-    def get_quiz_answer(self, page_content):
-        """Get multiple choice or text answer from Groq"""
-        try:
-            prompt = self.config.get('quiz_prompt', """
-Analyze this quiz page content. Find the question and options.
-Then tell me ONLY the numbers of the correct options (e.g., "1, 3") for multiple-choice, or the exact answer text for text-based questions.
-No explanation needed, no prefix, no suffix.
-Page content:
-{content}
-""").format(content=page_content)
-            response = client.chat.completions.create(
-                model="llama3-70b-8192",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3
-            )
-            
-            full_response = response.choices[0].message.content.strip()
-            logger.info(f"Raw Groq response: {full_response}")
-            
-            if "correct options are:" in full_response.lower():
-                answer_part = full_response.lower().split("correct options are:")[1].strip()
-                indices = [int(num.strip()) for num in re.findall(r'\d+', answer_part)]
-                answer_str = ", ".join(str(idx) for idx in indices)
-            else:
-                answer_str = full_response  # For text-based answers
-                indices = [int(num.strip()) for num in re.findall(r'\d+', full_response) if num.strip().isdigit()]
-                if indices:
-                    answer_str = ", ".join(str(idx) for idx in indices)
-            
-            logger.info(f"Parsed answer: {answer_str}")
-            return answer_str
-        except Exception as e:
-            logger.error(f"Groq error for quiz: {e}")
-            return "1"
-    
-    def get_code_answer(self, page_content):
-        """Get code answer from Groq"""
-        try:
-            prompt = self.config.get('code_prompt', """
-You are a coding expert. Provide ONLY the code solution for the following problem, with no explanation or comments.
-Problem:
-{content}
-Code:
-""").format(content=page_content)
-            response = client.chat.completions.create(
-                model="llama3-70b-8192",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.2
-            )
-            code = response.choices[0].message.content.strip()
-            logger.info(f"Groq generated code: {code}")
-            return code
-        except Exception as e:
-            logger.error(f"Groq error for code: {e}")
-            return "# Default code"
+    def page_state(self, course_frame):
+        """Read question type, inputs, editor kind and submit/next controls in one round-trip"""
+        with self.tracer.span("classify"):
+            return classify_page(course_frame, self.config, self.button_resolver)
     
-    def has_submit_button(self, course_frame):
-        """Check if the page has a submit/check/run button"""
-        button_names = self.config.get('submit_buttons', ["Submit", "Check Answer", "Run", "Execute", "Verify"])
-        
-        for name in button_names:
-            try:
-                button = course_frame.get_by_role("button", name=name)
-                if button.count() > 0:
-                    return True
-            except:
-                pass
-        
-        buttons = course_frame.locator("button").all()
-        for button in buttons:
-            try:
-                button_text = button.inner_text().lower()
-                if any(name.lower() in button_text for name in button_names):
-                    return True
-            except:
-                continue
-        
-        return False
-    
-    def has_checkboxes(self, course_frame):
-        """Check if the page has checkboxes"""
-        checkboxes = course_frame.locator("input[type='checkbox']").all()
-        return len(checkboxes) > 0
-    
-    def has_code_editor(self, course_frame):
-        """Check if the page has a code editor (textarea or specific class)"""
-        try:
-            # Look for textarea or common code editor classes (e.g., CodeMirror, ACE Editor)
-            editors = course_frame.locator("textarea, .CodeMirror, .ace_editor, [contenteditable='true']").all()
-            return len(editors) > 0
-        except Exception as e:
-            logger.error(f"Error checking for code editor: {e}")
-            return False
-    
-    def handle_quiz_question(self, course_frame, page_content):
+    def handle_quiz_question(self, course_frame, page_content, state):
         """Handle multiple choice or text-based quiz questions"""
         try:
-            answer = self.get_quiz_answer(page_content)
-            logger.info(f"Groq says answer is: {answer}")
+            action = self.answer_quiz(page_content, state)
+            if action is None:
+                logger.error("No answer from Groq, leaving the question unanswered.")
+                return False
+            if action['kind'] == "skip":
+                logger.error(f"Nothing to enter ({action['reason']}), leaving the question unanswered.")
+                return False
             
-            if self.has_checkboxes(course_frame):
+            if action['kind'] == "check":
                 logger.info("Handling multiple-choice question")
-                indices = [int(num.strip()) for num in re.findall(r'\d+', answer) if num.strip().isdigit()]
-                checkboxes = course_frame.locator("input[type='checkbox']").all()
-                if not checkboxes:
-                    logger.error("No checkboxes found for quiz question.")
-                    return False
-                
-                for idx in indices:
-                    if 0 < idx <= len(checkboxes):
+                checkboxes = course_frame.locator("input[type='checkbox']")
+                with self.tracer.span("answer", kind="checkbox"):
+                    for idx in action['options']:
                         try:
-                            checkboxes[idx-1].check()
+                            checkboxes.nth(idx-1).check()
                             logger.info(f"Checked option {idx}")
                         except Exception as e:
                             logger.error(f"Failed to check option {idx}: {e}")
             else:
                 logger.info("Handling text-based question")
-                text_inputs = course_frame.locator("input[type='text'], textarea").all()
-                if not text_inputs:
-                    logger.error("No text input found for quiz question.")
-                    return False
                 try:
-                    text_inputs[0].fill(answer)
-                    logger.info(f"Filled text input with: {answer}")
+                    with self.tracer.span("answer", kind="text"):
+                        course_frame.locator(TEXT_INPUT_SELECTOR).first.fill(action['text'])
+                    logger.info(f"Filled text input with: {payload(action['text'], 'answer')}")
                 except Exception as e:
                     logger.error(f"Failed to fill text input: {e}")
                     return False
@@ -292,238 +253,270 @@ Code:
             logger.error(f"Error handling quiz question: {e}")
             return False
     
-    def handle_code_question(self, course_frame, page_content):
-        """Handle coding questions"""
+    def handle_code_question(self, course_frame, page_content, state):
+        """Handle coding questions, returning the code that was entered"""
         try:
             code = self.get_code_answer(page_content)
-            
-            logger.info("Waiting for code editor to load (15 seconds)...")
-            time.sleep(15)
-            
-            # Try to locate code editor (textarea or common editor classes)
-            editor = course_frame.locator("textarea, .CodeMirror, .ace_editor, [contenteditable='true']").first
-            if not editor:
-                logger.error("No code editor found.")
+            if code is None:
+                logger.error("No code from Groq, leaving the question unanswered.")
                 return False
-            
-            # Click to focus
-            try:
-                editor.click()
-                logger.info("Clicked code editor")
-            except Exception as e:
-                logger.error(f"Failed to click code editor: {e}")
-            
-            time.sleep(1)
-            self.page.keyboard.press("Control+a")
-            time.sleep(0.5)
-            self.page.keyboard.press("Delete")
-            time.sleep(0.5)
-            
-            logger.info(f"Typing code ({len(code)} characters)")
-            self.page.keyboard.type(code, delay=100)
-            
-            logger.info("Waiting 5 seconds before submitting...")
-            time.sleep(5)
-            
-            submit_success = False
-            for attempt in range(5):
-                try:
-                    if self.click_submit_or_next(course_frame, submit_mode=True):
-                        logger.info(f"Successfully submitted code (attempt {attempt + 1})")
-                        submit_success = True
-                        break
-                    time.sleep(3)
-                except Exception as e:
-                    logger.error(f"Error submitting code (attempt {attempt + 1}): {e}")
-                    time.sleep(3)
-            
-            if not submit_success:
-                logger.error("Failed to submit code after multiple attempts")
-                return False
-            
-            logger.info("Waiting for submission feedback (30 seconds)...")
-            time.sleep(30)
-            
-            next_success = False
-            for attempt in range(5):
-                try:
-                    if self.click_submit_or_next(course_frame, submit_mode=False):
-                        logger.info(f"Successfully clicked Next (attempt {attempt + 1})")
-                        next_success = True
-                        break
-                    time.sleep(3)
-                except Exception as e:
-                    logger.error(f"Error clicking Next (attempt {attempt + 1}): {e}")
-                    time.sleep(3)
-            
-            if not next_success:
-                logger.error("Failed to click Next after multiple attempts")
+            if not self.enter_code(course_frame, code, state):
                 return False
-            
-            return True
+            return code
         except Exception as e:
             logger.error(f"Error handling code question: {e}")
             return False
     
+    def enter_code(self, course_frame, code, state):
+        """Replace the editor contents with code"""
+        # The classifier only reports an editor kind once one is visible
+        if not state.editor_kind:
+            logger.info("Waiting for code editor to load...")
+            if not self.waits.for_visible(course_frame, EDITOR_SELECTOR, name="editor"):
+                logger.error("Code editor did not become visible.")
+                return False
+        
+        with self.tracer.span("answer", kind="code"):
+            method = insert_code(
+                self.page, course_frame, code, kind=state.editor_kind,
+                type_delay=self.config.get('editor', {}).get('type_delay', 10)
+            )
+        if not method:
+            logger.error("Failed to enter code into the editor.")
+            return False
+        
+        self.waits.for_visible(course_frame, CLICKABLE_SELECTOR, name="submit_ready")
+        return True
+    
+    def submit_answer(self, course_frame, state, page_content, code=None):
+        """Submit and wait for the platform's verdict, resubmitting rejected code with a fix.
+        
+        Returns the FeedbackResult, or None if no submit button could be clicked.
+        """
+        max_resubmits = self.feedback.settings['max_resubmits'] if code else 0
+        for resubmit in range(max_resubmits + 1):
+            baseline = self.feedback.snapshot(course_frame)
+            with self.tracer.span("submit"):
+                if not self.click_submit_or_next(course_frame, submit_mode=True):
+                    return None
+            with self.tracer.span("feedback") as span:
+                result = self.feedback.wait(course_frame, baseline, state.question_type)
+                span.update(status=result.status)
+            if not result.failed or resubmit == max_resubmits:
+                break
+            
+            logger.warning(f"Platform reported {result.status} for the code, asking Groq for a fix")
+            try:
+                fixed = self.fix_code(page_content, code, result.message)
+            except LLMError as e:
+                logger.error(f"Groq error while fixing code: {e}")
+                break
+            if not self.enter_code(course_frame, fixed, state):
+                break
+            code = fixed
+        self.settle_cached_answer(page_content, state.question_type, result, code if resubmit else None)
+        return result
+    
+    def record_result(self, question_number, state, result):
+        """Keep the verdict for the run summary"""
+        entry = {"question": question_number, "type": state.question_type, **(self.position or {})}
+        entry.update(asdict(result))
+        self.results.append(entry)
+    
     def click_submit_or_next(self, course_frame, submit_mode=True):
         """Try to click submit/check/run buttons first, or next/continue if submit_mode=False"""
-        submit_buttons = self.config.get('submit_buttons', [
-            {"role": "button", "name": "Submit"},
-            {"role": "button", "name": "Check Answer"},
-            {"role": "button", "name": "Run"},
-            {"role": "button", "name": "Execute"},
-            {"role": "button", "name": "Verify"}
-        ])
-        next_buttons = self.config.get('next_buttons', [
-            {"role": "button", "name": "Next"},
-            {"role": "button", "name": "Continue"}
-        ])
-        button_texts = ["submit", "check", "run", "execute", "verify"] if submit_mode else ["next", "continue"]
+        names, button_texts = control_names(self.config, submit_mode)
+        action = "submit" if submit_mode else "next"
         
+        def resolver_scan():
+            clicked = self.button_resolver.click(course_frame, names, button_texts)
+            if clicked:
+                logger.info(f"Clicked {clicked['tag']} button with text: {clicked['text']} ({self.button_resolver.round_trips} round-trips)")
+            return clicked
+        
+        def role_names():
+            for name in names:
+                button = course_frame.get_by_role("button", name=name)
+                if button.count() > 0 and button.first.is_enabled():
+                    button.first.click()
+                    logger.info(f"Clicked button by role and name: {name}")
+                    return True
+            return False
+        
+        strategies = [("resolver_scan", resolver_scan), ("role_names", role_names)]
         for attempt in range(3):
-            try:
-                buttons_to_try = submit_buttons if submit_mode else next_buttons
-                for button_info in buttons_to_try:
-                    try:
-                        button = course_frame.get_by_role(button_info["role"], name=button_info["name"])
-                        if button.count() > 0:
-                            button.click()
-                            logger.info(f"Clicked {button_info['name']} button (attempt {attempt + 1})")
-                            return True
-                    except Exception:
-                        continue
-                
-                buttons = course_frame.locator("button").all()
-                for button in buttons:
-                    try:
-                        button_text = button.inner_text().lower()
-                        if any(text in button_text for text in button_texts):
-                            button.click()
-                            logger.info(f"Clicked button with text: {button_text} (attempt {attempt + 1})")
-                            return True
-                    except:
-                        continue
-                
-                buttons = course_frame.locator("div[role='button']").all()
-                for button in buttons:
-                    try:
-                        button_text = button.inner_text().lower()
-                        if any(text in button_text for text in button_texts):
-                            button.click()
-                            logger.info(f"Clicked div button with text: {button_text} (attempt {attempt + 1})")
-                            return True
-                    except:
-                        continue
-                
-                time.sleep(1)
-            except Exception as e:
-                logger.error(f"Attempt {attempt + 1} failed: {e}")
+            if run_strategies(self.strategy_stats, action, strategies):
+                return True
+            time.sleep(1)
             
-        logger.error(f"No {'submit' if submit_mode else 'next'} button found after 3 attempts")
+        logger.error(f"No {action} button found after 3 attempts")
         return False
     
-    def solve_quiz(self, course_frame):
-        """Function to solve all questions in a quiz/exercise"""
+    def next_question(self, course_frame):
+        """Click Next and wait for a different question; returns its fingerprint ('' if the page has none), or None at the end of the quiz"""
+        baseline = self.transitions.fingerprint(course_frame)
+        with self.tracer.span("next"):
+            if not self.click_submit_or_next(course_frame, submit_mode=False):
+                logger.info("No next/continue button found. Quiz may be complete.")
+                return None
+        with self.tracer.span("transition"):
+            return self.transitions.wait_for_change(self.page, self.config['course_frame'], baseline)
+    
+    def solve_quiz(self, course_frame, answered=0):
+        """Function to solve all questions in a quiz/exercise, skipping the first `answered` questions.
+        
+        The quiz ends when there is no submit button, Next does not bring up a different question,
+        or only already-answered questions keep coming back. Returns (questions solved, reached the end);
+        the second is False when the quiz was abandoned part way, so it is not journaled as done.
+        """
         question_count = 0
-        max_attempts = 20
+        seen = set()
+        duplicates = 0
+        max_questions = self.transitions.settings['max_questions']
         
-        while question_count < max_attempts:
-            question_count += 1
-            logger.info(f"\n--- Processing question {question_count} ---")
-            self.page.wait_for_timeout(500)
+        while question_count < max_questions:
+            course_frame = self.page.frame(self.config['course_frame'])
+            if not course_frame:
+                logger.error("Lost course iframe reference!")
+                return question_count, False
             
             try:
-                course_frame = self.page.frame(self.config['course_frame'])
-                if not course_frame:
-                    logger.error("Lost course iframe reference!")
-                    return question_count - 1
-                    
-                if not self.has_submit_button(course_frame):
+                fingerprint = self.transitions.fingerprint(course_frame)
+                if fingerprint and fingerprint in seen:
+                    duplicates += 1
+                    if duplicates > self.transitions.settings['max_duplicates']:
+                        logger.info(f"{duplicates} already-answered questions in a row, treating the quiz as complete")
+                        return question_count, True
+                    logger.info("This question was already answered in this quiz, skipping it")
+                    if self.next_question(course_frame) is None:
+                        return question_count, True
+                    continue
+                duplicates = 0
+                
+                state = self.page_state(course_frame)
+                if not state.has_submit:
                     logger.info("No submit button found. Quiz may be complete.")
-                    return question_count - 1
-                    
-                page_text = course_frame.evaluate("() => document.body.innerText")
-                logger.info(f"Text length: {len(page_text)} characters")
+                    return question_count, True
                 
-                if self.has_checkboxes(course_frame):
-                    logger.info("Detected question type: Multiple choice")
-                    if not self.handle_quiz_question(course_frame, page_text):
-                        logger.error("Failed to handle quiz question.")
-                        return question_count - 1
-                elif self.has_code_editor(course_frame):
-                    logger.info("Detected question type: Coding")
-                    if not self.handle_code_question(course_frame, page_text):
-                        logger.error("Failed to handle code question.")
-                        return question_count - 1
-                else:
-                    logger.info("Detected question type: Text or SQL")
-                    if not self.handle_quiz_question(course_frame, page_text):
-                        logger.error("Failed to handle text/SQL question.")
-                        return question_count - 1
+                question_count += 1
+                seen.add(fingerprint)
+                logger.info(f"\n--- Processing question {question_count} ---")
                 
-                self.page.wait_for_timeout(200)
+                if question_count <= answered:
+                    logger.info(f"Question {question_count} already answered in a previous run, skipping")
+                    if self.next_question(course_frame) is not None:
+                        continue
+                    logger.warning("Could not skip ahead, answering the question again")
+                    course_frame = self.page.frame(self.config['course_frame'])
+                    state = self.page_state(course_frame)
                 
-                logger.info("Attempting to submit answer...")
-                if not self.click_submit_or_next(course_frame, submit_mode=True):
-                    logger.error("Failed to submit answer. Quiz may be complete.")
-                    return question_count
+                with self.tracer.span("question", index=question_count):
+                    if not self.solve_question(course_frame, state, question_count):
+                        return question_count - 1, False
                 
-                self.page.wait_for_timeout(500)
+                if self.journal and self.position:
+                    self.journal.record("question", question=question_count, **self.position)
                 
-                logger.info("Attempting to click Next...")
-                next_found = self.click_submit_or_next(course_frame, submit_mode=False)
-                if not next_found:
-                    logger.error("No next/continue button found. Quiz may be complete.")
-                    return question_count
-                    
+                if self.next_question(course_frame) is None:
+                    logger.info("Reached the end of the quiz")
+                    return question_count, True
             except Exception as e:
                 logger.error(f"Error processing question: {e}")
                 break
-            
-            self.page.wait_for_timeout(2000)
+        else:
+            logger.warning(f"Stopped after {max_questions} questions (transitions.max_questions)")
         
-        logger.info(f"Completed {question_count} questions")
-        return question_count
+        logger.info(f"Stopped after {question_count} questions without reaching the end of the quiz")
+        return question_count, False
+    
+    def solve_question(self, course_frame, state, question_count):
+        """Capture, answer and submit the question on screen; False if it could not be answered"""
+        with self.tracer.span("capture") as span:
+            question = None
+            if self.question_capture:
+                question = self.question_capture.take(state, self.config.get('min_question_chars', 20))
+            if question is None:
+                question = extract_question(course_frame, self.config)
+            span.update(source=question['source'])
+        page_text = question['text']
+        
+        code = None
+        if state.question_type == "multiple_choice":
+            logger.info("Detected question type: Multiple choice")
+            if not self.handle_quiz_question(course_frame, page_text, state):
+                logger.error("Failed to handle quiz question.")
+                return False
+        elif state.question_type == "coding":
+            logger.info("Detected question type: Coding")
+            code = self.handle_code_question(course_frame, page_text, state)
+            if not code:
+                logger.error("Failed to handle code question.")
+                return False
+        else:
+            logger.info("Detected question type: Text or SQL")
+            if not self.handle_quiz_question(course_frame, page_text, state):
+                logger.error("Failed to handle text/SQL question.")
+                return False
+        
+        logger.info("Attempting to submit answer...")
+        result = self.submit_answer(course_frame, state, page_text, code)
+        if result is None:
+            logger.error("Failed to submit answer.")
+            return False
+        self.record_result(question_count, state, result)
+        return True
     
     def go_back_to_contents(self, course_frame):
         """Go back to contents page using link or breadcrumb navigation"""
         try:
-            contents_link = course_frame.get_by_role(self.config['back_to_contents']['role'], name=self.config['back_to_contents']['name'])
-            if contents_link.count() > 0:
-                contents_link.click()
+            def contents_link():
+                link = course_frame.get_by_role(self.config['back_to_contents']['role'], name=self.config['back_to_contents']['name'])
+                if link.count() == 0:
+                    return False
+                link.click()
                 logger.info("Navigated back to Contents via link")
-                time.sleep(3)
                 return True
             
-            breadcrumbs = course_frame.locator(".breadcrumb a").all()
-            if breadcrumbs and len(breadcrumbs) > 0:
-                breadcrumbs[0].click()
+            def breadcrumb():
+                breadcrumbs = course_frame.locator(".breadcrumb a")
+                if breadcrumbs.count() == 0:
+                    return False
+                breadcrumbs.first.click()
                 logger.info("Navigated back via breadcrumb")
-                time.sleep(3)
                 return True
             
-            links = course_frame.locator("a").all()
-            for link in links:
-                try:
-                    link_text = link.inner_text().lower()
-                    if "contents" in link_text or "home" in link_text:
-                        link.click()
-                        logger.info(f"Navigated back via link with text: {link_text}")
-                        time.sleep(3)
-                        return True
-                except:
-                    continue
+            def link_scan():
+                # One evaluate instead of an inner_text round-trip per link
+                index = course_frame.evaluate("""() => Array.from(document.querySelectorAll('a')).findIndex(a => {
+                    const text = (a.innerText || '').toLowerCase();
+                    return text.includes('contents') || text.includes('home');
+                })""")
+                if index < 0:
+                    return False
+                course_frame.locator("a").nth(index).click()
+                logger.info("Navigated back via contents/home link")
+                return True
             
+            strategies = [
+                ("contents_link", contents_link),
+                ("breadcrumb", breadcrumb),
+                ("link_scan", link_scan)
+            ]
+            if run_strategies(self.strategy_stats, "go_back_to_contents", strategies):
+                self.waits.for_network_idle()
+                return True
+            
+            # history.back() always "works", so it stays the unranked last resort
             try:
                 course_frame.evaluate("() => window.history.back()")
                 logger.info("Used browser back function")
-                time.sleep(3)
+                self.waits.for_network_idle()
                 
                 current_url = course_frame.evaluate("() => window.location.href")
                 if "quiz" in current_url.lower() or "assessment" in current_url.lower():
                     course_frame.evaluate("() => window.history.back()")
                     logger.info("Used browser back function again")
-                    time.sleep(3)
+                    self.waits.for_network_idle()
                 
                 return True
             except Exception as e:
@@ -535,8 +528,108 @@ Code:
             logger.error(f"Error going back to contents: {e}")
             return False
     
+    def click_course_item(self, text, kind, attempts=5):
+        """Click a unit, subtopic or quiz on the Contents page once it is actually rendered"""
+        with self.tracer.span(f"navigate_{kind}", name=text):
+            return self._click_course_item(text, kind, attempts)
+    
+    def _click_course_item(self, text, kind, attempts):
+        for attempt in range(attempts):
+            course_frame = self.get_course_frame()
+            if not course_frame:
+                continue
+            self.waits.for_text(course_frame, text)
+            if self.click_button_containing_text(course_frame, text, action=f"click_{kind}"):
+                logger.info(f"Clicked on {kind}: {text} (attempt {attempt + 1})")
+                self.waits.for_network_idle()
+                return True
+            logger.error(f"Failed to click on {kind}: {text} (attempt {attempt + 1})")
+        
+        logger.error(f"Failed to click on {kind}: {text} after multiple attempts")
+        return False
+    
+    def discover_course(self, contents_texts):
+        """Walk Contents once, recording every unit, subtopic and quiz with the URL that opens it"""
+        course_frame = self.get_course_frame()
+        contents_url = course_frame.url
+        units = []
+        for unit_name in contents_texts:
+            unit_url, subtopic_names = self._discover_item(contents_url, unit_name, "unit", contents_texts)
+            unit = {"name": unit_name, "url": unit_url, "subtopics": []}
+            for subtopic_name in subtopic_names:
+                seen = contents_texts + subtopic_names
+                subtopic_url, quiz_names = self._discover_item(unit_url or contents_url, subtopic_name, "subtopic", seen)
+                quizzes = []
+                for quiz_name in quiz_names:
+                    quiz_url, _ = self._discover_item(subtopic_url or unit_url or contents_url, quiz_name, "quiz", [])
+                    quizzes.append({"name": quiz_name, "url": quiz_url})
+                unit["subtopics"].append({"name": subtopic_name, "url": subtopic_url, "quizzes": quizzes})
+            units.append(unit)
+            logger.info(f"Discovered {unit_name}: {len(unit['subtopics'])} subtopics")
+        
+        self.course_index.save(self.course_index.build(contents_texts, units))
+        course_frame = self.get_course_frame()
+        course_frame.goto(contents_url)
+        self.waits.for_network_idle()
+        return units
+    
+    def _discover_item(self, parent_url, name, kind, seen):
+        """Open parent_url, click the named item and return its URL and the new items it shows"""
+        course_frame = self.get_course_frame()
+        if course_frame.url != parent_url:
+            course_frame.goto(parent_url)
+            self.waits.for_network_idle()
+        if not self.click_course_item(name, kind, attempts=2):
+            return None, []
+        course_frame = self.get_course_frame()
+        self.waits.for_visible(course_frame, self.course_index.item_selector, name="discover")
+        # A URL that did not change means a client-side view, which can only be reached by clicking
+        url = course_frame.url if course_frame.url != parent_url else None
+        if kind == "quiz":
+            return url, []
+        return url, [text for text in self.course_index.items(course_frame) if text not in seen and text != name]
+    
+    def check_course_index(self, course_frame):
+        """Compare the saved index with Contents and, if auto_discover is on, rediscover the course if it changed"""
+        if not self.course_index or not self.course_index.item_selector:
+            return
+        texts = self.course_index.items(course_frame)
+        if self.course_index.matches(texts):
+            logger.info("Course index matches the Contents page")
+            return
+        self.course_index.invalidate("Contents page changed")
+        if not index_settings(self.config)['auto_discover']:
+            logger.info("No current course index; build one with `python cli.py discover`")
+            return
+        logger.info(f"Discovering course structure from {len(texts)} Contents items")
+        with self.tracer.span("discover"):
+            self.discover_course(texts)
+    
+    def open_indexed_quiz(self, unit, subtopic):
+        """Open a quiz by its indexed URL, or click through from Contents when that fails"""
+        url = self.course_index.quiz_url(unit['name'], subtopic['name'], subtopic['quiz'])
+        if url:
+            with self.tracer.span("navigate_quiz", name=subtopic['quiz'], via="index"):
+                try:
+                    course_frame = self.get_course_frame()
+                    course_frame.goto(url)
+                    if self.waits.for_visible(course_frame, CLICKABLE_SELECTOR, name="quiz_ready"):
+                        logger.info(f"Opened {subtopic['quiz']} directly from the course index")
+                        return True
+                except Exception as e:
+                    logger.warning(f"Could not open {url}: {e}")
+            self.course_index.invalidate(f"{url} did not open {subtopic['quiz']}")
+        
+        course_frame = self.get_course_frame()
+        if not course_frame or not self.navigate_to_contents(course_frame):
+            return False
+        for text, kind in ((unit['name'], "unit"), (subtopic['name'], "subtopic"), (subtopic['quiz'], "quiz")):
+            if not self.click_course_item(text, kind):
+                return False
+        return True
+    
     def process_units(self, units):
-        """Process all units and their subtopics with improved navigation and auto-unit transition"""
+        """Process all units and their subtopics, resuming after the last journaled step"""
         course_frame = self.get_course_frame()
         if not course_frame:
             return False
@@ -544,143 +637,330 @@ Code:
         if not self.navigate_to_contents(course_frame):
             return False
         
+        self.check_course_index(course_frame)
+        indexed = bool(self.course_index and self.course_index.data)
+        if not units and indexed:
+            units = self.course_index.units()
+            logger.info(f"Using {len(units)} units from the course index")
+        
+        # Auto-navigation only holds while walking the course in order; after
+        # skipping journaled items the next one has to be clicked explicitly.
+        needs_unit_click = False
         for unit_idx, unit in enumerate(units):
+            if self.journal and self.journal.unit_done(unit['name']):
+                logger.info(f"Skipping {unit['name']}, already completed")
+                needs_unit_click = True
+                continue
+            
             logger.info(f"\n=== Processing {unit['name']} ===")
             
-            if unit_idx == 0:
-                unit_clicked = False
-                for attempt in range(5):
-                    time.sleep(5)
-                    course_frame = self.get_course_frame()
-                    if not course_frame:
-                        logger.error("Lost course iframe reference!")
-                        time.sleep(5)
-                        continue
-                    if self.click_button_containing_text(course_frame, unit["name"]):
-                        logger.info(f"Clicked on unit: {unit['name']} (attempt {attempt + 1})")
-                        unit_clicked = True
-                        break
-                    logger.error(f"Failed to click on unit: {unit['name']} (attempt {attempt + 1})")
-                    time.sleep(5)
-                
-                if not unit_clicked:
-                    logger.error(f"Failed to click on unit: {unit['name']} after multiple attempts")
+            # With a course index every quiz is opened by URL, so there is no unit page to reach
+            if indexed:
+                logger.info(f"Opening {unit['name']} quizzes from the course index")
+            elif unit_idx == 0 or needs_unit_click:
+                if not self.click_course_item(unit["name"], "unit"):
                     continue
-                
-                time.sleep(10)
+                needs_unit_click = False
             else:
                 logger.info(f"Assuming auto-navigation to {unit['name']}, skipping unit click")
-                time.sleep(5)
+                self.waits.for_network_idle()
             
             subtopics_completed = 0
+            unfinished = 0
             total_subtopics = len(unit["subtopics"])
+            needs_subtopic_click = False
             
             for idx, subtopic in enumerate(unit["subtopics"]):
+                if self.journal and self.journal.subtopic_done(unit['name'], subtopic['name']):
+                    logger.info(f"Skipping subtopic {subtopic['name']}, already completed")
+                    subtopics_completed += 1
+                    needs_subtopic_click = True
+                    continue
+                
                 logger.info(f"\n-- Processing subtopic: {subtopic['name']} --")
                 
-                if idx == 0:
-                    subtopic_clicked = False
-                    for attempt in range(5):
-                        course_frame = self.get_course_frame()
-                        if not course_frame:
-                            logger.error("Lost course iframe reference!")
-                            time.sleep(5)
-                            continue
-                        if self.click_button_containing_text(course_frame, subtopic["name"]):
-                            logger.info(f"Clicked on subtopic: {subtopic['name']} (attempt {attempt + 1})")
-                            subtopic_clicked = True
-                            break
-                        logger.error(f"Failed to click on subtopic: {subtopic['name']} (attempt {attempt + 1})")
-                        time.sleep(5)
-                    
-                    if not subtopic_clicked:
-                        logger.error(f"Failed to click on subtopic: {subtopic['name']} after multiple attempts")
-                        continue
-                    
-                    time.sleep(10)
-                    
-                    quiz_clicked = False
-                    for attempt in range(5):
-                        course_frame = self.get_course_frame()
-                        if not course_frame:
-                            logger.error("Lost course iframe reference!")
-                            time.sleep(5)
-                            continue
-                        if self.click_button_containing_text(course_frame, subtopic["quiz"]):
-                            logger.info(f"Clicked on quiz: {subtopic['quiz']} (attempt {attempt + 1})")
-                            quiz_clicked = True
-                            break
-                        logger.error(f"Failed to click on quiz: {subtopic['quiz']} (attempt {attempt + 1})")
-                        time.sleep(5)
-                    
-                    if not quiz_clicked:
-                        logger.error(f"Failed to click on quiz: {subtopic['quiz']} after multiple attempts")
+                if indexed:
+                    if not self.open_indexed_quiz(unit, subtopic):
                         continue
                 else:
-                    quiz_clicked = False
-                    for attempt in range(5):
-                        course_frame = self.get_course_frame()
-                        if not course_frame:
-                            logger.error("Lost course iframe reference!")
-                            time.sleep(5)
+                    if idx == 0 or needs_subtopic_click:
+                        if not self.click_course_item(subtopic["name"], "subtopic"):
                             continue
-                        if self.click_button_containing_text(course_frame, subtopic["quiz"]):
-                            logger.info(f"Clicked on quiz: {subtopic['quiz']} (attempt {attempt + 1})")
-                            quiz_clicked = True
-                            break
-                        logger.error(f"Failed to click on quiz: {subtopic['quiz']} (attempt {attempt + 1})")
-                        time.sleep(5)
+                        needs_subtopic_click = False
                     
-                    if not quiz_clicked:
-                        logger.error(f"Failed to click on quiz: {subtopic['quiz']} after multiple attempts")
+                    if not self.click_course_item(subtopic["quiz"], "quiz"):
                         continue
                 
-                time.sleep(10)
+                course_frame = self.get_course_frame()
+                if not course_frame:
+                    continue
+                self.waits.for_visible(course_frame, CLICKABLE_SELECTOR, name="quiz_ready")
                 
-                questions_solved = self.solve_quiz(course_frame)
+                self.position = {"unit": unit['name'], "subtopic": subtopic['name'], "quiz": subtopic['quiz']}
+                answered = 0
+                if self.journal and self.config.get('journal', {}).get('skip_answered_questions', True):
+                    answered = self.journal.questions_done(**self.position)
+                with self.tracer.span("subtopic", name=subtopic['name']):
+                    questions_solved, finished = self.solve_quiz(course_frame, answered)
                 logger.info(f"Completed {questions_solved} questions in {subtopic['name']}")
+                if not finished:
+                    # Left out of the journal so the next run resumes inside this quiz
+                    logger.warning(f"{subtopic['quiz']} was abandoned before its end, not marking it complete")
+                    unfinished += 1
+                elif self.journal:
+                    self.journal.record("quiz", **self.position)
+                    self.journal.record("subtopic", unit['name'], subtopic['name'])
+                self.position = None
                 
                 subtopics_completed += 1
                 logger.info(f"Subtopics completed: {subtopics_completed}/{total_subtopics}")
                 
-                time.sleep(5)
+                self.waits.for_network_idle()
+                
+                reason = self.resource_monitor.after_quiz() if self.resource_monitor else None
+                if reason:
+                    if not self.recycle(reason):
+                        logger.error("Could not get back to Contents after recycling, stopping")
+                        return False
+                    # The fresh page starts on Contents, so nothing is auto-navigated to any more
+                    needs_unit_click = True
+                    needs_subtopic_click = True
+                    if not indexed and subtopics_completed < total_subtopics:
+                        if not self.click_course_item(unit["name"], "unit"):
+                            break
+                        continue
                 
+                if indexed:
+                    continue
                 if subtopics_completed < total_subtopics:
                     logger.info("Assuming auto-redirect to next subtopic's quiz list")
-                    time.sleep(10)
                 else:
                     logger.info("All subtopics in unit completed")
-                    time.sleep(10)
                     break
+            
+            if self.journal and subtopics_completed == total_subtopics and not unfinished:
+                self.journal.record("unit", unit['name'])
         
         logger.info("\nAll units and subtopics processed.")
+        self.waits.summary()
         return True
     
-    def run(self):
-        """Main method to run the automation"""
-        if not self.login():
+    def restore_session(self):
+        """Open the saved course URL and check the session is still logged in"""
+        try:
+            logger.info("Trying saved session")
+            self.page.goto(self.session['course_url'])
+            timeout = session_settings(self.config)['check_timeout']
+            if not self.waits.for_frame(self.config['course_frame'], timeout=timeout):
+                return False
+            email = self.config['login']['email']
+            if self.page.get_by_role(email['role'], name=email['name']).count() > 0:
+                return False
+            return True
+        except Exception as e:
+            logger.warning(f"Saved session check failed: {e}")
             return False
+    
+    def start(self):
+        """Reuse the saved session if it is still valid, otherwise login and open the course"""
+        started = time.perf_counter()
+        with self.tracer.span("restore_session"):
+            restored = bool(self.session) and self.restore_session()
+        if restored:
+            self.course_url = self.page.url
+            logger.info(f"Startup via saved session took {time.perf_counter() - started:.1f}s")
+            return True
+        if self.session:
+            logger.info("Saved session has expired, falling back to full login")
+            clear_session(self.config)
         
-        course_name = self.config['course_name']
-        if not self.navigate_to_course(course_name):
+        with self.tracer.span("login"):
+            logged_in = self.login()
+        if not logged_in:
             return False
+        self.home_url = self.page.url
         
-        self.process_units(self.config['units'])
+        course_name = self.config['course_name']
+        with self.tracer.span("navigate_to_course", course=course_name):
+            navigated = self.navigate_to_course(course_name)
+        if not navigated:
+            return False
         
-        logger.info("Browser remains open for debugging")
-        self.page.wait_for_timeout(3600000)
+        self.course_url = self.page.url
+        save_session(self.context.storage_state(), self.course_url, self.config)
+        logger.info(f"Startup via full login took {time.perf_counter() - started:.1f}s")
+        return True
+    
+    def discover(self):
+        """Rediscover the course from Contents even if the saved index still matches"""
+        if not self.course_index:
+            logger.error("The course index is disabled in config.json")
+            return None
+        if not self.course_index.item_selector:
+            logger.error("Set course_index.item_selector to the unit/subtopic/quiz entries before discovering")
+            return None
+        if not self.start():
+            return None
+        try:
+            course_frame = self.get_course_frame()
+            if not course_frame or not self.navigate_to_contents(course_frame):
+                return None
+            texts = self.course_index.items(course_frame)
+            logger.info(f"Discovering course structure from {len(texts)} Contents items")
+            with self.tracer.span("discover"):
+                self.discover_course(texts)
+            return self.course_index.units()
+        finally:
+            # Same flush as a normal run: the strategy stats and answer cache may have buffered writes
+            self.report([("", self.resource_monitor)], [self.question_capture])
+    
+    def run(self):
+        """Main method to run the automation"""
+        if not self.start():
+            return False
         
+        self.process_units(self.config.get('units', []))
+        summarize(self.results)
+        self.finish()
         return True
+    
+    def finish(self):
+        """Flush caches and stats, log the run summaries and close the browser"""
+        self.report([("", self.resource_monitor)], [self.question_capture])
+        
+        hold_seconds = browser_settings(self.config)['debug_hold_seconds']
+        if hold_seconds:
+            logger.info(f"Browser remains open for debugging for {hold_seconds}s")
+            self.page.wait_for_timeout(hold_seconds * 1000)
+        self.browser.close()
+    
+    def use_course(self, config):
+        """Rebuild everything derived from the config for another course of a batch.
+        
+        Only the browser-bound parts (request blocker, resource monitor, question capture, tracer)
+        are kept; courses cannot override their sections (batch.SESSION_KEYS).
+        """
+        if self.strategy_stats:
+            self.strategy_stats.save()
+        if self.answer_cache:
+            self.answer_cache.close()
+        if any(config.get(key) != self.config.get(key) for key in ('llm', 'models', 'rate_limits')):
+            if self._llm:
+                self._llm.summary()
+            self._llm = None
+            self._router = None
+        self.config = config
+        self.waits = WaitEngine(self.page, config)
+        self.answer_cache = AnswerCache.from_config(config)
+        self.journal = ProgressJournal.from_config(config)
+        self.course_index = CourseIndex.from_config(config)
+        self.strategy_stats = StrategyStats.from_config(config)
+        self.feedback = FeedbackDetector.from_config(config, self.waits.settings)
+        self.cassette = Cassette.from_config(config)
+        previous = self.transitions
+        self.transitions = TransitionDetector.from_config(config, self.waits.settings)
+        self.transitions.timings, self.transitions.timeouts = previous.timings, previous.timeouts
+        self.results = []
+        self.position = None
+    
+    def open_course(self, course_name):
+        """Go back to the course list and open another course in the same logged-in session"""
+        with self.tracer.span("navigate_to_course", course=course_name):
+            opened = self.navigate_to_course(course_name)
+            # The page login landed on has the course list; config['url'] is the login form
+            home_url = self.config['course_navigation'].get('url') or self.home_url
+            if not opened and home_url:
+                logger.info(f"Course list not reachable from here, reopening {home_url}")
+                self.page.goto(home_url)
+                opened = self.navigate_to_course(course_name)
+            elif not opened:
+                logger.error("Course list not reachable; set course_navigation.url to the page that lists the courses")
+        if opened:
+            self.course_url = self.page.url
+        return opened
+    
+    def run_batch(self, courses):
+        """Log in once and work through several courses, then log a combined summary"""
+        summaries = []
+        for number, config in enumerate(courses, start=1):
+            self.use_course(config)
+            course_name = config['course_name']
+            logger.info(f"\n##### Course {number}/{len(courses)}: {course_name} #####")
+            started = time.perf_counter()
+            opened = self.start() if number == 1 else self.open_course(course_name)
+            if not opened and number == 1:
+                logger.error("Could not log in, stopping the batch")
+                break
+            completed = False
+            if opened:
+                with self.tracer.span("course", name=course_name):
+                    completed = self.process_units(config.get('units', []))
+                summarize(self.results)
+            summaries.append({
+                "course": course_name,
+                "status": "completed" if completed else ("failed" if opened else "not opened"),
+                "seconds": time.perf_counter() - started,
+                "questions": len(self.results),
+                "passed": sum(1 for result in self.results if result['status'] == "passed")
+            })
+        summarize_courses(summaries)
+        self.finish()
+        return bool(summaries) and all(summary['status'] == "completed" for summary in summaries)
 
-def main():
-    """Main entry point"""
-    if not EMAIL or not PASSWORD or not GROQ_API_KEY:
-        logger.error("Missing required environment variables. Please set PLATFORM_EMAIL, PLATFORM_PASSWORD, and GROQ_API_KEY in .env file")
-        return
+def load_environment():
+    """Load .env and pick up the platform credentials"""
+    global EMAIL, PASSWORD
+    from dotenv import load_dotenv
+    load_dotenv()
+    EMAIL = os.getenv("PLATFORM_EMAIL")
+    PASSWORD = os.getenv("PLATFORM_PASSWORD")
+
+def run(config_file="config.json", config=None):
+    """Run the whole course, in several tabs if concurrency.tabs > 1"""
+    load_environment()
+    config = config or QuizAutomation.load_config(config_file)
+    if config.get('concurrency', {}).get('tabs', 1) > 1:
+        from async_engine import run_async
+        return asyncio.run(run_async(config))
+    
+    from playwright.sync_api import sync_playwright
+    with sync_playwright() as playwright:
+        automation = QuizAutomation(playwright, config_file, config)
+        return automation.run()
+
+def discover(config_file="config.json"):
+    """Log in, rebuild the course index and return its units (None on failure)"""
+    load_environment()
+    from playwright.sync_api import sync_playwright
+    with sync_playwright() as playwright:
+        automation = QuizAutomation(playwright, config_file)
+        try:
+            return automation.discover()
+        finally:
+            automation.browser.close()
+
+def run_batch(config_file="config.json", config=None):
+    """Run every course in config.json's 'courses' list in one browser session"""
+    load_environment()
+    config = config or QuizAutomation.load_config(config_file)
+    courses = batch_courses(config)
+    if not courses:
+        logger.error("No 'courses' listed in the config")
+        return False
+    for course in config['courses']:
+        if session_overrides(course):
+            logger.error(f"{course['course_name']}: {', '.join(session_overrides(course))} cannot differ per course in a batch")
+            return False
     
+    from playwright.sync_api import sync_playwright
     with sync_playwright() as playwright:
-        automation = QuizAutomation(playwright, "config.json")
-        automation.run()
+        automation = QuizAutomation(playwright, config_file, courses[0])
+        return automation.run_batch(courses)
+
+def main():
+    """Main entry point, same as `python cli.py run`"""
+    from cli import main as cli_main
+    return cli_main(["run"])
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,369 @@
+import html
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+COURSE_NAME = "Mock Programming Course"
+SESSION_COOKIE = "mock_session=1"
+
+# Sidebar and footer boilerplate so the question extractor has something to strip
+CHROME = """
+<nav class="sidebar">
+  <a href="/content/contents">Contents</a>
+  <a href="#">Announcements</a><a href="#">Discussion forum</a><a href="#">Grades</a>
+  <p>Welcome back! Remember to complete every unit before the deadline. Use the sidebar to move
+  between units, check your grades and read announcements from your instructors.</p>
+</nav>
+"""
+FOOTER = "<footer>&copy; Mock Learning Platform. Terms of service. Privacy policy. Help centre.</footer>"
+
+QUIZ_JS = """
+<script>
+async function submitAnswer() {
+  let answer;
+  if (PAGE.type === 'checkbox') {
+    answer = Array.from(document.querySelectorAll("input[type='checkbox']"))
+      .map((cb, i) => cb.checked ? i + 1 : 0).filter(i => i);
+  } else if (PAGE.type === 'text') {
+    answer = document.querySelector("input[type='text']").value;
+  } else {
+    const editor = document.querySelector('.code-editor');
+    answer = editor.value !== undefined ? editor.value : editor.innerText;
+  }
+  const response = await fetch('/api/submit', {
+    method: 'POST',
+    headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify({unit: PAGE.unit, subtopic: PAGE.subtopic, question: PAGE.question, answer: answer})
+  });
+  const result = await response.json();
+  setTimeout(() => {
+    let feedback = document.querySelector('.feedback');
+    if (!feedback) {
+      feedback = document.createElement('div');
+      feedback.className = 'feedback ' + (result.correct ? 'passed' : 'failed');
+      document.getElementById('result').appendChild(feedback);
+    }
+    feedback.innerText = result.message;
+  }, PAGE.feedback_delay);
+}
+function nextQuestion() { window.location.href = PAGE.next; }
+</script>
+"""
+
+
+def generate_course(units=2, subtopics=3, questions=10, seed=7):
+    """Build a synthetic course with checkbox, text and code-editor questions"""
+    rng = random.Random(seed)
+    kinds = ["checkbox", "text", "code"]
+    course = []
+    for u in range(units):
+        unit = {"name": f"Unit {u + 1}", "subtopics": []}
+        for s in range(subtopics):
+            quiz = []
+            for q in range(questions):
+                kind = kinds[(u + s + q) % len(kinds)]
+                a, b = rng.randint(1, 50), rng.randint(1, 50)
+                if kind == "checkbox":
+                    options = [str(a + b + delta) for delta in (0, 1, -1, 2)]
+                    rng.shuffle(options)
+                    quiz.append({
+                        "type": kind,
+                        "stem": f"Which of the following equals {a} + {b}?",
+                        "options": options,
+                        "answer": [options.index(str(a + b)) + 1]
+                    })
+                elif kind == "text":
+                    quiz.append({
+                        "type": kind,
+                        "stem": f"Type the value of {a} * {b}.",
+                        "answer": str(a * b)
+                    })
+                else:
+                    quiz.append({
+                        "type": kind,
+                        "editor": "textarea" if q % 2 == 0 else "contenteditable",
+                        "stem": "Read two integers separated by a space and print their sum.",
+                        "sample_input": f"{a} {b}",
+                        "sample_output": str(a + b)
+                    })
+            unit["subtopics"].append({
+                "name": f"Topic {u + 1}.{s + 1}",
+                "quiz": f"Exercise {u + 1}.{s + 1}",
+                "questions": quiz
+            })
+        course.append(unit)
+    return course
+
+
+def build_config(base_url, course, work_dir):
+    """config.json for the mock platform, in the same shape as the real one"""
+    return {
+        "platform": "MockPlatform",
+        "url": f"{base_url}/login",
+        "course_name": COURSE_NAME,
+        "course_frame": "course_frame",
+        "login": {
+            "email": {"role": "textbox", "name": "Email or Username"},
+            "password": {"role": "textbox", "name": "Password"},
+            "button": {"role": "button", "name": "Log In"}
+        },
+        "course_navigation": {
+            "view_courses": {"role": "button", "name": "My Courses"},
+            "frame": "iframe[name='courses']",
+            "partial_match": "Mock Programming"
+        },
+        "contents_navigation": {"role": "link", "name": "Contents"},
+        "back_to_contents": {"role": "link", "name": "Contents"},
+        "submit_buttons": ["Submit"],
+        "next_buttons": [{"role": "button", "name": "Next"}],
+        "waits": {
+            "frame_timeout": 10000,
+            "element_timeout": 5000,
+            "network_idle_timeout": 5000,
+            "feedback_timeout": 10000
+        },
+        "answer_cache": {"enabled": False},
+        "journal": {"enabled": False, "path": f"{work_dir}/progress_journal.jsonl"},
+        "session": {"enabled": False, "path": f"{work_dir}/session_state.json"},
+        "course_index": {"enabled": False, "path": f"{work_dir}/course_index.json"},
+        "strategy_stats": {"enabled": False, "path": f"{work_dir}/strategy_stats.json"},
+        "browser": {"headless": True, "block_resource_types": ["image", "font", "media"]},
+        "concurrency": {"tabs": 1},
+        "logging": {"path": f"{work_dir}/quiz_automation.jsonl", "payload_dir": f"{work_dir}/log_payloads"},
+        "units": [
+            {
+                "name": unit["name"],
+                "subtopics": [{"name": s["name"], "quiz": s["quiz"]} for s in unit["subtopics"]]
+            }
+            for unit in course
+        ],
+        "quiz_prompt": "Analyze this quiz page content. Find the question and options.\nThen tell me ONLY the numbers of the correct options (e.g., \"1, 3\") for multiple-choice, or the exact answer text for text-based questions.\nNo explanation needed, no prefix, no suffix.\n\nPage content:\n{content}",
+        "code_prompt": "You are a coding expert. Provide ONLY the code solution for the following problem, with no explanation or comments.\n\nProblem:\n{content}\n\nCode:"
+    }
+
+
+def page(title, body, script=""):
+    return (
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+        f"<link rel='icon' href='/static/favicon.png'></head><body>{body}{script}</body></html>"
+    )
+
+
+class MockPlatformHandler(BaseHTTPRequestHandler):
+    """Serves the synthetic platform; the course and counters live on the server object"""
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def send_html(self, content, status=200, headers=None):
+        data = content.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_json(self, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def redirect(self, location):
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def logged_in(self):
+        return SESSION_COOKIE in (self.headers.get("Cookie") or "")
+
+    def do_GET(self):
+        time.sleep(self.server.page_latency)
+        path = urlparse(self.path).path
+        parts = [p for p in path.split("/") if p]
+        if path in ("/", "/login"):
+            return self.send_html(self.login_page())
+        if path == "/do-login":
+            return self.send_html("", 302, {"Location": "/home", "Set-Cookie": f"{SESSION_COOKIE}; Path=/"})
+        if path.startswith("/static/"):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if not self.logged_in():
+            return self.redirect("/login")
+        if path == "/home":
+            return self.send_html(self.home_page())
+        if path == "/courses":
+            return self.send_html(self.courses_page())
+        if path == "/course":
+            return self.send_html(page(COURSE_NAME, "<iframe name='course_frame' src='/content/contents' width='1000' height='800'></iframe>"))
+        if path == "/content/contents":
+            return self.send_html(self.contents_page())
+        try:
+            numbers = [int(p) for p in parts[2:]]
+            if parts[:2] == ["content", "unit"]:
+                return self.send_html(self.unit_page(*numbers))
+            if parts[:2] == ["content", "subtopic"]:
+                return self.send_html(self.subtopic_page(*numbers))
+            if parts[:2] == ["content", "quiz"]:
+                return self.send_html(self.quiz_page(*numbers))
+            if parts[:2] == ["content", "next"]:
+                return self.redirect(self.next_location(*numbers))
+        except (IndexError, TypeError, ValueError):
+            pass
+        if path == "/content/done":
+            return self.send_html(page("Done", CHROME + "<h1>Course complete</h1>" + FOOTER))
+        self.send_html(page("Not found", "<h1>Not found</h1>"), 404)
+
+    def do_POST(self):
+        time.sleep(self.server.page_latency)
+        if urlparse(self.path).path != "/api/submit":
+            return self.send_html("", 404)
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        question = self.server.course[body["unit"]]["subtopics"][body["subtopic"]]["questions"][body["question"]]
+        if question["type"] == "checkbox":
+            correct = sorted(body["answer"]) == question["answer"]
+            message = "Correct!" if correct else "Incorrect answer."
+        elif question["type"] == "text":
+            correct = str(body["answer"]).strip() == question["answer"]
+            message = "Correct!" if correct else "Incorrect answer."
+        else:
+            correct = "print" in str(body["answer"])
+            message = f"Test cases passed: {2 if correct else 0}/2"
+        self.server.record_submission(body, question["type"], correct)
+        self.send_json({"correct": correct, "message": message})
+
+    def login_page(self):
+        return page("Login", """
+<h1>Sign in</h1>
+<form action="/do-login" method="get">
+  <input type="text" aria-label="Email or Username" name="email">
+  <input type="password" aria-label="Password" name="password">
+  <button type="submit">Log In</button>
+</form>
+""")
+
+    def home_page(self):
+        return page("Home", """
+<h1>Dashboard</h1>
+<button onclick="document.getElementById('courses').innerHTML = &quot;<iframe name='courses' src='/courses' width='600' height='300'></iframe>&quot;">My Courses</button>
+<div id="courses"></div>
+""")
+
+    def courses_page(self):
+        return page("Courses", f"""
+<button onclick="window.top.location.href='/course'">{html.escape(COURSE_NAME)}</button>
+<button onclick="window.top.location.href='/course'">Another Course</button>
+""")
+
+    def contents_page(self):
+        buttons = "".join(
+            f"<button onclick=\"location.href='/content/unit/{u}'\">{html.escape(unit['name'])}</button>"
+            for u, unit in enumerate(self.server.course)
+        )
+        return page("Contents", CHROME + f"<h1>Contents</h1><div class='units'>{buttons}</div>" + FOOTER)
+
+    def unit_page(self, u):
+        unit = self.server.course[u]
+        buttons = "".join(
+            f"<button onclick=\"location.href='/content/subtopic/{u}/{s}'\">{html.escape(sub['name'])}</button>"
+            for s, sub in enumerate(unit["subtopics"])
+        )
+        return page(unit["name"], CHROME + f"<h1>{html.escape(unit['name'])}</h1>{buttons}" + FOOTER)
+
+    def subtopic_page(self, u, s):
+        sub = self.server.course[u]["subtopics"][s]
+        body = (
+            f"<h1>{html.escape(sub['name'])}</h1><p>Read the material below, then attempt the exercise.</p>"
+            f"<div role='button' tabindex='0' onclick=\"location.href='/content/quiz/{u}/{s}/0'\">{html.escape(sub['quiz'])}</div>"
+        )
+        return page(sub["name"], CHROME + body + FOOTER)
+
+    def next_location(self, u, s, q):
+        course = self.server.course
+        if q + 1 < len(course[u]["subtopics"][s]["questions"]):
+            return f"/content/quiz/{u}/{s}/{q + 1}"
+        self.server.record_quiz_done()
+        if s + 1 < len(course[u]["subtopics"]):
+            return f"/content/subtopic/{u}/{s + 1}"
+        if u + 1 < len(course):
+            return f"/content/unit/{u + 1}"
+        return "/content/done"
+
+    def quiz_page(self, u, s, q):
+        question = self.server.course[u]["subtopics"][s]["questions"][q]
+        if question["type"] == "checkbox":
+            answer_html = "".join(
+                f"<label class='option'><input type='checkbox' value='{i}'> {html.escape(option)}</label><br>"
+                for i, option in enumerate(question["options"], start=1)
+            )
+        elif question["type"] == "text":
+            answer_html = "<input type='text' aria-label='Answer'>"
+        else:
+            answer_html = (
+                f"<pre class='sample-input'>Sample input:\n{html.escape(question['sample_input'])}</pre>"
+                f"<pre class='sample-output'>Sample output:\n{html.escape(question['sample_output'])}</pre>"
+            )
+            if question["editor"] == "textarea":
+                answer_html += "<textarea class='code-editor' rows='12' cols='80'></textarea>"
+            else:
+                answer_html += "<div class='code-editor' contenteditable='true' style='min-height:200px;border:1px solid #999'></div>"
+        state = {
+            "unit": u, "subtopic": s, "question": q, "type": question["type"],
+            "next": f"/content/next/{u}/{s}/{q}",
+            "feedback_delay": int(self.server.feedback_delay * 1000)
+        }
+        body = (
+            CHROME
+            + f"<div class='question'><p class='question-text'>Question {q + 1}: {html.escape(question['stem'])}</p>"
+            + answer_html
+            + "</div><div id='result'></div>"
+            + "<button onclick='submitAnswer()'>Submit</button> <button onclick='nextQuestion()'>Next</button>"
+            + FOOTER
+        )
+        return page("Quiz", body, f"<script>const PAGE = {json.dumps(state)};</script>" + QUIZ_JS)
+
+
+class MockPlatformServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, course, page_latency=0.02, feedback_delay=0.3, port=0):
+        super().__init__(("127.0.0.1", port), MockPlatformHandler)
+        self.course = course
+        self.page_latency = page_latency
+        self.feedback_delay = feedback_delay
+        self.lock = threading.Lock()
+        self.stats = {"submissions": {}, "correct": 0, "quizzes_completed": 0}
+        self.answered = set()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def record_submission(self, body, kind, correct):
+        with self.lock:
+            self.stats["submissions"][kind] = self.stats["submissions"].get(kind, 0) + 1
+            self.stats["correct"] += int(correct)
+            self.answered.add((body["unit"], body["subtopic"], body["question"]))
+
+    def record_quiz_done(self):
+        with self.lock:
+            self.stats["quizzes_completed"] += 1
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        logger.info(f"Mock platform serving at {self.base_url}")
+        return self
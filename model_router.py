@@ -0,0 +1,162 @@
+import logging
+import threading
+import time
+
+from llm_client import LLMError, retry_after
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "llama3-70b-8192"
+
+# Question types detected in solve_quiz -> ordered model preference and latency budget (seconds)
+DEFAULT_ROUTES = {
+    "multiple_choice": {"models": ["llama-3.1-8b-instant", DEFAULT_MODEL], "budget_seconds": 4},
+    "text": {"models": [DEFAULT_MODEL], "budget_seconds": 8},
+    "coding": {"models": [DEFAULT_MODEL], "budget_seconds": 30}
+}
+
+DEFAULT_RATE_LIMITS = {
+    "llama-3.1-8b-instant": {"requests_per_minute": 30, "tokens_per_minute": 6000},
+    DEFAULT_MODEL: {"requests_per_minute": 30, "tokens_per_minute": 6000}
+}
+
+# After this many budget misses in a row a model is tried last for its question type
+DEMOTE_AFTER = 2
+
+
+class TokenBucket:
+    """Client-side rate limiter refilled continuously at rate_per_minute"""
+
+    def __init__(self, rate_per_minute):
+        self.capacity = float(rate_per_minute)
+        self.tokens = float(rate_per_minute)
+        self.rate = rate_per_minute / 60.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """Seconds until amount tokens are available"""
+        with self.lock:
+            self._refill()
+            amount = min(amount, self.capacity)
+            return max(0.0, (amount - self.tokens) / self.rate)
+
+    def take(self, amount):
+        with self.lock:
+            self._refill()
+            self.tokens -= min(amount, self.capacity)
+
+    def drain(self, seconds=0.0):
+        """Empty the bucket (and go into debt for seconds) after the provider rejected a request"""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+class ModelRouter:
+    """Pick a model per question type, escalating when a model misses its latency budget"""
+
+    def __init__(self, llm, routes, rate_limits):
+        # An LLMClient, or a callable returning one so routing decisions don't build the HTTP client
+        self.llm = llm
+        self.routes = routes
+        self.buckets = {}
+        for model, limits in rate_limits.items():
+            self.buckets[model] = (
+                TokenBucket(limits.get('requests_per_minute', 30)),
+                TokenBucket(limits.get('tokens_per_minute', 6000))
+            )
+        self.misses = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, llm, config):
+        routes = dict(DEFAULT_ROUTES)
+        routes.update(config.get('models', {}))
+        rate_limits = dict(DEFAULT_RATE_LIMITS)
+        rate_limits.update(config.get('rate_limits', {}))
+        return cls(llm, routes, rate_limits)
+
+    def route(self, question_type):
+        return self.routes.get(question_type) or self.routes['text']
+
+    def primary_model(self, question_type):
+        """The preferred model, which also identifies cached answers for this question type"""
+        return self.route(question_type)['models'][0]
+
+    def candidates(self, question_type):
+        """Models in preference order, with repeatedly slow ones moved to the back"""
+        models = list(self.route(question_type)['models'])
+        with self.lock:
+            slow = [m for m in models if self.misses.get((question_type, m), 0) >= DEMOTE_AFTER]
+        return [m for m in models if m not in slow] + slow
+
+    def _reserve(self, model, tokens, max_wait):
+        """Take rate-limit capacity for one request, waiting at most max_wait seconds"""
+        buckets = self.buckets.get(model)
+        if not buckets:
+            return True
+        requests, token_bucket = buckets
+        wait = max(requests.wait_time(1), token_bucket.wait_time(tokens))
+        if wait > max_wait:
+            return False
+        if wait > 0:
+            logger.info(f"Rate limit: waiting {wait:.1f}s for {model}")
+            time.sleep(wait)
+        requests.take(1)
+        token_bucket.take(tokens)
+        return True
+
+    def _throttle(self, model, seconds):
+        """Make later callers wait instead of hitting the same 429 again"""
+        for bucket in self.buckets.get(model, ()):
+            bucket.drain(seconds)
+        logger.warning(f"{model} is rate limited by the provider; throttling for {seconds:.0f}s+")
+
+    def _note_latency(self, question_type, model, latency, budget):
+        key = (question_type, model)
+        with self.lock:
+            if latency > budget:
+                self.misses[key] = self.misses.get(key, 0) + 1
+                logger.warning(
+                    f"{model} took {latency:.1f}s for a {question_type} question "
+                    f"(budget {budget}s, {self.misses[key]} misses in a row)"
+                )
+            else:
+                self.misses[key] = 0
+
+    def complete(self, question_type, prompt, temperature, stop_when=None):
+        """Answer with the first model that has capacity and responds within its budget"""
+        route = self.route(question_type)
+        budget = route.get('budget_seconds', 30)
+        models = self.candidates(question_type)
+        estimated_tokens = len(prompt) // 4 + 256
+        last_error = None
+
+        for position, model in enumerate(models):
+            is_last = position == len(models) - 1
+            # Only the last resort waits out its rate limit; earlier models are skipped instead
+            if not self._reserve(model, estimated_tokens, float("inf") if is_last else 0.0):
+                logger.info(f"{model} is at its rate limit, escalating")
+                continue
+            # Earlier models must answer within the budget; the last resort gets the client's full deadline
+            deadline = None if is_last else time.monotonic() + budget
+            try:
+                llm = self.llm() if callable(self.llm) else self.llm
+                result = llm.complete(prompt, model, temperature, stop_when=stop_when, deadline=deadline)
+            except LLMError as e:
+                last_error = e
+                if getattr(e.__cause__, "status_code", None) == 429:
+                    self._throttle(model, retry_after(e.__cause__) or 0.0)
+                self._note_latency(question_type, model, budget + 1, budget)
+                logger.warning(f"{model} failed for {question_type} question, escalating: {e}")
+                continue
+            self._note_latency(question_type, model, result.latency, budget)
+            return result
+
+        raise LLMError(f"No model answered the {question_type} question: {last_error or 'all models rate limited'}")
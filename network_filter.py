@@ -0,0 +1,105 @@
+import fnmatch
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BROWSER = {
+    "headless": False,
+    "block_resource_types": [],
+    "block_url_patterns": [],
+    "allow_url_patterns": [],
+    # Keep the browser open this long after a run so the final page can be inspected
+    "debug_hold_seconds": 0,
+    # Typical transfer sizes used to estimate what blocked requests would have cost
+    "estimated_bytes": {
+        "image": 50000,
+        "font": 40000,
+        "media": 500000,
+        "stylesheet": 30000,
+        "script": 60000,
+        "other": 10000
+    }
+}
+
+
+def browser_settings(config):
+    settings = dict(DEFAULT_BROWSER)
+    settings.update(config.get('browser', {}))
+    return settings
+
+
+class RequestBlocker:
+    """Route handler that aborts heavy or irrelevant requests and counts what was saved"""
+
+    def __init__(self, settings):
+        self.block_types = set(settings['block_resource_types'])
+        self.block_patterns = settings['block_url_patterns']
+        self.allow_patterns = settings['allow_url_patterns']
+        self.estimated_bytes = settings['estimated_bytes']
+        self.blocked = {}
+        self.allowed_requests = 0
+        self.loaded_bytes = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a blocker from the 'browser' config section, or None if nothing is blocked"""
+        settings = browser_settings(config)
+        if not settings['block_resource_types'] and not settings['block_url_patterns']:
+            return None
+        return cls(settings)
+
+    def should_block(self, url, resource_type):
+        # Allow patterns win so the quiz iframe's own assets are never cut off
+        if any(fnmatch.fnmatch(url, pattern) for pattern in self.allow_patterns):
+            return False
+        if resource_type in self.block_types:
+            return True
+        return any(fnmatch.fnmatch(url, pattern) for pattern in self.block_patterns)
+
+    def _decide(self, request):
+        if self.should_block(request.url, request.resource_type):
+            self.blocked[request.resource_type] = self.blocked.get(request.resource_type, 0) + 1
+            return False
+        self.allowed_requests += 1
+        return True
+
+    def handle(self, route):
+        """Sync route handler for context.route"""
+        if self._decide(route.request):
+            route.continue_()
+        else:
+            route.abort()
+
+    async def handle_async(self, route):
+        """Async route handler for context.route"""
+        if self._decide(route.request):
+            await route.continue_()
+        else:
+            await route.abort()
+
+    def on_response(self, response):
+        length = response.headers.get('content-length')
+        if length and length.isdigit():
+            self.loaded_bytes += int(length)
+
+    def install(self, context):
+        context.route("**/*", self.handle)
+        context.on("response", self.on_response)
+
+    async def install_async(self, context):
+        await context.route("**/*", self.handle_async)
+        context.on("response", self.on_response)
+
+    def report(self):
+        """Log blocked requests per type and the estimated bytes saved"""
+        blocked_requests = sum(self.blocked.values())
+        saved = sum(
+            count * self.estimated_bytes.get(kind, self.estimated_bytes.get('other', 0))
+            for kind, count in self.blocked.items()
+        )
+        breakdown = ", ".join(f"{kind}={count}" for kind, count in sorted(self.blocked.items())) or "none"
+        logger.info(
+            f"Request blocking: {blocked_requests} requests blocked ({breakdown}), "
+            f"~{saved / 1e6:.1f} MB saved (estimated); {self.allowed_requests} requests allowed, "
+            f"{self.loaded_bytes / 1e6:.1f} MB loaded"
+        )
@@ -0,0 +1,97 @@
+import logging
+from dataclasses import dataclass, field
+
+from button_resolver import CLICKABLE_SELECTOR, DESCRIBE_CLICKABLE_JS, control_names
+from editors import EDITOR_ADAPTERS, EDITOR_SELECTOR
+
+logger = logging.getLogger(__name__)
+
+TEXT_INPUT_SELECTOR = "input[type='text'], textarea"
+
+# Reads everything solve_quiz needs to decide how to handle a question in one evaluate call:
+# checkbox/text-input counts, the first visible editor kind and every clickable control.
+CLASSIFY_PAGE_JS = f"""
+(args) => {{
+    const describe = {DESCRIBE_CLICKABLE_JS};
+    const visible = el => {{
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    }};
+    let editor = null;
+    for (const [kind, selector] of args.editors) {{
+        if (Array.from(document.querySelectorAll(selector)).some(visible)) {{
+            editor = kind;
+            break;
+        }}
+    }}
+    return {{
+        checkboxes: document.querySelectorAll("input[type='checkbox']").length,
+        text_inputs: document.querySelectorAll(args.text_inputs).length,
+        editor: editor,
+        editor_present: document.querySelectorAll(args.editor_selector).length > 0,
+        clickables: Array.from(document.querySelectorAll(args.clickable)).map(describe)
+    }};
+}}
+"""
+
+
+@dataclass
+class PageState:
+    question_type: str
+    checkbox_count: int
+    text_input_count: int
+    editor_kind: str = None
+    submit: dict = None
+    next: dict = None
+    clickables: list = field(default_factory=list)
+
+    @property
+    def has_submit(self):
+        return self.submit is not None
+
+
+def classify_args():
+    return {
+        "editors": [[kind, adapter.selector] for kind, adapter in EDITOR_ADAPTERS.items()],
+        "editor_selector": EDITOR_SELECTOR,
+        "text_inputs": TEXT_INPUT_SELECTOR,
+        "clickable": CLICKABLE_SELECTOR
+    }
+
+
+def page_state(evaluated, config, resolver):
+    """Turn the classifier script's output into a PageState.
+
+    Checkboxes win over editors, which win over plain text inputs, the same
+    precedence the per-element checks used.
+    """
+    if evaluated['checkboxes']:
+        question_type = "multiple_choice"
+    elif evaluated['editor_present']:
+        question_type = "coding"
+    else:
+        question_type = "text"
+    clickables = evaluated['clickables']
+    # Submit only has to exist (it may stay disabled until an answer is entered); Next must be usable
+    submit = resolver.match(clickables, *control_names(config, submit_mode=True), include_disabled=True)
+    next_control = resolver.match(clickables, *control_names(config, submit_mode=False))
+    state = PageState(
+        question_type, evaluated['checkboxes'], evaluated['text_inputs'], evaluated['editor'],
+        submit, next_control, clickables
+    )
+    logger.info(
+        f"Page state: {state.question_type}, {state.checkbox_count} checkboxes, "
+        f"{state.text_input_count} text inputs, editor={state.editor_kind}, "
+        f"submit={'yes' if state.submit else 'no'}, next={'yes' if state.next else 'no'}"
+    )
+    return state
+
+
+def classify_page(frame, config, resolver):
+    """Classify the question shown in the frame with a single round-trip"""
+    return page_state(frame.evaluate(CLASSIFY_PAGE_JS, classify_args()), config, resolver)
+
+
+async def classify_page_async(frame, config, resolver):
+    """Async counterpart of classify_page for playwright.async_api frames"""
+    return page_state(await frame.evaluate(CLASSIFY_PAGE_JS, classify_args()), config, resolver)
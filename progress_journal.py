@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressJournal:
+    """Append-only JSON-lines record of completed units, subtopics, quizzes and questions"""
+
+    def __init__(self, path, course):
+        self.path = path
+        self.course = course
+        self.entries = self.load()
+        if self.entries:
+            logger.info(f"Loaded {len(self.entries)} progress entries for {course} from {path}")
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the journal from the 'journal' config section, or return None if disabled"""
+        settings = config.get('journal', {})
+        if not settings.get('enabled', True):
+            return None
+        return cls(settings.get('path', "progress_journal.jsonl"), config['course_name'])
+
+    def load(self):
+        """Read entries for this course, ignoring a torn last line from an interrupted write"""
+        entries = []
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping incomplete journal line in {self.path}")
+                    continue
+                if entry.get("course") == self.course:
+                    entries.append(entry)
+        return entries
+
+    def record(self, event, unit, subtopic=None, quiz=None, question=None):
+        """Append one completed step and fsync it before returning"""
+        entry = {
+            "time": time.time(),
+            "course": self.course,
+            "event": event,
+            "unit": unit,
+            "subtopic": subtopic,
+            "quiz": quiz,
+            "question": question
+        }
+        line = (json.dumps(entry) + "\n").encode('utf-8')
+        if self._torn_tail():
+            line = b"\n" + line
+        # A single O_APPEND write either lands whole or leaves a torn line that load() skips
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self.entries.append(entry)
+
+    def _torn_tail(self):
+        """True if the file ends mid-line, so the next entry must start on a fresh line"""
+        try:
+            with open(self.path, 'rb') as file:
+                file.seek(-1, os.SEEK_END)
+                return file.read(1) != b"\n"
+        except OSError:
+            return False
+
+    def reset(self):
+        """Forget progress for this course, keeping entries for other courses"""
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as file:
+                kept = [line for line in file if f'"course": {json.dumps(self.course)}' not in line]
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                file.writelines(kept)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.path)
+        self.entries = []
+        logger.info(f"Reset progress journal for {self.course}")
+
+    def _has(self, event, **fields):
+        return any(
+            entry["event"] == event and all(entry.get(k) == v for k, v in fields.items())
+            for entry in self.entries
+        )
+
+    def unit_done(self, unit):
+        return self._has("unit", unit=unit)
+
+    def quiz_done(self, unit, subtopic, quiz):
+        return self._has("quiz", unit=unit, subtopic=subtopic, quiz=quiz)
+
+    def subtopic_done(self, unit, subtopic):
+        return self._has("subtopic", unit=unit, subtopic=subtopic)
+
+    def questions_done(self, unit, subtopic, quiz):
+        """Highest question index completed in a quiz"""
+        return max(
+            (entry["question"] for entry in self.entries
+             if entry["event"] == "question" and entry["unit"] == unit
+             and entry["subtopic"] == subtopic and entry["quiz"] == quiz),
+            default=0
+        )
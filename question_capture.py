@@ -0,0 +1,189 @@
+import fnmatch
+import json
+import logging
+import re
+import time
+
+from question_extractor import format_question
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPTURE = {
+    "enabled": False,
+    # Glob patterns for the XHR/fetch responses that carry the current question
+    "url_patterns": ["*/api/*question*"],
+    # Where each field sits in the JSON payload: dot-separated keys, list indices and [*] to map over a list
+    "paths": {
+        "stem": "question.text",
+        "options": "question.options[*].text",
+        "type": "question.type",
+        "code_template": "question.template"
+    },
+    # Platform type names mapped onto multiple_choice / text / coding
+    "type_map": {
+        "mcq": "multiple_choice",
+        "multiple_choice": "multiple_choice",
+        "checkbox": "multiple_choice",
+        "text": "text",
+        "short_answer": "text",
+        "coding": "coding",
+        "code": "coding",
+        "program": "coding"
+    },
+    # Payloads older than this are not trusted to describe the question on screen
+    "max_age_seconds": 60
+}
+
+PATH_TOKEN = re.compile(r"([^.\[\]]+)|\[(\d+|\*)\]")
+
+
+def capture_settings(config):
+    settings = dict(DEFAULT_CAPTURE)
+    settings.update(config.get('question_capture', {}))
+    return settings
+
+
+def json_path(data, path):
+    """Value at a path such as 'data.question.options[*].label', or None if any step is missing"""
+    if not path:
+        return None
+    tokens = PATH_TOKEN.findall(path)
+
+    def walk(value, index):
+        if index == len(tokens):
+            return value
+        key, subscript = tokens[index]
+        if subscript == "*":
+            if not isinstance(value, list):
+                return None
+            return [walk(item, index + 1) for item in value]
+        if subscript:
+            position = int(subscript)
+            if not isinstance(value, list) or position >= len(value):
+                return None
+            return walk(value[position], index + 1)
+        if not isinstance(value, dict) or key not in value:
+            return None
+        return walk(value[key], index + 1)
+
+    return walk(data, 0)
+
+
+def strip_markup(text):
+    """Question payloads often carry HTML; the prompt only needs the text"""
+    text = re.sub(r"<br\s*/?>|</p>|</li>", "\n", str(text), flags=re.I)
+    text = re.sub(r"<[^>]+>", "", text)
+    return re.sub(r"[ \t]+", " ", text.replace("&nbsp;", " ").replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")).strip()
+
+
+class QuestionCapture:
+    """Build the current question from the quiz player's JSON responses, as soon as they arrive.
+
+    take() returns a question dict in the shape extract_question produces, or None so the
+    caller falls back to DOM scraping.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.latest = None  # (arrival time, url, parsed payload or unread sync Response)
+        self.captured = 0
+        self.fallbacks = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the capture from the 'question_capture' config section, or return None if disabled"""
+        settings = capture_settings(config)
+        if not settings['enabled']:
+            return None
+        return cls(settings)
+
+    def matches(self, response):
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return False
+        return any(fnmatch.fnmatch(response.url, pattern) for pattern in self.settings['url_patterns'])
+
+    def install(self, page):
+        def on_response(response):
+            # Only remember the response here: reading the body inside a sync event handler stalls the dispatcher
+            if self.matches(response):
+                self._arrived(response.url, response)
+
+        page.on("response", on_response)
+
+    def install_async(self, page):
+        async def on_response(response):
+            if self.matches(response):
+                try:
+                    self._arrived(response.url, await response.json())
+                except Exception as e:
+                    logger.debug(f"Unreadable question payload from {response.url}: {e}")
+
+        page.on("response", on_response)
+
+    def _arrived(self, url, payload):
+        self.latest = (time.monotonic(), url, payload)
+
+    def build(self, payload):
+        """Structured question from a payload, or None when the stem is missing"""
+        paths = self.settings['paths']
+        stem = json_path(payload, paths.get('stem'))
+        if not stem:
+            return None
+        options = json_path(payload, paths.get('options')) or []
+        if not isinstance(options, list):
+            options = [options]
+        template = json_path(payload, paths.get('code_template'))
+        raw_type = json_path(payload, paths.get('type'))
+        question = {
+            "stem": strip_markup(stem),
+            "options": [strip_markup(option) for option in options if option is not None],
+            "code": [str(template)] if template else [],
+            "type": self.settings['type_map'].get(str(raw_type).lower()) if raw_type is not None else None,
+            "source": "network",
+            "page_text": json.dumps(payload, ensure_ascii=False)
+        }
+        question['text'] = format_question(question)
+        return question
+
+    def _finish(self, payload, url, state, min_chars):
+        question = self.build(payload) if payload is not None else None
+        if question is None or len(question['stem']) < min_chars:
+            logger.info(f"No usable question in the payload from {url}, scraping the page")
+            self.fallbacks += 1
+            return None
+        if question['type'] and state and question['type'] != state.question_type:
+            logger.warning(f"Payload says {question['type']} but the page looks like {state.question_type}")
+        if state and state.question_type == "multiple_choice" and len(question['options']) != state.checkbox_count:
+            logger.warning(
+                f"Payload lists {len(question['options'])} options but the page shows {state.checkbox_count} "
+                "checkboxes, scraping the page instead"
+            )
+            self.fallbacks += 1
+            return None
+        self.captured += 1
+        logger.info(f"Question captured from {url}: {len(question['text'])} characters")
+        return question
+
+    def take(self, state=None, min_chars=20):
+        """The question from the latest matching response since the last take, or None"""
+        if self.latest is None:
+            self.fallbacks += 1
+            return None
+        arrived, url, payload = self.latest
+        self.latest = None
+        if time.monotonic() - arrived > self.settings['max_age_seconds']:
+            self.fallbacks += 1
+            return None
+        if hasattr(payload, "json"):
+            # A sync Response whose body was left unread by install()
+            try:
+                payload = payload.json()
+            except Exception as e:
+                logger.debug(f"Unreadable question payload from {url}: {e}")
+                payload = None
+        return self._finish(payload, url, state, min_chars)
+
+    def summary(self):
+        total = self.captured + self.fallbacks
+        if total:
+            logger.info(f"Questions from network payloads: {self.captured}/{total} ({self.fallbacks} scraped from the page)")
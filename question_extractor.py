@@ -0,0 +1,116 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SELECTORS = {
+    "stem": [".question-text", ".question-stem", ".question", "[class*='question']"],
+    "options": [".option", ".choice", "[class*='option']"],
+    "code": ["pre", ".sample-input", ".sample-output", "[class*='sample']"]
+}
+
+# Isolates the question stem, options and code/sample blocks in one evaluate call.
+# Options are taken from the checkbox labels first so their numbering matches the
+# checkbox indices used by handle_quiz_question.
+EXTRACT_QUESTION_JS = """
+(sel) => {
+    const visible = el => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    const textOf = el => (el.innerText || el.textContent || '').trim();
+    const outermost = els => els.filter(el => !els.some(other => other !== el && other.contains(el)));
+    const pick = list => {
+        for (const selector of list) {
+            let els = [];
+            try { els = Array.from(document.querySelectorAll(selector)).filter(visible); } catch (e) {}
+            if (els.length) return outermost(els);
+        }
+        return [];
+    };
+    const boilerplate = 'nav, header, footer, aside, script, style, noscript, button, [role="navigation"]';
+    const editors = '.CodeMirror, .ace_editor, textarea, [contenteditable="true"]';
+
+    const checkboxes = Array.from(document.querySelectorAll("input[type='checkbox']"));
+    const labelFor = cb => (cb.labels && cb.labels[0]) || cb.closest('label') || cb.parentElement;
+    const optionEls = checkboxes.length ? checkboxes.map(labelFor) : pick(sel.options);
+    const options = optionEls.map(el => el ? textOf(el) : '');
+
+    let source = 'selectors';
+    let stem = pick(sel.stem).map(textOf).join('\\n').trim();
+    if (!stem) {
+        source = 'heuristic';
+        const anchor = checkboxes[0] ||
+            document.querySelector(editors + ", input[type='text'], input:not([type])");
+        const optionLength = options.join('').length;
+        let region = anchor ? anchor.parentElement : null;
+        while (region && region.parentElement && region.parentElement !== document.body &&
+               textOf(region).length < optionLength + 40) {
+            region = region.parentElement;
+        }
+        if (!region) {
+            source = 'page';
+            region = document.body;
+        }
+        const clone = region.cloneNode(true);
+        clone.querySelectorAll(boilerplate + ', ' + editors + ', label').forEach(el => el.remove());
+        stem = (clone.innerText || clone.textContent || '').trim();
+    }
+
+    const code = pick(sel.code)
+        .filter(el => !el.closest(editors))
+        .map(textOf)
+        .filter(text => text && !stem.includes(text));
+
+    return {
+        stem: stem,
+        options: options,
+        code: code,
+        source: source,
+        page_text: document.body.innerText
+    };
+}
+"""
+
+
+def format_question(question):
+    """Render an extracted question as compact prompt text"""
+    parts = [f"Question:\n{question['stem']}"]
+    if question['options']:
+        lines = [f"{idx}. {text}" for idx, text in enumerate(question['options'], start=1)]
+        parts.append("Options:\n" + "\n".join(lines))
+    if question['code']:
+        parts.append("Code / sample I/O:\n" + "\n\n".join(question['code']))
+    return "\n\n".join(parts)
+
+
+def question_selectors(config):
+    """Default selectors overridden by the 'question_selectors' config section"""
+    selectors = dict(DEFAULT_SELECTORS)
+    selectors.update(config.get('question_selectors', {}))
+    return selectors
+
+
+def finish_question(question, config):
+    """Choose the prompt text for an evaluated question and log the size reduction"""
+    min_chars = config.get('min_question_chars', 20)
+    if len(question['stem']) < min_chars:
+        logger.warning(f"Question extraction found only {len(question['stem'])} characters, using full page text")
+        question['source'] = 'page'
+        question['text'] = question['page_text']
+    else:
+        question['text'] = format_question(question)
+
+    before, after = len(question['page_text']), len(question['text'])
+    saved = 100 * (before - after) / before if before else 0
+    logger.info(f"Question extracted via {question['source']}: {before} -> {after} characters ({saved:.0f}% smaller)")
+    return question
+
+
+def extract_question(frame, config):
+    """Extract the question region from the frame.
+
+    Returns a dict with stem, options, code, source, page_text and text, where
+    text is what should be sent to the LLM. Falls back to the whole page text
+    when nothing usable is found.
+    """
+    return finish_question(frame.evaluate(EXTRACT_QUESTION_JS, question_selectors(config)), config)
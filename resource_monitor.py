@@ -0,0 +1,152 @@
+import logging
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESOURCES = {
+    "enabled": True,
+    # Recycle once the quiz page's JS heap or the browser's total RSS passes these (0 disables a limit)
+    "max_heap_mb": 512,
+    "max_rss_mb": 2048,
+    # Also recycle after this many quizzes regardless of memory (0 = only on the limits above)
+    "recycle_every": 0,
+    # "page" opens a fresh tab; "context" also drops the context's caches, keeping cookies and storage
+    "recycle": "context"
+}
+
+
+def resource_settings(config):
+    settings = dict(DEFAULT_RESOURCES)
+    settings.update(config.get('resources', {}))
+    return settings
+
+
+def read_rss_mb(pid):
+    """Resident set size of a process from /proc, or None where that is unavailable"""
+    try:
+        with open(f"/proc/{pid}/status", 'r') as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+@dataclass
+class ResourceSample:
+    heap_mb: float = None  # JSHeapUsedSize of the automated page
+    rss_mb: float = None  # summed over the browser, renderer, GPU and utility processes
+    processes: int = 0
+
+
+class ResourceMonitor:
+    """Sample renderer heap and browser RSS over CDP after each quiz and decide when to recycle"""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.page_session = None
+        self.browser_session = None
+        self.quizzes = 0
+        self.recycles = 0
+        self.peak = ResourceSample(0.0, 0.0)
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the monitor from the 'resources' config section, or return None if disabled"""
+        settings = resource_settings(config)
+        if not settings['enabled']:
+            return None
+        return cls(settings)
+
+    def attach(self, browser, page):
+        """Open CDP sessions for a new page; CDP is Chromium-only, so other browsers just go unsampled"""
+        try:
+            self.page_session = page.context.new_cdp_session(page)
+            self.page_session.send("Performance.enable")
+            if self.browser_session is None:
+                self.browser_session = browser.new_browser_cdp_session()
+        except Exception as e:
+            logger.warning(f"Resource sampling unavailable: {e}")
+            self.page_session = None
+
+    async def attach_async(self, browser, page):
+        try:
+            self.page_session = await page.context.new_cdp_session(page)
+            await self.page_session.send("Performance.enable")
+            if self.browser_session is None:
+                self.browser_session = await browser.new_browser_cdp_session()
+        except Exception as e:
+            logger.warning(f"Resource sampling unavailable: {e}")
+            self.page_session = None
+
+    def _sample(self, metrics, process_info):
+        sample = ResourceSample()
+        for metric in (metrics or {}).get('metrics', []):
+            if metric['name'] == "JSHeapUsedSize":
+                sample.heap_mb = metric['value'] / (1024 * 1024)
+        rss = [read_rss_mb(process['id']) for process in (process_info or {}).get('processInfo', [])]
+        rss = [value for value in rss if value is not None]
+        if rss:
+            sample.rss_mb = sum(rss)
+            sample.processes = len(rss)
+        self.peak.heap_mb = max(self.peak.heap_mb, sample.heap_mb or 0.0)
+        self.peak.rss_mb = max(self.peak.rss_mb, sample.rss_mb or 0.0)
+        return sample
+
+    def sample(self):
+        if self.page_session is None:
+            return ResourceSample()
+        try:
+            metrics = self.page_session.send("Performance.getMetrics")
+            process_info = self.browser_session.send("SystemInfo.getProcessInfo") if self.browser_session else None
+        except Exception as e:
+            logger.warning(f"Resource sample failed: {e}")
+            return ResourceSample()
+        return self._sample(metrics, process_info)
+
+    async def sample_async(self):
+        if self.page_session is None:
+            return ResourceSample()
+        try:
+            metrics = await self.page_session.send("Performance.getMetrics")
+            process_info = await self.browser_session.send("SystemInfo.getProcessInfo") if self.browser_session else None
+        except Exception as e:
+            logger.warning(f"Resource sample failed: {e}")
+            return ResourceSample()
+        return self._sample(metrics, process_info)
+
+    def reason(self, sample):
+        """Why the page should be recycled now, or None"""
+        limits = self.settings
+        if limits['max_heap_mb'] and sample.heap_mb and sample.heap_mb > limits['max_heap_mb']:
+            return f"JS heap {sample.heap_mb:.0f} MB > {limits['max_heap_mb']} MB"
+        if limits['max_rss_mb'] and sample.rss_mb and sample.rss_mb > limits['max_rss_mb']:
+            return f"browser RSS {sample.rss_mb:.0f} MB > {limits['max_rss_mb']} MB"
+        if limits['recycle_every'] and self.quizzes >= limits['recycle_every']:
+            return f"{self.quizzes} quizzes since the last recycle"
+        return None
+
+    def _after_quiz(self, sample, label):
+        self.quizzes += 1
+        heap = f"{sample.heap_mb:.0f} MB" if sample.heap_mb is not None else "n/a"
+        rss = f"{sample.rss_mb:.0f} MB in {sample.processes} processes" if sample.rss_mb is not None else "n/a"
+        logger.info(f"{label}Resources after quiz: JS heap {heap}, browser RSS {rss}")
+        return self.reason(sample)
+
+    def after_quiz(self, label=""):
+        """Count a finished quiz and sample; returns the recycle reason, if any"""
+        return self._after_quiz(self.sample(), label)
+
+    async def after_quiz_async(self, label=""):
+        return self._after_quiz(await self.sample_async(), label)
+
+    def recycled(self):
+        self.quizzes = 0
+        self.recycles += 1
+
+    def summary(self, label=""):
+        logger.info(
+            f"{label}Peak JS heap {self.peak.heap_mb:.0f} MB, peak browser RSS {self.peak.rss_mb:.0f} MB, "
+            f"{self.recycles} recycles"
+        )
@@ -0,0 +1,42 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RunReport:
+    """End-of-run flushing and summaries shared by the sync and async automations.
+
+    Subclasses provide self.config, self.answer_cache, self.request_blocker, self.strategy_stats,
+    self.transitions and self.tracer, plus _llm from QuizAnswers.
+    """
+
+    def export_trace(self):
+        """Write the trace file and log the per-phase summary"""
+        self.tracer.summary()
+        trace_path = self.config.get('trace', {}).get('path', "quiz_trace.json")
+        if self.tracer.enabled and trace_path:
+            self.tracer.export(trace_path)
+
+    def report(self, monitors=(), captures=()):
+        """Flush caches and stats and log the run summaries.
+
+        monitors are (log label, ResourceMonitor or None) pairs, captures QuestionCapture or None.
+        """
+        if self.answer_cache:
+            self.answer_cache.close()
+        if self.request_blocker:
+            self.request_blocker.report()
+        if self.strategy_stats:
+            self.strategy_stats.save()
+            logger.info("Strategy stats:\n" + self.strategy_stats.report())
+        for label, monitor in monitors:
+            if monitor:
+                monitor.summary(label)
+        for capture in captures:
+            if capture:
+                capture.summary()
+        self.transitions.summary()
+        if self._llm:
+            # Only a client that was built has anything to report; building one here would defeat the lazy init
+            self._llm.summary()
+        self.export_trace()
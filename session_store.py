@@ -0,0 +1,64 @@
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION = {
+    "enabled": True,
+    "path": "session_state.json",
+    "max_age_hours": 12,
+    "check_timeout": 10000
+}
+
+
+def session_settings(config):
+    settings = dict(DEFAULT_SESSION)
+    settings.update(config.get('session', {}))
+    return settings
+
+
+def load_session(config):
+    """Return the saved session for this course, or None if missing, stale or disabled"""
+    settings = session_settings(config)
+    if not settings['enabled'] or not os.path.exists(settings['path']):
+        return None
+    try:
+        with open(settings['path'], 'r') as file:
+            session = json.load(file)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable session file {settings['path']}: {e}")
+        return None
+    age_hours = (time.time() - session.get('saved_at', 0)) / 3600
+    if session.get('course_name') != config['course_name'] or age_hours > settings['max_age_hours']:
+        logger.info("Saved session is for another course or too old, ignoring it")
+        return None
+    logger.info(f"Found saved session from {age_hours:.1f} hours ago")
+    return session
+
+
+def save_session(storage_state, course_url, config):
+    """Persist cookies/local storage and the course URL, readable only by the current user"""
+    settings = session_settings(config)
+    if not settings['enabled']:
+        return
+    session = {
+        "saved_at": time.time(),
+        "course_name": config['course_name'],
+        "course_url": course_url,
+        "storage_state": storage_state
+    }
+    tmp_path = settings['path'] + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as file:
+        json.dump(session, file)
+    os.replace(tmp_path, settings['path'])
+    logger.info(f"Saved session to {settings['path']}")
+
+
+def clear_session(config):
+    settings = session_settings(config)
+    if os.path.exists(settings['path']):
+        os.remove(settings['path'])
+        logger.info("Removed expired session")
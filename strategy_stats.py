@@ -0,0 +1,186 @@
+import json
+import logging
+import os
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STRATEGY_STATS = {
+    "enabled": True,
+    "path": "strategy_stats.json",
+    # Strategies that have failed this many times without ever succeeding are flagged in the report
+    "stale_after": 5,
+    # Write the stats to disk at most this often during a run, so a crash loses little
+    "save_every_seconds": 30
+}
+
+
+def stats_settings(config):
+    settings = dict(DEFAULT_STRATEGY_STATS)
+    settings.update(config.get('strategy_stats', {}))
+    return settings
+
+
+class StrategyStats:
+    """Success rate and latency of each fallback strategy per action, persisted between runs"""
+
+    def __init__(self, path, stale_after=5, save_every_seconds=30):
+        self.path = path
+        self.stale_after = stale_after
+        self.save_every_seconds = save_every_seconds
+        self.actions = self.load()
+        self.saved_at = time.monotonic()
+        self.dirty = False
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the stats from the 'strategy_stats' config section, or return None if disabled"""
+        settings = stats_settings(config)
+        if not settings['enabled']:
+            return None
+        return cls(settings['path'], settings['stale_after'], settings['save_every_seconds'])
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable strategy stats {self.path}: {e}")
+            return {}
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.actions, file, indent=2)
+        os.replace(tmp_path, self.path)
+        self.saved_at = time.monotonic()
+        self.dirty = False
+
+    def checkpoint(self):
+        """Save if there is anything new and the last save is older than save_every_seconds"""
+        if self.dirty and time.monotonic() - self.saved_at >= self.save_every_seconds:
+            try:
+                self.save()
+            except OSError as e:
+                logger.warning(f"Could not save strategy stats to {self.path}: {e}")
+
+    def record(self, action, strategy, success, seconds):
+        entry = self.actions.setdefault(action, {}).setdefault(
+            strategy, {"attempts": 0, "successes": 0, "seconds": 0.0, "last_success": None}
+        )
+        entry["attempts"] += 1
+        entry["seconds"] += seconds
+        if success:
+            entry["successes"] += 1
+            entry["last_success"] = time.time()
+        self.dirty = True
+
+    def record_run(self, action, attempts, winner):
+        """Record one run_strategies call; nothing is learned when no strategy worked.
+
+        If the target was not on the page at all every strategy fails, which says nothing
+        about which selector finds it when it is there.
+        """
+        if winner is None:
+            return
+        for name, seconds in attempts:
+            self.record(action, name, name == winner, seconds)
+        self.checkpoint()
+
+    def expected_cost(self, entry):
+        """Seconds spent per success: mean attempt time divided by the success rate"""
+        return (entry["seconds"] / entry["attempts"]) / (entry["successes"] / entry["attempts"])
+
+    def order(self, action, strategies):
+        """Proven strategies cheapest first, then untried ones, then ones that never worked.
+
+        Ties and untried strategies keep the order they were given in.
+        """
+        history = self.actions.get(action, {})
+
+        def rank(item):
+            position, (name, _) = item
+            entry = history.get(name)
+            if entry is None:
+                return (1, position)
+            if entry["successes"] == 0:
+                return (2, position)
+            return (0, self.expected_cost(entry), position)
+
+        return [strategy for _, strategy in sorted(enumerate(strategies), key=rank)]
+
+    def report(self):
+        """Per-action table; strategies that keep failing usually mean a stale selector in config.json"""
+        if not self.actions:
+            return "No strategy stats recorded yet"
+        lines = [f"{'action':<24}{'strategy':<22}{'tries':>7}{'ok %':>7}{'s/success':>11}  last success"]
+        for action, strategies in sorted(self.actions.items()):
+            for name, entry in sorted(strategies.items(), key=lambda item: -item[1]["successes"]):
+                rate = 100 * entry["successes"] / entry["attempts"]
+                cost = f"{self.expected_cost(entry):.2f}" if entry["successes"] else "-"
+                if entry["last_success"]:
+                    last = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_success"]))
+                else:
+                    last = "never"
+                if not entry["successes"] and entry["attempts"] >= self.stale_after:
+                    last += "  <- stale?"
+                lines.append(f"{action:<24}{name:<22}{entry['attempts']:>7}{rate:>7.0f}{cost:>11}  {last}")
+        return "\n".join(lines)
+
+
+def run_strategies(stats, action, strategies):
+    """Try (name, callable) strategies until one returns True, fastest known-good first.
+
+    Returns the name of the strategy that worked, or None. Exceptions count as failures.
+    """
+    ordered = stats.order(action, strategies) if stats else strategies
+    attempts = []
+    winner = None
+    for name, strategy in ordered:
+        started = time.perf_counter()
+        try:
+            success = bool(strategy())
+        except Exception as e:
+            logger.warning(f"{action}: strategy {name} failed: {e}")
+            success = False
+        attempts.append((name, time.perf_counter() - started))
+        if success:
+            winner = name
+            break
+    if stats:
+        stats.record_run(action, attempts, winner)
+    return winner
+
+
+async def run_strategies_async(stats, action, strategies):
+    """run_strategies for (name, coroutine function) strategies"""
+    ordered = stats.order(action, strategies) if stats else strategies
+    attempts = []
+    winner = None
+    for name, strategy in ordered:
+        started = time.perf_counter()
+        try:
+            success = bool(await strategy())
+        except Exception as e:
+            logger.warning(f"{action}: strategy {name} failed: {e}")
+            success = False
+        attempts.append((name, time.perf_counter() - started))
+        if success:
+            winner = name
+            break
+    if stats:
+        stats.record_run(action, attempts, winner)
+    return winner
+
+
+def main(argv=None):
+    """Print the strategy report for a stats file (default strategy_stats.json)"""
+    argv = sys.argv[1:] if argv is None else argv
+    print(StrategyStats(argv[0] if argv else DEFAULT_STRATEGY_STATS['path']).report())
+
+
+if __name__ == "__main__":
+    main()
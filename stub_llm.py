@@ -0,0 +1,60 @@
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+
+class StubGroq:
+    """Offline stand-in for the Groq client with configurable latency.
+
+    Answers "1" to quiz prompts and a small sum program to code prompts, and
+    keeps call counts and total simulated latency for the benchmark report.
+    """
+
+    def __init__(self, latency=0.5, jitter=0.1, code_marker="coding expert", seed=7):
+        self.latency = latency
+        self.jitter = jitter
+        self.code_marker = code_marker
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.total_latency = 0.0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def respond(self, prompt):
+        if self.code_marker in prompt:
+            return "a, b = map(int, input().split())\nprint(a + b)"
+        # Trailing explanation lets streaming clients show they stop at the option list
+        return "1\nOption 1 matches the expected value; the others are off by one or two."
+
+    def create(self, model, messages, stream=False, **kwargs):
+        prompt = messages[-1]["content"]
+        with self.lock:
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            self.calls += 1
+        content = self.respond(prompt)
+        usage = SimpleNamespace(prompt_tokens=len(prompt) // 4, completion_tokens=len(content) // 4)
+        if stream:
+            return self._stream(content, delay, usage)
+        time.sleep(delay)
+        with self.lock:
+            self.total_latency += delay
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage, model=model)
+
+    def _stream(self, content, delay, usage):
+        """Yield the response word by word: 60% of the latency before the first token, the rest spread out"""
+        pieces = content.split(" ")
+        time.sleep(delay * 0.6)
+        slept = delay * 0.6
+        for index, piece in enumerate(pieces):
+            if index:
+                time.sleep(delay * 0.4 / len(pieces))
+                slept += delay * 0.4 / len(pieces)
+                piece = " " + piece
+            last = index == len(pieces) - 1
+            delta = SimpleNamespace(content=piece)
+            with self.lock:
+                self.total_latency += slept
+            slept = 0.0
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=usage if last else None, x_groq=None)
@@ -0,0 +1,57 @@
+import pytest
+
+from answer_cache import AnswerCache
+from answers import QuizAnswers
+from feedback import FeedbackResult
+
+
+class Answers(QuizAnswers):
+    def __init__(self, cache):
+        self.config = {}
+        self.answer_cache = cache
+
+
+@pytest.fixture
+def answers(tmp_path):
+    cache = AnswerCache(str(tmp_path / "cache.sqlite3"))
+    yield Answers(cache)
+    cache.close()
+
+
+def cached(answers, question_type="coding"):
+    return answers.answer_cache.get(answers.answer_key("Print the sum of two numbers", question_type))
+
+
+def store(answers, response, question_type="coding"):
+    key = answers.answer_key("Print the sum of two numbers", question_type)
+    answers.answer_cache.put(key, "code", "model", response)
+
+
+def test_failed_verdict_drops_cached_answer(answers):
+    store(answers, "print(1)")
+    answers.settle_cached_answer("Print the sum of two numbers", "coding", FeedbackResult("failed"))
+    assert cached(answers) is None
+
+
+def test_failed_quiz_verdict_drops_cached_answer(answers):
+    store(answers, "1, 3", "multiple_choice")
+    answers.settle_cached_answer("Print the sum of two numbers", "multiple_choice", FeedbackResult("error"))
+    assert cached(answers, "multiple_choice") is None
+
+
+def test_passing_fix_replaces_cached_code(answers):
+    store(answers, "print(1)")
+    answers.settle_cached_answer("Print the sum of two numbers", "coding", FeedbackResult("passed"), "print(2)")
+    assert cached(answers) == "print(2)"
+
+
+@pytest.mark.parametrize("status", ["none", "unknown"])
+def test_unconfirmed_fix_is_not_cached(answers, status):
+    store(answers, "print(1)")
+    answers.settle_cached_answer("Print the sum of two numbers", "coding", FeedbackResult(status), "print(2)")
+    assert cached(answers) == "print(1)"
+
+
+def test_answer_key_builds_no_llm_client(answers):
+    answers.answer_key("question", "text")
+    assert answers._llm is None
@@ -0,0 +1,50 @@
+import pytest
+
+from batch import batch_courses, course_config, session_overrides
+
+CONFIG = {
+    "course_name": "Default",
+    "units": ["Unit 1"],
+    "course_navigation": {"partial_match": "Default", "timeout": 5000},
+    "answer_cache": {"enabled": True},
+    "courses": [{"course_name": "Python"}, {"course_name": "C", "partial_match": "C Prog", "units": ["Unit 2"]}]
+}
+
+
+@pytest.mark.parametrize("course, expected", [
+    ({"course_name": "Python"},
+     {"course_name": "Python", "units": [], "partial_match": "Python"}),
+    ({"course_name": "C", "partial_match": "C Prog", "units": ["Unit 2"]},
+     {"course_name": "C", "units": ["Unit 2"], "partial_match": "C Prog"}),
+    ({"course_name": "Java", "answer_cache": {"enabled": False}},
+     {"course_name": "Java", "units": [], "partial_match": "Java", "answer_cache": {"enabled": False}}),
+])
+def test_course_config(course, expected):
+    merged = course_config(CONFIG, course)
+    assert merged["course_name"] == expected["course_name"]
+    assert merged["units"] == expected["units"]
+    assert merged["course_navigation"] == {"partial_match": expected["partial_match"], "timeout": 5000}
+    assert merged["answer_cache"] == expected.get("answer_cache", CONFIG["answer_cache"])
+    assert "courses" not in merged
+    assert "partial_match" not in merged
+
+
+def test_course_config_leaves_base_config_alone():
+    course = {"course_name": "C", "partial_match": "C Prog"}
+    course_config(CONFIG, course)
+    assert CONFIG["course_navigation"]["partial_match"] == "Default"
+    assert course == {"course_name": "C", "partial_match": "C Prog"}
+
+
+def test_batch_courses():
+    assert [course["course_name"] for course in batch_courses(CONFIG)] == ["Python", "C"]
+    assert batch_courses({}) == []
+
+
+@pytest.mark.parametrize("course, overrides", [
+    ({"course_name": "Python", "units": []}, []),
+    ({"course_name": "Python", "browser": {"headless": False}, "trace": {}}, ["browser", "trace"]),
+    ({"course_name": "Python", "answer_cache": {}}, []),
+])
+def test_session_overrides(course, overrides):
+    assert session_overrides(course) == overrides
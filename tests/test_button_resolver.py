@@ -0,0 +1,65 @@
+import pytest
+
+from button_resolver import NEXT_TEXTS, SUBMIT_TEXTS, ButtonResolver, button_names
+
+
+def clickable(index, text, tag="button", label="", visible=True, disabled=False):
+    return {"index": index, "tag": tag, "role": "button", "text": text, "label": label,
+            "visible": visible, "disabled": disabled}
+
+
+CANDIDATES = [
+    clickable(0, "Submit answer", tag="div"),
+    clickable(1, "Submit"),
+    clickable(2, "Next", visible=False),
+    clickable(3, "Continue"),
+    clickable(4, "Run", disabled=True),
+    clickable(5, "", label="Check"),
+]
+
+
+@pytest.mark.parametrize("names, fallback, include_disabled, index", [
+    (["submit"], (), False, 1),
+    (["submit answer"], (), False, 0),
+    (["answer"], (), False, 0),
+    (["next"], NEXT_TEXTS, False, 3),
+    (["run"], (), False, None),
+    (["run"], (), True, 4),
+    (["evaluate"], SUBMIT_TEXTS, False, 1),
+    (["check"], (), False, 5),
+])
+def test_match(names, fallback, include_disabled, index):
+    candidate = ButtonResolver().match(CANDIDATES, names, fallback, include_disabled)
+    assert (candidate["index"] if candidate else None) == index
+
+
+def test_button_names():
+    assert button_names([{"role": "button", "name": " Next "}, "Submit", "", {"role": "button"}]) == ["next", "submit"]
+
+
+class Frame:
+    def __init__(self):
+        self.clicked = []
+
+    def evaluate(self, script, selector):
+        return CANDIDATES
+
+    def locator(self, selector):
+        frame = self
+
+        class Locator:
+            def nth(self, index):
+                return type("Nth", (), {"click": lambda _: frame.clicked.append(index)})()
+
+        return Locator()
+
+
+def test_click_counts_round_trips_per_call():
+    resolver = ButtonResolver()
+    frame = Frame()
+    assert resolver.click(frame, ["continue"])["index"] == 3
+    assert resolver.click(frame, ["submit"])["index"] == 1
+    assert frame.clicked == [3, 1]
+    assert resolver.round_trips == 2
+    assert resolver.click(frame, ["missing"]) is None
+    assert resolver.round_trips == 1
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+import pytest
+
+from answers import parse_quiz_answer, plan_quiz_action
+from cassette import Cassette, load_fixtures, replay
+
+
+@pytest.mark.parametrize("response, answer", [
+    ("The correct options are: 1, 3", "1, 3"),
+    ("Reasoning about option 4...\nCorrect options are: 2", "2"),
+    ("Option 2 and option 4", "2, 4"),
+    ("photosynthesis", "photosynthesis"),
+])
+def test_parse_quiz_answer(response, answer):
+    assert parse_quiz_answer(response) == answer
+
+
+@pytest.mark.parametrize("answer, question_type, checkboxes, inputs, action", [
+    ("1, 3", "multiple_choice", 4, 0, {"kind": "check", "options": [1, 3]}),
+    ("2, 7", "multiple_choice", 4, 0, {"kind": "check", "options": [2]}),
+    ("0, 5", "multiple_choice", 4, 0, {"kind": "skip", "reason": "no option in 1..4 in '0, 5'"}),
+    ("photosynthesis", "text", 0, 1, {"kind": "fill", "text": "photosynthesis"}),
+    ("photosynthesis", "text", 0, 0, {"kind": "skip", "reason": "no text input"}),
+])
+def test_plan_quiz_action(answer, question_type, checkboxes, inputs, action):
+    assert plan_quiz_action(answer, question_type, checkboxes, inputs) == action
+
+
+def record(cassette, page_text, response, question_type="multiple_choice", checkboxes=4, inputs=0):
+    state = SimpleNamespace(question_type=question_type, checkbox_count=checkboxes, text_input_count=inputs)
+    answer = parse_quiz_answer(response)
+    cassette.record(page_text, state, "prompt", response, answer, plan_quiz_action(answer, question_type, checkboxes, inputs))
+
+
+def test_recorded_fixtures_replay_cleanly(tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    cassette = Cassette(path)
+    record(cassette, "Which are prime?", "Correct options are: 2, 3")
+    record(cassette, "Which are prime?", "Correct options are: 2, 3")
+    record(cassette, "Name the process", "photosynthesis", "text", 0, 1)
+    assert cassette.recorded == 2
+
+    fixtures = load_fixtures(path)
+    assert len(fixtures) == 2
+    mismatches, _ = replay(fixtures)
+    assert mismatches == []
+    # A reopened cassette knows what is already stored
+    assert Cassette(path).known == {fixture['id'] for fixture in fixtures}
+
+
+def test_replay_reports_changed_parsing(tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    record(Cassette(path), "Which are prime?", "Correct options are: 2, 3")
+    fixtures = load_fixtures(path)
+    fixtures[0]['answer'] = "2"
+    mismatches, _ = replay(fixtures)
+    assert [mismatch['answer'] for mismatch in mismatches] == ["2, 3"]
@@ -0,0 +1,106 @@
+import shutil
+from contextlib import contextmanager
+
+import pytest
+
+from answers import QuizAnswers
+from code_verifier import CodeVerifier, VerifyResult, extract_samples, normalize_output, strip_code_fences
+from llm_client import LLMError
+
+PROBLEM = """Write a program that doubles a number.
+Sample Input 1:
+3
+Sample Output 1:
+6
+Sample Input 2:
+10
+Sample Output 2:
+20
+Constraints
+1 <= n <= 100
+"""
+
+
+def test_extract_samples():
+    assert extract_samples(PROBLEM) == [("3", "6"), ("10", "20")]
+
+
+@pytest.mark.parametrize("text, samples", [
+    ("Input:\n1 2\nOutput:\n3", [("1 2", "3")]),
+    ("Input\na\nb\nExpected Output\nab\nExplanation\njoin them", [("a\nb", "ab")]),
+    ("No samples here", []),
+    ("Input:\n5\nOutput:\n", []),
+])
+def test_extract_samples_variants(text, samples):
+    assert extract_samples(text) == samples
+
+
+@pytest.mark.parametrize("code, expected", [
+    ("```python\nprint(1)\n```", "print(1)"),
+    ("```\nint main() {}\n```", "int main() {}"),
+    ("print(1)", "print(1)"),
+    ("Use this:\n```python\nprint(1)\n```", "Use this:\n```python\nprint(1)\n```"),
+])
+def test_strip_code_fences(code, expected):
+    assert strip_code_fences(code) == expected
+
+
+@pytest.mark.parametrize("code, language", [
+    ("public class Main { public static void main(String[] a) { System.out.println(1); } }", "java"),
+    ("#include <iostream>\nint main() { std::cout << 1; }", "cpp"),
+    ("#include <stdio.h>\nint main() { printf(\"1\"); }", "c"),
+    ("n = int(input())\nprint(n * 2)", "python"),
+    ("SELECT 1;", None),
+])
+def test_detect_language(code, language):
+    verifier = CodeVerifier.from_config({"verify_code": {"enabled": True}})
+    assert verifier.detect_language(code) == language
+
+
+def test_normalize_output_ignores_trailing_space():
+    assert normalize_output("1 \n2\n\n") == normalize_output("1\n2")
+
+
+def test_disabled_by_default():
+    assert CodeVerifier.from_config({}) is None
+
+
+def test_bwrap_sandbox_without_bwrap_skips(monkeypatch):
+    monkeypatch.setattr(shutil, "which", lambda name: None if name == "bwrap" else "/usr/bin/" + name)
+    verifier = CodeVerifier.from_config({"verify_code": {"enabled": True}})
+    assert verifier.verify("n = int(input())\nprint(n * 2)", PROBLEM).passed is None
+
+
+@pytest.mark.skipif(shutil.which("python3") is None, reason="needs python3 on PATH")
+@pytest.mark.parametrize("code, passed", [
+    ("n = int(input())\nprint(n * 2)", True),
+    ("n = int(input())\nprint(n + 2)", False),
+])
+def test_verify_unsandboxed(code, passed):
+    verifier = CodeVerifier.from_config({"verify_code": {"enabled": True, "sandbox": "none"}})
+    result = verifier.verify(code, PROBLEM)
+    assert result.passed is passed
+    assert result.samples == 2
+
+
+class Tracer:
+    @contextmanager
+    def span(self, name, **args):
+        yield {}
+
+
+class FailingFixes(QuizAnswers):
+    """Answers whose local check always fails and whose fix request hits an LLM error"""
+
+    def __init__(self):
+        self.config = {"verify_code": {"enabled": True, "sandbox": "none"}}
+        self.tracer = Tracer()
+
+    def fix_code(self, page_content, code, failures):
+        raise LLMError("rate limited")
+
+
+def test_fix_error_keeps_last_candidate(monkeypatch):
+    failing = VerifyResult(passed=False, language="python", samples=1, failures=[{"input": "3", "expected": "6", "actual": "5"}])
+    monkeypatch.setattr(CodeVerifier, "verify", lambda self, code, text: failing)
+    assert FailingFixes().verify_code(PROBLEM, "print(5)") == "print(5)"
@@ -0,0 +1,102 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from feedback import FEEDBACK_JS, FeedbackDetector, FeedbackResult
+
+WAITS = {"feedback_selectors": [".result"], "feedback_timeout": 30000}
+
+
+@pytest.fixture
+def detector():
+    return FeedbackDetector.from_config({}, WAITS)
+
+
+@pytest.mark.parametrize("text, classes, status, cases", [
+    ("Test cases passed: 2/2", "", "passed", (2, 2)),
+    ("Test cases passed: 1 out of 3", "", "failed", (1, 3)),
+    ("0 of 2 test cases passed", "", "failed", (0, 2)),
+    ("Incorrect answer", "", "failed", (None, None)),
+    ("Correct!", "", "passed", (None, None)),
+    ("Traceback (most recent call last): ...", "", "error", (None, None)),
+    ("Time limit exceeded", "", "error", (None, None)),
+    ("Submitted", "feedback failed", "failed", (None, None)),
+    ("Submitted", "feedback", "unknown", (None, None)),
+    ("", "", "none", (None, None)),
+])
+def test_parse(detector, text, classes, status, cases):
+    result = detector.parse(text, classes)
+    assert result.status == status
+    assert (result.passed_cases, result.total_cases) == cases
+
+
+class SilentFrame:
+    """A frame on which no verdict ever appears"""
+
+    def __init__(self):
+        self.waits = 0
+
+    def wait_for_function(self, *args, **kwargs):
+        self.waits += 1
+        raise TimeoutError
+
+
+class VerdictFrame:
+    def wait_for_function(self, *args, **kwargs):
+        return self
+
+    def json_value(self):
+        return {"text": "Correct", "classes": "", "version": "x:1"}
+
+
+def test_quiz_wait_stops_after_silent_questions(detector):
+    frame = SilentFrame()
+    for _ in range(5):
+        assert detector.wait(frame, "x:0", "text").status == "none"
+    assert frame.waits == detector.settings['quiz_silent_after']
+    assert detector.timeout("text") == 0
+    assert detector.timeout("coding") == WAITS['feedback_timeout']
+
+
+def test_verdict_resets_silent_count(detector):
+    detector.wait(SilentFrame(), "x:0", "multiple_choice")
+    assert detector.silent_quizzes == 1
+    assert detector.wait(VerdictFrame(), "x:0", "multiple_choice").passed
+    assert detector.silent_quizzes == 0
+
+
+def test_failed_statuses():
+    assert FeedbackResult("failed").failed and FeedbackResult("error").failed
+    assert not FeedbackResult("none").failed and not FeedbackResult("unknown").failed
+
+
+# Minimal DOM for FEEDBACK_JS: one feedback element and a MutationObserver fired by hand
+NODE_HARNESS = """
+let notify;
+global.MutationObserver = class { constructor(callback) { notify = callback; } observe() {} };
+const element = {
+    innerText: %(text)s, className: 'result', nodeType: 1,
+    getBoundingClientRect: () => ({width: 1, height: 1}), closest: () => element, querySelector: () => null
+};
+global.document = {documentElement: {}, querySelectorAll: () => [element]};
+global.window = {};
+const feedback = %(script)s;
+const args = {selector: '.result', pending: ['running'], wait: false};
+const baseline = feedback(args).version;
+const before = feedback({...args, wait: true, baseline});
+notify([{target: element, addedNodes: []}]);
+const after = feedback({...args, wait: true, baseline});
+console.log(JSON.stringify({before, after}));
+"""
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run the in-page script")
+def test_same_verdict_after_resubmit_counts_as_new():
+    script = NODE_HARNESS % {"text": json.dumps("Test cases passed: 0/2"), "script": FEEDBACK_JS}
+    output = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True).stdout
+    states = json.loads(output)
+    # Untouched feedback is still the old verdict; the same text rendered again is a new one
+    assert states['before'] is None
+    assert states['after']['text'] == "Test cases passed: 0/2"
@@ -0,0 +1,59 @@
+import pytest
+
+import model_router
+from llm_client import option_list_complete
+from model_router import TokenBucket
+
+
+@pytest.mark.parametrize("text, complete", [
+    ("1, 3\n", True),
+    ("The correct options are: 2 and 4\n", True),
+    ("Correct option is 2.\n", True),
+    ("Let me think.\n1, 3\n", True),
+    ("1, 3", False),
+    ("Option 1 is wrong because\n", False),
+    ("The answer is photosynthesis\n", False),
+    ("\n\n", False),
+])
+def test_option_list_complete(text, complete):
+    assert option_list_complete(text) is complete
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(model_router.time, "monotonic", clock)
+    return clock
+
+
+def test_token_bucket_refills_at_rate(clock):
+    bucket = TokenBucket(60)
+    assert bucket.wait_time(60) == 0.0
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    clock.now += 30
+    assert bucket.wait_time(30) == 0.0
+    assert bucket.wait_time(40) == pytest.approx(10.0)
+
+
+def test_token_bucket_caps_requests_at_capacity(clock):
+    bucket = TokenBucket(60)
+    # A request larger than the bucket only waits for a full bucket instead of forever
+    bucket.take(10)
+    assert bucket.wait_time(500) == pytest.approx(10.0)
+    clock.now += 600
+    assert bucket.wait_time(60) == 0.0
+
+
+def test_token_bucket_drain_goes_into_debt(clock):
+    bucket = TokenBucket(60)
+    bucket.drain(5)
+    assert bucket.wait_time(1) == pytest.approx(6.0)
@@ -0,0 +1,36 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from logging_setup import PayloadStore
+
+
+def test_concurrent_puts_store_each_payload_once(tmp_path, monkeypatch):
+    started = []
+    original = threading.Thread.start
+
+    def counting_start(thread):
+        if thread.name == "payload-writer":
+            started.append(thread)
+        original(thread)
+
+    monkeypatch.setattr(threading.Thread, "start", counting_start)
+    store = PayloadStore(str(tmp_path))
+    texts = [f"payload {i % 5} " * 50 for i in range(200)]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        digests = list(pool.map(store.put, texts))
+    store.close()
+
+    assert len(started) == 1
+    assert len(set(digests)) == 5
+    assert len(list(tmp_path.glob("*/*.gz"))) == 5
+    assert store.get(digests[3]) == texts[3]
+
+
+def test_put_after_close_starts_a_new_writer(tmp_path):
+    store = PayloadStore(str(tmp_path))
+    first = store.put("a" * 300)
+    store.close()
+    second = store.put("b" * 300)
+    store.close()
+    assert store.get(first) == "a" * 300
+    assert store.get(second) == "b" * 300
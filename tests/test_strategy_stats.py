@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import pytest
+
+from strategy_stats import StrategyStats, run_strategies, run_strategies_async
+
+
+def entry(attempts, successes, seconds):
+    return {"attempts": attempts, "successes": successes, "seconds": seconds, "last_success": None}
+
+
+@pytest.mark.parametrize("history, expected", [
+    ({}, ["a", "b", "c"]),
+    # 1s per success beats 2s per success
+    ({"a": entry(2, 1, 1.0), "b": entry(2, 2, 2.0)}, ["a", "b", "c"]),
+    ({"a": entry(4, 1, 4.0), "b": entry(2, 2, 2.0)}, ["b", "a", "c"]),
+    # Untried strategies come before ones that never worked
+    ({"a": entry(3, 0, 3.0)}, ["b", "c", "a"]),
+    ({"c": entry(1, 1, 0.1), "a": entry(5, 0, 1.0)}, ["c", "b", "a"]),
+])
+def test_order(tmp_path, history, expected):
+    stats = StrategyStats(str(tmp_path / "stats.json"))
+    stats.actions = {"click": history}
+    strategies = [(name, None) for name in ["a", "b", "c"]]
+    assert [name for name, _ in stats.order("click", strategies)] == expected
+
+
+def test_run_with_no_winner_records_nothing(tmp_path):
+    stats = StrategyStats(str(tmp_path / "stats.json"))
+    assert run_strategies(stats, "click", [("a", lambda: False), ("b", lambda: 1 / 0)]) is None
+    assert stats.actions == {}
+    assert not stats.dirty
+
+
+def test_run_records_attempts_up_to_winner(tmp_path):
+    stats = StrategyStats(str(tmp_path / "stats.json"))
+    assert run_strategies(stats, "click", [("a", lambda: False), ("b", lambda: True), ("c", lambda: True)]) == "b"
+    assert stats.actions["click"]["a"]["successes"] == 0
+    assert stats.actions["click"]["b"]["successes"] == 1
+    assert "c" not in stats.actions["click"]
+
+
+def test_async_run_matches_sync(tmp_path):
+    stats = StrategyStats(str(tmp_path / "stats.json"))
+
+    async def fail():
+        return False
+
+    async def succeed():
+        return True
+
+    assert asyncio.run(run_strategies_async(stats, "fill", [("a", fail), ("b", succeed)])) == "b"
+    assert stats.actions["fill"]["b"]["attempts"] == 1
+
+
+def test_checkpoint_saves_only_after_interval(tmp_path):
+    path = tmp_path / "stats.json"
+    stats = StrategyStats(str(path), save_every_seconds=3600)
+    stats.record_run("click", [("a", 0.1)], "a")
+    assert not path.exists()
+    stats.save_every_seconds = 0
+    stats.record_run("click", [("a", 0.1)], "a")
+    assert json.loads(path.read_text())["click"]["a"]["attempts"] == 2
+    assert not stats.dirty
+    assert StrategyStats(str(path)).actions == stats.actions
@@ -0,0 +1,93 @@
+import time
+
+from transitions import DEFAULT_TRANSITIONS, TransitionDetector
+
+
+class Handle:
+    def __init__(self, value):
+        self.value = value
+
+    def json_value(self):
+        return self.value
+
+
+class Frame:
+    """Frame whose wait_for_function either resolves to `result` or raises, like a navigation or timeout"""
+
+    def __init__(self, url, result=None, region=""):
+        self.url = url
+        self.result = result
+        self.region = region
+
+    def is_detached(self):
+        return False
+
+    def wait_for_function(self, script, arg, timeout, polling):
+        if isinstance(self.result, Exception):
+            time.sleep(min(timeout, polling) / 1000)
+            raise self.result
+        return Handle(self.result)
+
+    def evaluate(self, script, arg):
+        return self.region
+
+
+class Page:
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.lookups = 0
+
+    def frame(self, name):
+        # The first lookup is the frame before Next; later ones see where Next went
+        frame = self.frames[min(self.lookups, len(self.frames) - 1)]
+        self.lookups += 1
+        return frame
+
+    def wait_for_timeout(self, ms):
+        time.sleep(ms / 1000)
+
+    def wait_for_load_state(self, state, timeout):
+        pass
+
+
+def detector(**settings):
+    return TransitionDetector({**DEFAULT_TRANSITIONS, **settings}, [".question"], [".feedback"])
+
+
+def test_new_question_returns_its_fingerprint():
+    transitions = detector()
+    page = Page([Frame("/quiz/0", "abc:10")])
+    assert transitions.wait_for_change(page, "course", "old:10") == "abc:10"
+    assert transitions.timeouts == 0
+
+
+def test_navigating_to_subtopic_page_does_not_wait_for_timeout():
+    transitions = detector(timeout=10000, blind_timeout=2000)
+    page = Page([Frame("/quiz/9"), Frame("/subtopic/1", RuntimeError("Execution context was destroyed"))])
+    started = time.perf_counter()
+    assert transitions.wait_for_change(page, "course", "old:10") == ""
+    assert time.perf_counter() - started < 1
+    assert transitions.timeouts == 0
+
+
+def test_region_gone_in_place_waits_only_blind_timeout():
+    transitions = detector(timeout=10000, blind_timeout=100, poll_interval=10)
+    page = Page([Frame("/quiz", "")])
+    started = time.perf_counter()
+    assert transitions.wait_for_change(page, "course", "old:10") == ""
+    assert time.perf_counter() - started < 1
+    assert transitions.timeouts == 0
+
+
+def test_region_gone_then_new_question_rendered():
+    transitions = detector(blind_timeout=1000, poll_interval=10)
+    page = Page([Frame("/quiz", "", region="new:12")])
+    assert transitions.wait_for_change(page, "course", "old:10") == "new:12"
+
+
+def test_unchanged_question_times_out():
+    transitions = detector(timeout=200, poll_interval=20)
+    page = Page([Frame("/quiz", TimeoutError("Timeout 200ms exceeded"))])
+    assert transitions.wait_for_change(page, "course", "old:10") is None
+    assert transitions.stats()["timeouts"] == 1
+    assert transitions.stats()["waits"] == 1
@@ -0,0 +1,93 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Spans that only group other spans; excluded from per-phase totals
+CONTAINER_SPANS = {"course", "subtopic", "question", "discover"}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Tracer:
+    """Records nested timing spans and exports them in Chrome trace-event format"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.events = []
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.get('trace', {}).get('enabled', True))
+
+    @contextmanager
+    def span(self, name, tid=None, **args):
+        """Time the enclosed block; spans nest by time on the same tid.
+
+        Yields the span's args dict so the block can attach results to it.
+        """
+        if not self.enabled:
+            yield args
+            return
+        started = time.perf_counter()
+        try:
+            yield args
+        finally:
+            finished = time.perf_counter()
+            event = {
+                "name": name,
+                "ph": "X",
+                "ts": round((started - self.origin) * 1e6),
+                "dur": round((finished - started) * 1e6),
+                "pid": self.pid,
+                "tid": tid if tid is not None else threading.get_ident(),
+                "args": args
+            }
+            with self.lock:
+                self.events.append(event)
+
+    def durations(self):
+        """Seconds spent in each span name"""
+        result = {}
+        for event in self.events:
+            result.setdefault(event["name"], []).append(event["dur"] / 1e6)
+        return result
+
+    def phase_totals(self):
+        """Total seconds per phase, leaving out grouping spans"""
+        return {
+            name: sum(values)
+            for name, values in self.durations().items()
+            if name not in CONTAINER_SPANS
+        }
+
+    def export(self, path):
+        with open(path, 'w') as file:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, file)
+        logger.info(f"Wrote {len(self.events)} trace events to {path}")
+
+    def summary(self):
+        """Log a p50/p95 table per span name"""
+        durations = self.durations()
+        if not durations:
+            return
+        lines = [f"{'phase':<24}{'count':>7}{'total s':>10}{'p50 s':>9}{'p95 s':>9}"]
+        for name, values in sorted(durations.items(), key=lambda item: -sum(item[1])):
+            lines.append(
+                f"{name:<24}{len(values):>7}{sum(values):>10.1f}"
+                f"{percentile(values, 50):>9.2f}{percentile(values, 95):>9.2f}"
+            )
+        logger.info("Phase timing summary:\n" + "\n".join(lines))
@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import time
+
+from question_extractor import question_selectors
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRANSITIONS = {
+    # How long a Next click may take to bring up a different question before the quiz counts as finished
+    "timeout": 10000,
+    "poll_interval": 100,
+    # Safety net against a player that keeps cycling through the same questions
+    "max_questions": 200,
+    # Consecutive already-seen questions skipped before giving up on the quiz
+    "max_duplicates": 3,
+    # When the page has no recognisable question region there is nothing to compare, so after Next
+    # wait at most this long for the frame to navigate or a region to appear, then for network idle
+    "blind_timeout": 2000
+}
+
+# FNV-1a hash of the question region's text, with feedback indicators removed so a verdict shown
+# after submitting does not count as a new question. Waits (returns null) while the region still
+# matches args.baseline; an empty region returns '' so the caller can tell the question is gone.
+FINGERPRINT_JS = """
+(args) => {
+    const visible = el => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    const textOf = el => {
+        const clone = el.cloneNode(true);
+        if (args.exclude) {
+            try { clone.querySelectorAll(args.exclude).forEach(node => node.remove()); } catch (e) {}
+        }
+        return (clone.innerText || clone.textContent || '').replace(/\\s+/g, ' ').trim();
+    };
+    let parts = [];
+    for (const selector of args.stem) {
+        let els = [];
+        try { els = Array.from(document.querySelectorAll(selector)).filter(visible); } catch (e) {}
+        if (els.length) {
+            parts = els.map(textOf);
+            break;
+        }
+    }
+    const checkboxes = Array.from(document.querySelectorAll("input[type='checkbox']"));
+    if (!parts.length) {
+        const anchor = checkboxes[0] || document.querySelector(args.anchor);
+        const region = anchor ? (anchor.closest('form, section, article, main') || anchor.parentElement) : null;
+        if (region) parts.push(textOf(region));
+    }
+    checkboxes.forEach(cb => {
+        const label = (cb.labels && cb.labels[0]) || cb.closest('label') || cb.parentElement;
+        if (label) parts.push(textOf(label));
+    });
+    const text = parts.join('\\n');
+    if (!text) return '';
+    let hash = 0x811c9dc5;
+    for (let i = 0; i < text.length; i++) {
+        hash ^= text.charCodeAt(i);
+        hash = Math.imul(hash, 0x01000193) >>> 0;
+    }
+    const fingerprint = hash.toString(16).padStart(8, '0') + ':' + text.length;
+    if (args.wait && fingerprint === args.baseline) return null;
+    return fingerprint;
+}
+"""
+
+
+class TransitionDetector:
+    """Fingerprint the question on screen and wait for it to change after Next, instead of sleeping"""
+
+    def __init__(self, settings, stem_selectors, exclude_selectors):
+        self.settings = settings
+        self.stem_selectors = stem_selectors
+        self.exclude = ", ".join(exclude_selectors)
+        self.timings = []
+        self.timeouts = 0
+
+    @classmethod
+    def from_config(cls, config, waits):
+        settings = dict(DEFAULT_TRANSITIONS)
+        settings.update(config.get('transitions', {}))
+        return cls(settings, question_selectors(config)['stem'], waits['feedback_selectors'])
+
+    def _args(self, baseline=None, wait=False):
+        return {
+            "stem": self.stem_selectors,
+            "exclude": self.exclude,
+            "anchor": ".CodeMirror, .ace_editor, .monaco-editor, textarea, input[type='text']",
+            "baseline": baseline,
+            "wait": wait
+        }
+
+    def fingerprint(self, frame):
+        """Hash of the question currently shown, or '' when no question region was found"""
+        return frame.evaluate(FINGERPRINT_JS, self._args())
+
+    async def fingerprint_async(self, frame):
+        return await frame.evaluate(FINGERPRINT_JS, self._args())
+
+    def _finished(self, started, fingerprint):
+        elapsed = time.perf_counter() - started
+        self.timings.append(elapsed)
+        if fingerprint is None:
+            self.timeouts += 1
+            logger.info(f"Question did not change within {elapsed:.1f}s of clicking Next")
+        elif not fingerprint:
+            logger.info(f"No question region to fingerprint, carried on after {elapsed:.2f}s")
+        else:
+            logger.info(f"Next question appeared after {elapsed:.2f}s")
+        return fingerprint
+
+    def _navigated(self, frame, url):
+        return frame is not None and not frame.is_detached() and frame.url != url
+
+    def wait_blind(self, page, frame_name, started=None, url=None):
+        """Wait for the frame to navigate or a question region to appear, then for network idle.
+
+        Returns the new fingerprint, or '' if there is still none; never None, since without a
+        baseline an unchanged page does not show that the quiz is over. wait_for_change passes
+        its own start time and the frame URL from before Next when it hands over.
+        """
+        started = started or time.perf_counter()
+        deadline = time.perf_counter() + self.settings['blind_timeout'] / 1000
+        if url is None:
+            frame = page.frame(frame_name)
+            url = frame.url if frame else None
+        fingerprint = ""
+        while time.perf_counter() < deadline:
+            frame = page.frame(frame_name)
+            if self._navigated(frame, url):
+                break
+            try:
+                fingerprint = self.fingerprint(frame) if frame else ""
+            except Exception:
+                fingerprint = ""
+            if fingerprint:
+                break
+            page.wait_for_timeout(self.settings['poll_interval'])
+        try:
+            page.wait_for_load_state("networkidle", timeout=self.settings['timeout'])
+        except Exception:
+            pass
+        return self._finished(started, fingerprint)
+
+    async def wait_blind_async(self, page, frame_name, started=None, url=None):
+        started = started or time.perf_counter()
+        deadline = time.perf_counter() + self.settings['blind_timeout'] / 1000
+        if url is None:
+            frame = page.frame(frame_name)
+            url = frame.url if frame else None
+        fingerprint = ""
+        while time.perf_counter() < deadline:
+            frame = page.frame(frame_name)
+            if self._navigated(frame, url):
+                break
+            try:
+                fingerprint = await self.fingerprint_async(frame) if frame else ""
+            except Exception:
+                fingerprint = ""
+            if fingerprint:
+                break
+            await asyncio.sleep(self.settings['poll_interval'] / 1000)
+        try:
+            await page.wait_for_load_state("networkidle", timeout=self.settings['timeout'])
+        except Exception:
+            pass
+        return self._finished(started, fingerprint)
+
+    def wait_for_change(self, page, frame_name, baseline):
+        """New fingerprint once a different question is shown, or None if it never changes.
+
+        If the question region disappears or the frame navigates away (Next at the end of a quiz
+        goes to the subtopic page), the rest is left to wait_blind, and the caller's submit button
+        check decides whether the quiz is over. With an empty baseline this goes to wait_blind
+        straight away; either way it returns '' rather than None when no question is found.
+        """
+        if not baseline:
+            return self.wait_blind(page, frame_name)
+        started = time.perf_counter()
+        deadline = started + self.settings['timeout'] / 1000
+        frame = page.frame(frame_name)
+        url = frame.url if frame else None
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return self._finished(started, None)
+            frame = page.frame(frame_name)
+            if frame is None or frame.is_detached() or frame.url != url:
+                return self.wait_blind(page, frame_name, started, url)
+            try:
+                handle = frame.wait_for_function(
+                    FINGERPRINT_JS, arg=self._args(baseline, True),
+                    timeout=remaining * 1000, polling=self.settings['poll_interval']
+                )
+                fingerprint = handle.json_value()
+            except Exception:
+                # Timed out, or the frame navigated away mid-wait; the checks above decide which
+                page.wait_for_timeout(self.settings['poll_interval'])
+                continue
+            if not fingerprint:
+                return self.wait_blind(page, frame_name, started, url)
+            return self._finished(started, fingerprint)
+
+    async def wait_for_change_async(self, page, frame_name, baseline):
+        if not baseline:
+            return await self.wait_blind_async(page, frame_name)
+        started = time.perf_counter()
+        deadline = started + self.settings['timeout'] / 1000
+        frame = page.frame(frame_name)
+        url = frame.url if frame else None
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return self._finished(started, None)
+            frame = page.frame(frame_name)
+            if frame is None or frame.is_detached() or frame.url != url:
+                return await self.wait_blind_async(page, frame_name, started, url)
+            try:
+                handle = await frame.wait_for_function(
+                    FINGERPRINT_JS, arg=self._args(baseline, True),
+                    timeout=remaining * 1000, polling=self.settings['poll_interval']
+                )
+                fingerprint = await handle.json_value()
+            except Exception:
+                await asyncio.sleep(self.settings['poll_interval'] / 1000)
+                continue
+            if not fingerprint:
+                return await self.wait_blind_async(page, frame_name, started, url)
+            return self._finished(started, fingerprint)
+
+    def stats(self):
+        """Totals for the run report and the benchmark"""
+        return {
+            "waits": len(self.timings),
+            "timeouts": self.timeouts,
+            "total_seconds": sum(self.timings),
+            "max_seconds": max(self.timings, default=0.0)
+        }
+
+    def summary(self):
+        if self.timings:
+            stats = self.stats()
+            logger.info(
+                f"Question transitions: {stats['waits']} waits, total {stats['total_seconds']:.1f}s, "
+                f"max {stats['max_seconds']:.2f}s, {stats['timeouts']} hit the timeout"
+            )
@@ -0,0 +1,91 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WAITS = {
+    "frame_timeout": 30000,
+    "element_timeout": 15000,
+    "network_idle_timeout": 10000,
+    "feedback_timeout": 30000,
+    "poll_interval": 100,
+    "feedback_selectors": [
+        ".feedback",
+        ".result",
+        ".alert",
+        "[class*='success']",
+        "[class*='error']",
+        "[class*='passed']",
+        "[class*='failed']",
+        "[class*='correct']"
+    ]
+}
+
+
+class WaitEngine:
+    """Wait on real page conditions instead of fixed sleeps, recording how long each wait took"""
+
+    def __init__(self, page, config):
+        self.page = page
+        self.settings = dict(DEFAULT_WAITS)
+        self.settings.update(config.get('waits', {}))
+        self.timings = {}
+
+    def timeout(self, kind):
+        return self.settings.get(f"{kind}_timeout", DEFAULT_WAITS.get(f"{kind}_timeout", 10000))
+
+    def _record(self, name, started, ok):
+        elapsed = time.perf_counter() - started
+        self.timings.setdefault(name, []).append(elapsed)
+        if not ok:
+            logger.warning(f"Wait '{name}' gave up after {elapsed:.2f}s")
+        return ok
+
+    def for_frame(self, name, timeout=None):
+        """Wait until the named frame is attached and return it (or None)"""
+        started = time.perf_counter()
+        deadline = started + (timeout or self.timeout("frame")) / 1000
+        while True:
+            frame = self.page.frame(name)
+            if frame and not frame.is_detached():
+                self._record("frame", started, True)
+                return frame
+            if time.perf_counter() >= deadline:
+                self._record("frame", started, False)
+                return None
+            self.page.wait_for_timeout(self.settings["poll_interval"])
+
+    def for_visible(self, frame, selector, timeout=None, name="element"):
+        """Wait until the first element matching selector is visible"""
+        started = time.perf_counter()
+        try:
+            frame.locator(selector).first.wait_for(state="visible", timeout=timeout or self.timeout("element"))
+            return self._record(name, started, True)
+        except Exception:
+            return self._record(name, started, False)
+
+    def for_text(self, frame, text, timeout=None):
+        """Wait until an element containing text is visible"""
+        started = time.perf_counter()
+        try:
+            frame.get_by_text(text).first.wait_for(state="visible", timeout=timeout or self.timeout("element"))
+            return self._record("text", started, True)
+        except Exception:
+            return self._record("text", started, False)
+
+    def for_network_idle(self, timeout=None):
+        """Wait until the page has had no network activity for 500 ms"""
+        started = time.perf_counter()
+        try:
+            self.page.wait_for_load_state("networkidle", timeout=timeout or self.timeout("network_idle"))
+            return self._record("network_idle", started, True)
+        except Exception:
+            return self._record("network_idle", started, False)
+
+    def summary(self):
+        """Log count, total and worst-case time for every kind of wait"""
+        for name, durations in sorted(self.timings.items()):
+            logger.info(
+                f"Wait '{name}': {len(durations)} waits, total {sum(durations):.1f}s, "
+                f"max {max(durations):.2f}s"
+            )